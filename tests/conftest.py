@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Test setup: tests/stubs stands in for toolbox, jinja_tool and jinja2 if not installed
+
+Fixtures load the tools of toolbox_xilinx_tools/2020.2 by path and create
+tool instances without a toolbox database.
+"""
+
+# Imports - standard library
+from pathlib import Path
+import importlib.util
+import os
+import sys
+
+# Imports - 3rd party packages
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = TESTS_DIR.parent / "toolbox_xilinx_tools" / "2020.2"
+STUBS = ["vivado", "xvlog", "xelab", "xsim"]
+
+# Appended, so installed packages take precedence
+sys.path.append(str(TESTS_DIR / "stubs"))
+
+# Imports - local source
+from toolbox_xilinx_tools.netlist_index import NetlistIndex
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "bench: generator benchmark, runs with BENCH=1 (make bench)")
+
+
+@pytest.fixture(scope="session")
+def load_tool():
+    """Imports toolbox_xilinx_tools/2020.2/<name>/<name> by path (once per name)"""
+    modules = {}
+
+    def load(name):
+        if name not in modules:
+            path = TOOLS_DIR / name / name / "__init__.py"
+            spec = importlib.util.spec_from_file_location(f"test_tool_{name}", path)
+            modules[name] = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(modules[name])
+        return modules[name]
+    return load
+
+
+@pytest.fixture(scope="session")
+def make_tool():
+    """Creates a tool instance reading db (dict) without a toolbox database"""
+    def make(cls, db, **attrs):
+        tool = cls.__new__(cls)
+        tool.get_db = db.__getitem__
+        tool.log = lambda msg, level=None: None
+        for k, v in attrs.items():
+            setattr(tool, k, v)
+        return tool
+    return make
+
+
+@pytest.fixture()
+def stub_path(tmp_path, monkeypatch):
+    """Puts stub vivado/xvlog/xelab/xsim (tests/stubs/stub_tool.py) first on PATH"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name in STUBS:
+        (bin_dir / name).symlink_to(TESTS_DIR / "stubs" / "stub_tool.py")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return bin_dir
+
+
+@pytest.fixture()
+def netlist_index(tmp_path):
+    """Index of tests/stubs/top_post_synth.v (copied to tmp_path)"""
+    netlist = tmp_path / "top_post_synth.v"
+    netlist.write_text((TESTS_DIR / "stubs" / "top_post_synth.v").read_text())
+    return NetlistIndex.from_netlist(netlist, meta={"sources": "abc"})
@@ -0,0 +1,78 @@
+# Scripted stand-in for the vivado hardware manager (runs in plain tclsh)
+#
+# Configure before sourcing:
+#   ::stub_targets  dict target => list of device names
+#   ::stub_fail     dict device => command that fails (program_hw_devices,
+#                   verify_hw_devices or crc), target => open_hw_target
+#   ::stub_delay_ms time program_hw_devices takes
+foreach {var default} {stub_targets {} stub_fail {} stub_delay_ms 0} {
+    if {![info exists ::$var]} {
+        set ::$var $default
+    }
+}
+set ::stub_target ""
+set ::stub_device ""
+
+proc stub_check {cmd obj} {
+    if {[dict exists $::stub_fail $obj] && [dict get $::stub_fail $obj] eq $cmd} {
+        error "stub $cmd failed for $obj"
+    }
+}
+
+proc open_hw_manager {} {}
+proc close_hw_manager {} {}
+proc connect_hw_server {args} { puts "connect_hw_server $args" }
+proc disconnect_hw_server {} {}
+proc set_property {args} {}
+proc create_hw_bitstream {args} {}
+proc refresh_hw_device {dev} {}
+
+proc get_hw_targets {{pattern *}} {
+    return [lsearch -glob -all -inline [dict keys $::stub_targets] $pattern]
+}
+
+proc current_hw_target {{target ""}} {
+    if {$target ne ""} {
+        set ::stub_target $target
+    }
+    return $::stub_target
+}
+
+proc open_hw_target {} { stub_check open_hw_target $::stub_target }
+proc close_hw_target {} {}
+
+proc get_hw_devices {args} {
+    set pattern *
+    if {[lindex $args 0] eq "-of_objects"} {
+        set args [lrange $args 2 end]
+    }
+    if {[llength $args]} {
+        set pattern [lindex $args 0]
+    }
+    return [lsearch -glob -all -inline [dict get $::stub_targets $::stub_target] $pattern]
+}
+
+proc current_hw_device {{dev ""}} {
+    if {$dev ne ""} {
+        set ::stub_device $dev
+    }
+    return $::stub_device
+}
+
+proc program_hw_devices {dev} {
+    after $::stub_delay_ms
+    stub_check program_hw_devices $dev
+}
+
+proc verify_hw_devices {args} { stub_check verify_hw_devices [lindex $args end] }
+
+proc get_property {name obj} {
+    switch -- $name {
+        NAME { return $obj }
+        REGISTER.CONFIG_STATUS.BIT00_CRC_ERROR {
+            return [expr {[dict exists $::stub_fail $obj] && [dict get $::stub_fail $obj] eq "crc"}]
+        }
+        REGISTER.CONFIG_STATUS.BIT14_DONE_PIN { return 1 }
+    }
+    error "stub get_property: unknown property $name"
+}
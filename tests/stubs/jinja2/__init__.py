@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Stand in for the names the tools import from jinja2 (templates are not rendered)"""
+
+StrictUndefined = Environment = FileSystemLoader = None
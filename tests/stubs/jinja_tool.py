@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Stand in for jinja_tool (templates are not rendered)"""
+
+# Imports - local source
+from toolbox.tool import Tool
+
+
+class JinjaTool(Tool):
+    pass
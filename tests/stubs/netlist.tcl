@@ -0,0 +1,225 @@
+# Scripted stand-in for the vivado netlist and debug core commands used by
+# new_batch_insert_ila.tcl (runs in plain tclsh)
+#
+# stub_design builds a design of flops in clock domains. Netlist and timing
+# queries (get_nets, get_pins, get_cells, get_timing_*) are counted in
+# ::stub_queries, debug core connections are recorded in ::stub_connections.
+set ::stub_nets {}
+set ::stub_pins {}
+set ::stub_cells {}
+set ::stub_paths {}
+set ::stub_queries 0
+set ::stub_connections {}
+
+proc stub_net {name parent {attrs {}}} {
+    dict set ::stub_nets $name [dict create parent $parent attrs $attrs]
+}
+
+proc stub_cell {name {seq 0} {debug_core 0}} {
+    dict set ::stub_cells $name [dict create seq $seq debug_core $debug_core]
+}
+
+proc stub_pin {name net dir {clock 0}} {
+    dict set ::stub_pins $name [dict create net $net dir $dir clock $clock]
+}
+
+# domains clock domains with regs MARK_DEBUG flops (bus u_<k>/data) each.
+# Domain k: clk_<k> port -> IBUF -> BUFG driving clk_<k>_BUFG, seen inside
+# u_<k> as segment u_<k>/clk. Domain 0 also has a combinational debug net
+# u_0/flag and a net u_0/vio_in attached to a VIO core.
+proc stub_design {domains regs} {
+    stub_cell vio_0 0 1
+    for {set k 0} {$k < $domains} {incr k} {
+        stub_cell clk_ibuf_$k
+        stub_cell clk_bufg_$k
+        stub_net clk_${k}_IBUF clk_${k}_IBUF
+        stub_pin clk_ibuf_$k/O clk_${k}_IBUF OUT
+        stub_pin clk_bufg_$k/I clk_${k}_IBUF IN
+        stub_net clk_${k}_BUFG clk_${k}_BUFG
+        stub_net u_$k/clk clk_${k}_BUFG
+        stub_pin clk_bufg_$k/O clk_${k}_BUFG OUT
+        for {set i 0} {$i < $regs} {incr i} {
+            stub_cell "u_$k/data_reg\[$i\]" 1
+            stub_net "u_$k/data\[$i\]" "u_$k/data\[$i\]" {MARK_DEBUG 1}
+            stub_pin "u_$k/data_reg\[$i\]/C" u_$k/clk IN 1
+            stub_pin "u_$k/data_reg\[$i\]/Q" "u_$k/data\[$i\]" OUT
+        }
+    }
+    stub_cell u_0/flag_i
+    stub_net u_0/flag u_0/flag {MARK_DEBUG 1}
+    stub_pin u_0/flag_i/O u_0/flag OUT
+    dict set ::stub_paths u_0/flag_i/O "u_0/data_reg\[0\]/C"
+    stub_cell u_0/vio_src_reg 1
+    stub_net u_0/vio_in u_0/vio_in {MARK_DEBUG 1}
+    stub_pin u_0/vio_src_reg/C u_0/clk IN 1
+    stub_pin u_0/vio_src_reg/Q u_0/vio_in OUT
+    stub_pin vio_0/probe_in0 u_0/vio_in IN
+}
+
+proc stub_cell_of {pin} {
+    return [string range $pin 0 [expr {[string last / $pin] - 1}]]
+}
+
+proc stub_parent {net} {
+    return [dict get $::stub_nets $net parent]
+}
+
+proc stub_unique {items} {
+    set result {}
+    foreach i $items {
+        if {![info exists seen($i)]} {
+            set seen($i) 1
+            lappend result $i
+        }
+    }
+    return $result
+}
+
+# Options of a get_* call as dict (flags map to 1), patterns under "patterns"
+proc stub_options {argv} {
+    set opts [dict create patterns {}]
+    for {set i 0} {$i < [llength $argv]} {incr i} {
+        set a [lindex $argv $i]
+        if {$a in {-filter -of_objects -to -through}} {
+            dict set opts $a [lindex $argv [incr i]]
+        } elseif {[string match -* $a]} {
+            dict set opts $a 1
+        } else {
+            dict set opts patterns [concat [dict get $opts patterns] $a]
+        }
+    }
+    return $opts
+}
+
+proc stub_pin_match {pin filter} {
+    switch -- $filter {
+        "" { return 1 }
+        "DIRECTION == OUT" { return [expr {[dict get $::stub_pins $pin dir] eq "OUT"}] }
+        "IS_CLOCK" { return [dict get $::stub_pins $pin clock] }
+    }
+    error "stub: unsupported pin filter $filter"
+}
+
+proc get_nets {args} {
+    incr ::stub_queries
+    set opts [stub_options $args]
+    if {[dict exists $opts -filter]} {
+        set nets {}
+        dict for {n info} $::stub_nets {
+            if {[dict exists $info attrs MARK_DEBUG]} {
+                lappend nets $n
+            }
+        }
+        return $nets
+    }
+    if {[dict exists $opts -of_objects]} {
+        set nets {}
+        foreach p [dict get $opts -of_objects] {
+            lappend nets [dict get $::stub_pins $p net]
+        }
+    } else {
+        set nets [lmap n [dict get $opts patterns] {expr {[dict exists $::stub_nets $n] ? $n : [continue]}}]
+    }
+    if {[dict exists $opts -segments]} {
+        set segments {}
+        foreach n $nets {
+            dict for {s info} $::stub_nets {
+                if {[dict get $info parent] eq [stub_parent $n]} {
+                    lappend segments $s
+                }
+            }
+        }
+        set nets $segments
+    }
+    return [stub_unique $nets]
+}
+
+proc get_pins {args} {
+    incr ::stub_queries
+    set opts [stub_options $args]
+    set filter [expr {[dict exists $opts -filter] ? [dict get $opts -filter] : ""}]
+    set pins {}
+    if {[dict exists $opts -of_objects]} {
+        foreach obj [dict get $opts -of_objects] {
+            dict for {p info} $::stub_pins {
+                if {[dict exists $::stub_cells $obj]} {
+                    set hit [expr {[stub_cell_of $p] eq $obj}]
+                } else {
+                    set hit [expr {[stub_parent [dict get $info net]] eq [stub_parent $obj]}]
+                }
+                if {$hit && [stub_pin_match $p $filter]} {
+                    lappend pins $p
+                }
+            }
+        }
+    } else {
+        foreach p [dict get $opts patterns] {
+            if {[dict exists $::stub_pins $p] && [stub_pin_match $p $filter]} {
+                lappend pins $p
+            }
+        }
+    }
+    return [stub_unique $pins]
+}
+
+proc get_cells {args} {
+    incr ::stub_queries
+    set opts [stub_options $args]
+    if {[dict exists $opts -filter]} {
+        set cells {}
+        dict for {c info} $::stub_cells {
+            if {[dict get $info debug_core]} {
+                lappend cells $c
+            }
+        }
+        return $cells
+    }
+    return [stub_unique [lmap p [dict get $opts -of_objects] {stub_cell_of $p}]]
+}
+
+proc get_timing_arcs {args} {
+    incr ::stub_queries
+    return {}
+}
+
+proc get_timing_paths {args} {
+    incr ::stub_queries
+    set pin [dict get [stub_options $args] -through]
+    if {[dict exists $::stub_paths $pin]} {
+        return [list path:[dict get $::stub_paths $pin]]
+    }
+    return {}
+}
+
+proc get_property {args} {
+    if {[lindex $args 0] eq "-quiet"} {
+        set args [lrange $args 1 end]
+    }
+    lassign $args prop objs
+    set values {}
+    foreach o $objs {
+        switch -- $prop {
+            PARENT { lappend values [stub_parent $o] }
+            PARENT_CELL { lappend values [stub_cell_of $o] }
+            IS_SEQUENTIAL { lappend values [dict get $::stub_cells $o seq] }
+            STARTPOINT_PIN { lappend values [string range $o 5 end] }
+            default {
+                set attrs [dict get $::stub_nets $o attrs]
+                lappend values [expr {[dict exists $attrs $prop] ? [dict get $attrs $prop] : ""}]
+            }
+        }
+    }
+    return $values
+}
+
+proc version {args} { return 2020.2 }
+proc get_projects {args} { return "" }
+proc get_debug_cores {name} { return $name }
+proc get_debug_ports {name} { return $name }
+proc create_debug_core {name type} { lappend ::stub_connections [list core $name] }
+proc create_debug_port {core type} {}
+proc create_net {name} {}
+proc set_property {args} {}
+proc connect_debug_port {port nets} { lappend ::stub_connections [list $port [concat {*}$nets]] }
+proc implement_debug_core {} {}
+proc write_debug_probes {args} {}
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Stand in for vivado/xvlog/xelab/xsim (linked under those names on PATH)
+
+Writes the file given with -log (as the real tools do) and exits 0, so the
+python side of the tools can be exercised and benchmarked offline. vivado
+writes <dir>/<name>/<name>.dcp for every create_ip -module_name <name> -dir
+<dir> of its -source script and fails for names listed in $STUB_FAIL.
+Every invocation is appended to the file $STUB_CALLS (if set).
+"""
+
+# Imports - standard library
+import os
+import re
+import sys
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+if __name__ == "__main__":
+    name = os.path.basename(sys.argv[0])
+    args = sys.argv[1:]
+    print(f"****** {name} (stub)")
+    if "-log" in args[:-1]:
+        with open(args[args.index("-log") + 1], "w") as fp:
+            fp.write(f"INFO: [stub] {name} {' '.join(args)}\n")
+    if os.environ.get("STUB_CALLS"):
+        with open(os.environ["STUB_CALLS"], "a") as fp:
+            fp.write(f"{name} {' '.join(args)}\n")
+    if name == "vivado" and "-source" in args[:-1]:
+        with open(args[args.index("-source") + 1]) as fp:
+            script = fp.read()
+        for ip, ip_dir in re.findall(r"^create_ip .*-module_name (\S+) -dir (\S+)", script, re.M):
+            if ip in os.environ.get("STUB_FAIL", "").split():
+                print(f"ERROR: [stub] {ip} failed")
+                sys.exit(1)
+            os.makedirs(os.path.join(ip_dir, ip), exist_ok=True)
+            for suffix in [".dcp", ".xci"]:
+                with open(os.path.join(ip_dir, ip, ip + suffix), "w") as fp:
+                    fp.write(f"{ip}{suffix}\n")
+    sys.exit(0)
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Minimal stand in for the toolbox package (used only when it is not installed)
+
+Provides just what the tools import so their python side can be tested and
+benchmarked offline (see tests/conftest.py).
+"""
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Stand in for toolbox.tool"""
+
+
+class ToolError(Exception):
+    pass
+
+
+class Tool:
+    """Tool reading properties from a dict database"""
+    def __init__(self, db, log):
+        self._db = db
+        self.log = log
+
+    def get_db(self, key):
+        return self._db[key]
+
+    def get_namespace(self, name):
+        return self._db.get(f"namespace.{name}", name)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Stand in for toolbox.utils (BinaryDriver runs the command through the shell)"""
+
+# Imports - standard library
+from pathlib import Path
+import subprocess
+
+
+class BinaryDriver:
+    def __init__(self, binary):
+        self.binary = binary
+        self.options = []
+
+    def add_option(self, name=None, value=None):
+        self.options += [str(o) for o in (name, value) if o is not None]
+
+    def get_execute_string(self):
+        return " ".join([self.binary] + self.options)
+
+    def execute(self, directory=None):
+        subprocess.run(self.get_execute_string(), shell=True, cwd=directory,
+                       stdout=subprocess.DEVNULL)
@@ -0,0 +1,56 @@
+// Excerpt in the style of write_verilog (escaped names, attributes, parameters)
+// Copyright 1986-2020 Xilinx, Inc. All Rights Reserved.
+`timescale 1 ps / 1 ps
+
+module core
+   (clk,
+    din,
+    \data_reg[3]_0 );
+  input clk;
+  input [3:0]din;
+  output [3:0]\data_reg[3]_0 ;
+
+  wire clk;
+  wire [3:0]din;
+  wire [3:0]\data_reg[3]_0 ;
+
+  FDRE #(
+    .INIT(1'b0)) 
+    \data_reg[0] 
+       (.C(clk),
+        .CE(1'b1),
+        .D(din[0]),
+        .Q(\data_reg[3]_0 [0]),
+        .R(1'b0));
+  CARRY4 \cnt_reg[3]_i_1 
+       (.CI(1'b0),
+        .CO({\cnt_reg[3]_i_1_n_0 ,\cnt_reg[3]_i_1_n_1 ,\cnt_reg[3]_i_1_n_2 ,\cnt_reg[3]_i_1_n_3 }),
+        .DI({1'b0,1'b0,1'b0,1'b0}),
+        .O(din),
+        .S(din));
+endmodule
+
+(* STRUCTURAL_NETLIST = "yes" *)
+module top
+   (sys_clk,
+    led);
+  input sys_clk;
+  output [3:0]led;
+
+  wire sys_clk;
+  wire sys_clk_IBUF;
+  wire sys_clk_IBUF_BUFG;
+  wire [3:0]led_OBUF;
+
+  (* BOX_TYPE = "PRIMITIVE" *) 
+  BUFG sys_clk_IBUF_BUFG_inst
+       (.I(sys_clk_IBUF),
+        .O(sys_clk_IBUF_BUFG));
+  IBUF sys_clk_IBUF_inst
+       (.I(sys_clk),
+        .O(sys_clk_IBUF));
+  core u_core
+       (.clk(sys_clk_IBUF_BUFG),
+        .din(led_OBUF),
+        .\data_reg[3]_0 (led_OBUF));
+endmodule
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for new_batch_insert_ila.tcl (against tests/stubs/netlist.tcl in tclsh)"""
+
+# Imports - standard library
+from pathlib import Path
+import shutil
+import subprocess
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+
+TESTS_DIR = Path(__file__).resolve().parent
+STUB = TESTS_DIR / "stubs" / "netlist.tcl"
+ILA = TESTS_DIR.parent / "toolbox_xilinx_tools" / "2020.2" / "new_batch_insert_ila.tcl"
+
+pytestmark = pytest.mark.skipif(shutil.which("tclsh") is None, reason="tclsh not installed")
+
+
+def tclsh(tmp_path, body):
+    """Runs body after sourcing the stub and the ILA script, returns stdout lines"""
+    script = tmp_path / "run.tcl"
+    script.write_text(f"source {STUB}\nsource {ILA}\n{body}\n")
+    proc = subprocess.run(["tclsh", str(script)], capture_output=True, text=True, check=True)
+    return proc.stdout.splitlines()
+
+
+def insert(tmp_path, domains, regs, key="k1", map_file="clock_map.txt"):
+    """Runs batch_insert_ila on a stub design. Returns (output, queries, connections)"""
+    lines = tclsh(tmp_path, f"""
+stub_design {domains} {regs}
+batch_insert_ila 1000 {key} {tmp_path / map_file}
+puts "QUERIES $::stub_queries"
+foreach c $::stub_connections {{ puts "CONNECT [lindex $c 0]\t[lindex $c 1]" }}
+""")
+    queries = int(next(l for l in lines if l.startswith("QUERIES")).split()[1])
+    connections = [l[len("CONNECT "):].split("\t") for l in lines if l.startswith("CONNECT")]
+    return lines, queries, connections
+
+
+def test_helpers(tmp_path):
+    lines = tclsh(tmp_path, f"""
+puts [ila_bus_bit {{u_0/data[12]}}]
+puts [ila_bus_bit u_0/flag]
+puts [list [ila_fix_depth 1000] [ila_fix_depth 3000] [ila_fix_depth 4096] [ila_fix_depth 1000000]]
+ila_write_clock_map {tmp_path / 'm.txt'} abc {{u_0/data clk_0_BUFG}}
+puts [ila_read_clock_map {tmp_path / 'm.txt'} abc]
+puts "stale:[ila_read_clock_map {tmp_path / 'm.txt'} def]"
+""")
+    assert lines == ["u_0/data 12", "u_0/flag -1", "1024 4096 4096 131072",
+                     "u_0/data clk_0_BUFG", "stale:"]
+
+
+def test_insert(tmp_path):
+    lines, _, connections = insert(tmp_path, 2, 4)
+    assert [c for c in connections if c[0] == "core"] == [["core", "ila_1"], ["core", "ila_2"]]
+    clocks = {port: nets for port, nets in connections if port.endswith("/clk")}
+    assert sorted(clocks.values()) == ["clk_0_BUFG", "clk_1_BUFG"]
+    domain0 = [c for c in clocks if clocks[c] == "clk_0_BUFG"][0].split("/")[0]
+    probes = [nets for port, nets in connections if port.startswith(f"{domain0}/probe")]
+    # Bus of 4 bits and the combinational flag traced through its timing path,
+    # the net attached to the VIO core is not probed
+    assert probes == ["{u_0/data[0]} {u_0/data[1]} {u_0/data[2]} {u_0/data[3]}", "u_0/flag"]
+    assert "Creating ILA ila_1 with capture depth 1024 and advanced trigger = false" in lines
+
+
+def test_queries_independent_of_nets(tmp_path):
+    _, small, _ = insert(tmp_path, 3, 4, map_file="small.txt")
+    _, large, _ = insert(tmp_path, 3, 64, map_file="large.txt")
+    probe_lookups = 3 * (64 - 4)
+    assert large - probe_lookups == small
+
+
+def test_clock_map_cache(tmp_path):
+    lines, traced, _ = insert(tmp_path, 2, 8)
+    assert "ILA clock domains: 3 buses, 0 from clock map, 3 traced" in lines
+    # Same netlist: nothing traced, same cores
+    lines, cached, connections = insert(tmp_path, 2, 8)
+    assert "ILA clock domains: 3 buses, 3 from clock map, 0 traced" in lines
+    assert cached < traced
+    assert len([c for c in connections if c[0] == "core"]) == 2
+    # Different netlist key: traced again
+    lines, _, _ = insert(tmp_path, 2, 8, key="k2")
+    assert "ILA clock domains: 3 buses, 0 from clock map, 3 traced" in lines
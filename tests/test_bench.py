@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module bench"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.bench import measure, load_baseline, save_baseline, regressions
+
+
+def test_measure():
+    result = measure(lambda n: [0] * n, setup=lambda: 2**20, repeat=2)
+    assert result["time_s"] > 0
+    assert result["peak_alloc_mb"] >= 7.9
+
+
+def test_baseline(tmp_path):
+    fpath = tmp_path / "baseline.json"
+    baseline = load_baseline(fpath)
+    assert regressions("gen", {"time_s": 1.0}, baseline) == []
+    save_baseline(fpath, {"gen": {"time_s": 1.0, "peak_alloc_mb": 10.0}})
+    baseline = load_baseline(fpath)
+    assert regressions("gen", {"time_s": 1.2, "peak_alloc_mb": 10.0}, baseline) == []
+    found = regressions("gen", {"time_s": 2.0, "peak_alloc_mb": 20.0}, baseline)
+    assert len(found) == 2
+    # Tiny absolute differences are noise
+    save_baseline(fpath, {"tiny": {"time_s": 0.001}})
+    assert regressions("tiny", {"time_s": 0.004}, load_baseline(fpath)) == []
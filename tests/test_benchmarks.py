@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Benchmarks of the tcl/xdc generators and xsim parsing on synthetic designs
+
+Scenarios scale to 10k ports, 1k clocks and 500 ip blocks. vivado, xvlog,
+xelab and xsim are replaced by tests/stubs/stub_tool.py on PATH. Every
+scenario is checked against tests/bench_baseline.json (see module bench).
+The timings are machine specific, so the benchmarks only run with BENCH=1
+(make bench, make bench-baseline). Set BENCH_UPDATE_BASELINE=1 to store
+the measured results as new baseline and BENCH_RESULTS=<file> to write
+them to a json file. Without toolbox
+installed the tools run on the stand ins in tests/stubs (see conftest.py).
+"""
+
+# Imports - standard library
+from pathlib import Path
+import json
+import os
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.bench import measure, load_baseline, save_baseline, regressions
+
+BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+
+pytestmark = [pytest.mark.bench,
+              pytest.mark.skipif(not os.environ.get("BENCH"), reason="benchmarks run with BENCH=1")]
+
+N_PORTS = 10000
+N_CLOCKS = 1000
+N_BLOCKS = 500
+N_UNITS = 1000
+BUS_WIDTH = 32
+
+
+@pytest.fixture(scope="module")
+def results():
+    """Collects scenario results, stores them as requested at the end"""
+    collected = {}
+    yield collected
+    if os.environ.get("BENCH_RESULTS"):
+        with open(os.environ["BENCH_RESULTS"], "w") as fp:
+            json.dump(collected, fp, indent=2, sort_keys=True)
+    if os.environ.get("BENCH_UPDATE_BASELINE"):
+        save_baseline(BASELINE, collected)
+
+
+def check(results, name, result):
+    results[name] = result
+    found = regressions(name, result, load_baseline(BASELINE))
+    assert not found, "\n".join(found)
+
+
+def implement_config():
+    """Implement namespace with N_PORTS io ports and N_CLOCKS clocks"""
+    ports = [f"bus{b}[{i}]" for b in range(N_PORTS // BUS_WIDTH) for i in range(BUS_WIDTH)]
+    ports += [f"p{i}" for i in range(N_PORTS - len(ports))]
+    clocks = [f"clk{i}" for i in range(N_CLOCKS)]
+
+    def delay(i, port):
+        return {"clock": clocks[i // BUS_WIDTH % N_CLOCKS], "clock_edge": "rise",
+                "port": port, "min_delay": 0.5, "max_delay": 1.0 + (i // BUS_WIDTH) % 3}
+
+    half = len(ports) // 2
+    return {
+        "units": {"time": "ns"},
+        "io_delay_grouping": "grouped_wildcard",
+        "ports": [{"name": p, "iostandard": "LVCMOS33", "package_pin": f"X{i}"}
+                  for i, p in enumerate(ports)],
+        "primary_clocks": [{"name": c, "object": f"{c}_i", "type": "port", "period": 10.0}
+                           for c in clocks],
+        "generated_clocks": [],
+        "input_delay_constraints": [delay(i, p) for i, p in enumerate(ports[:half])],
+        "output_delay_constraints": [delay(i, p) for i, p in enumerate(ports[half:])],
+        "clock_groups": [{"name": f"cg{i}", "type": "asynchronous",
+                          "groups": [[clocks[i]], [clocks[i + 1]]]}
+                         for i in range(0, N_CLOCKS, 2)],
+        "false_paths": [{"from": {"name": c, "type": "clock"},
+                         "to": {"name": f"rst{i}", "type": "port"}}
+                        for i, c in enumerate(clocks)],
+    }
+
+
+@pytest.fixture(scope="module")
+def implement(load_tool, make_tool):
+    module = load_tool("implement")
+    viv = implement_config()
+
+    def tool(job_dir="."):
+        job_dir = Path(job_dir)
+        return make_tool(module.XilinxImplementTool,
+                         {"internal.job_dir": str(job_dir), "internal.work_dir": str(job_dir)},
+                         viv=viv,
+                         time_multiplier={"us": 1e3, "ns": 1, "ps": 1e-3},
+                         timing_xdc=module.File(str(job_dir / "timing.xdc"), "#"))
+    return tool
+
+
+def test_render_timing_xdc(implement, tmp_path, results):
+    counter = iter(range(100))
+
+    def setup():
+        job_dir = tmp_path / f"job{next(counter)}"
+        job_dir.mkdir()
+        return implement(job_dir)
+
+    check(results, "render_timing_xdc", measure(lambda t: t.render_timing_xdc(), setup))
+
+
+def test_io_delay_section(implement, results):
+    tool = implement()
+    check(results, "io_delay_section", measure(tool.io_delay_section))
+
+
+def test_clock_groups(implement, results):
+    tool = implement()
+    check(results, "clock_groups", measure(tool.clock_groups))
+
+
+def test_false_paths(implement, results):
+    tool = implement()
+    check(results, "false_paths", measure(tool.false_paths))
+
+
+@pytest.mark.parametrize("per_block", [False, True])
+def test_render_ip_tcl(tmp_path, stub_path, results, per_block, load_tool, make_tool):
+    module = load_tool("ip")
+    ip = {
+        "part": "xc7a35ticsg324-1L",
+        "blocks": {f"fifo_{i}": {"vlnv": "xilinx.com:ip:fifo_generator:13.2",
+                                 "properties": [{"name": "Input_Data_Width", "value": 8 + i % 64},
+                                                {"name": "Input_Depth", "value": 512},
+                                                {"name": "Performance_Options", "value": "First_Word_Fall_Through"}]}
+                   for i in range(N_BLOCKS)},
+        "parallel": {"enabled": per_block, "mem_per_block_gb": 4},
+        "cache": {"enabled": False},
+    }
+    counter = iter(range(100))
+
+    def setup():
+        job_dir = tmp_path / f"job{next(counter)}"
+        job_dir.mkdir()
+        return make_tool(module.IPTool, {"internal.job_dir": str(job_dir)},
+                         ip=ip,
+                         ip_file=module.File(str(job_dir / "ip.tcl"), "#"),
+                         ip_dir=str(job_dir / "ip"),
+                         run_dir=str(job_dir / "ip_runs"),
+                         pending=[],
+                         blocks=ip["blocks"],
+                         catalog_dir=str(job_dir / "ip_catalog"),
+                         uncataloged=set())
+
+    name = "render_ip_tcl_per_block" if per_block else "render_ip_tcl"
+    check(results, name, measure(lambda t: t.render_ip_tcl(), setup))
+
+
+def test_parse_files(tmp_path, stub_path, results, load_tool, make_tool):
+    module = load_tool("simulate")
+    src = tmp_path / "src"
+    src.mkdir()
+    packages, rtl = [], []
+    for i in range(N_UNITS // 10):
+        f = src / f"pkg{i}.sv"
+        f.write_text(f"package pkg{i};\n  typedef logic [{i % 64}:0] word_t;\nendpackage\n")
+        packages.append(str(f))
+    for i in range(N_UNITS - len(packages)):
+        f = src / f"mod{i}.sv"
+        f.write_text(f"module mod{i}(input pkg{i % len(packages)}::word_t a);\nendmodule\n")
+        rtl.append(str(f))
+    sim = {"packages": packages, "test": [], "rtl": rtl, "libraries": {},
+           "include_dirs": [], "defines": [], "verilog_version": "sv",
+           "scheduler": {"enabled": False}}
+    counter = iter(range(100))
+
+    def setup(full=True):
+        job_dir = tmp_path / f"job{next(counter)}"
+        job_dir.mkdir()
+        return make_tool(module.XsimTool, {"internal.job_dir": str(job_dir)},
+                         sim=sim,
+                         state_file=str(job_dir / "xsim.dir" / "incremental.json"),
+                         state={"units": {}, "elab": None},
+                         fingerprints={},
+                         recompiled=True)
+
+    check(results, "parse_files_full", measure(lambda t: t.parse_files(), setup))
+    # Nothing changed: only fingerprinting, no xvlog
+    tool = setup()
+    tool.parse_files()
+    check(results, "parse_files_unchanged", measure(tool.parse_files))
+    assert not tool.recompiled
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module build_cache"""
+
+# Imports - standard library
+import os
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.build_cache import BuildCache, hash_inputs
+
+
+def test_hash_inputs(tmp_path):
+    a = tmp_path / "a.v"
+    a.write_text("module a; endmodule")
+    inc = tmp_path / "inc"
+    inc.mkdir()
+    (inc / "defs.vh").write_text("`define X 1")
+    key = hash_inputs([a], [inc])
+    assert key == hash_inputs([a], [inc])
+    (inc / "defs.vh").write_text("`define X 2")
+    assert key != hash_inputs([a], [inc])
+    assert hash_inputs([a], extra={"mode": "batch"}) != hash_inputs([a], extra={"mode": "tcl"})
+
+
+def test_store_restore(tmp_path):
+    job = tmp_path / "job"
+    (job / "checkpoints").mkdir(parents=True)
+    (job / "checkpoints" / "post_route.dcp").write_text("dcp")
+    (job / "top.bit").write_text("bit")
+    (job / "implement.tcl").write_text("tcl")
+    cache = BuildCache(tmp_path / "cache")
+    assert not cache.restore("k0", tmp_path / "new")
+    assert cache.store("k0", job, ["checkpoints", "*.bit"]) == ["checkpoints/post_route.dcp", "top.bit"]
+    assert cache.restore("k0", tmp_path / "new")
+    assert (tmp_path / "new" / "checkpoints" / "post_route.dcp").read_text() == "dcp"
+    assert not (tmp_path / "new" / "implement.tcl").exists()
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_lru_eviction(tmp_path):
+    job = tmp_path / "job"
+    job.mkdir()
+    (job / "top.bit").write_text("bit")
+    cache = BuildCache(tmp_path / "cache", max_entries=2)
+    cache.store("k0", job, ["*.bit"])
+    cache.store("k1", job, ["*.bit"])
+    # Make k1 the least recently used
+    os.utime(cache.entry("k1") / "manifest.json", (0, 0))
+    cache.store("k2", job, ["*.bit"])
+    assert [e.name for e in cache.entries()] == ["k0", "k2"]
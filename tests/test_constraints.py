@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module constraints"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.constraints import group_delays, compress_ports, get_ports, \
+    check_pins, read_pin_table, object_query, xdc_clocks
+
+
+def delay(port, clock="clk", edge="rise", lo=1.0, hi=2.0):
+    return {"port": port, "clock": clock, "clock_edge": edge, "min_delay": lo, "max_delay": hi}
+
+
+def test_group_delays():
+    cons = [delay("a"), delay("b", edge="fall"), delay("c"), delay("d", hi=3.0)]
+    groups = group_delays(cons, scale=1e3)
+    assert [g["ports"] for g in groups] == [["a", "c"], ["b"], ["d"]]
+    assert groups[0]["min_delay"] == 1e3 and groups[0]["max_delay"] == 2e3
+    assert get_ports(groups[0]["ports"]) == "[get_ports {a c}]"
+    assert get_ports(groups[1]["ports"]) == "[get_ports b]"
+
+
+def test_compress_ports():
+    known = ["d[0]", "d[1]", "d[2]", "e[0]", "e[1]", "clk"]
+    assert compress_ports(["d[0]", "d[1]", "d[2]", "e[0]"], known) == ["d[*]", "e[0]"]
+    assert compress_ports(["d[0]", "d[1]", "d[2]"]) == ["d[0]", "d[1]", "d[2]"]
+
+
+def port(name, pin):
+    return {"name": name, "package_pin": pin, "iostandard": "LVCMOS33"}
+
+
+def test_check_pins(tmp_path):
+    table = tmp_path / "xc7a35tcpg236pkg.txt"
+    table.write_text("Device/Package xc7a35tcpg236\n\n"
+                     "Pin  Pin Name  Memory Byte Group  Bank  VCCAUX Group  Super Logic Region  I/O Type  No-Connect\n"
+                     "A14  IO_L6N_T0_VREF_16  0  16  NA  NA  HR  NA\n"
+                     "A15  IO_L6P_T0_16  0  16  NA  NA  HR  NA\n"
+                     "A1   GND  NA  NA  NA  NA  NA  NA\n")
+    pins = read_pin_table(table)
+    assert pins["A14"] == "IO_L6N_T0_VREF_16"
+    ports = [port("a", "A14"), port("b", "A14"), port("c", "A1"), port("d", "Z99"), port("a", "A15")]
+    errors = check_pins(ports, pins)
+    assert 'Port "a" defined 2 times' in errors
+    assert "Pin A14 assigned to multiple ports: a, b" in errors
+    assert any("A1 " in e and "not a user IO" in e for e in errors)
+    assert any("Z99" in e and "does not exist" in e for e in errors)
+    assert check_pins([port("a", "A14"), port("b", "A15")], pins) == []
+
+
+def test_object_query(tmp_path):
+    assert object_query("pin", "u_core/data_reg[0]/C") == "[get_pins -hierarchical u_core/data_reg[0]/C]"
+    assert object_query("clock", "sys_clk") == "[get_clocks sys_clk]"
+    with pytest.raises(ValueError, match="unsupported"):
+        object_query("bel", "SLICE_X0Y0")
+    xdc = tmp_path / "clocks.xdc"
+    xdc.write_text("create_clock -period 10.0 -name sys_clk [get_ports clk]\n"
+                   "create_generated_clock -name {div2} -source [get_pins a/C] -divide_by 2 [get_pins b/Q]\n")
+    assert xdc_clocks(xdc) == ["sys_clk", "div2"]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module farm (workers on localhost)"""
+
+# Imports - standard library
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import threading
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.farm import Farm, FarmJob, FarmError, start_worker
+
+# Reads the script given as argument, copies the source it names to out/ and writes a log
+TOOL = """
+import os, sys, time
+script = open(sys.argv[1]).read().split()
+src = script[1]
+os.makedirs("out", exist_ok=True)
+open("out/copy.v", "w").write(open(src).read())
+open("run.log", "w").write("ran " + os.path.basename(src))
+for i in range(3):
+    print("line", i, flush=True)
+time.sleep(float(sys.argv[2]) if len(sys.argv) > 2 else 0)
+sys.exit(int(os.environ.get("RC", "0")))
+"""
+
+
+@pytest.fixture
+def workers(tmp_path):
+    servers = []
+    for i in range(2):
+        server = start_worker(tmp_path / f"worker{i}", slots=1, token="secret")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield [f"127.0.0.1:{s.server_address[1]}" for s in servers], servers
+    for s in servers:
+        s.shutdown()
+        s.server_close()
+
+
+def job_dir(tmp_path):
+    src = tmp_path / "rtl" / "top.v"
+    src.parent.mkdir()
+    src.write_text("module top; endmodule\n")
+    root = tmp_path / "job"
+    (root / "reports").mkdir(parents=True)
+    (root / "tool.py").write_text(TOOL)
+    (root / "run.tcl").write_text(f"read_verilog {src}\nsource {root}/other.tcl\n")
+    return root, src
+
+
+def test_run_and_dedupe(tmp_path, workers):
+    addresses, servers = workers
+    root, src = job_dir(tmp_path)
+    farm = Farm(addresses, token="secret")
+    lines = []
+    job = FarmJob("copy", [sys.executable, "tool.py", "run.tcl"], root, external=[src],
+                  log=lines.append, log_file=root / "farm.log")
+    result = farm.run(job)
+    assert result.ok and result.uploaded > 0
+    assert lines == ["line 0", "line 1", "line 2"]
+    assert (root / "farm.log").read_text().splitlines() == lines
+    # Artifacts are fetched back, inputs are untouched
+    assert (root / "out" / "copy.v").read_text() == src.read_text()
+    assert (root / "run.log").read_text() == "ran top.v"
+    assert str(src) in (root / "run.tcl").read_text()
+    # Paths were rewritten for the worker
+    manifest, blobs = job.manifest()
+    tcl = blobs[manifest["files"]["run.tcl"]["digest"]].decode()
+    assert tcl == f"read_verilog ../ext{src}\nsource ./other.tcl\n"
+    assert "reports" in manifest["dirs"]
+    # Second run on the same worker uploads nothing and outputs are up to date
+    other = servers[1 - addresses.index(result.worker)]
+    other.shutdown()
+    other.server_close()
+    result = farm.run(job)
+    assert result.ok and result.uploaded == 0
+    assert result.fetched == 0 and result.skipped == 2
+
+
+def test_spread_and_failures(tmp_path, workers):
+    addresses, _ = workers
+    root, src = job_dir(tmp_path)
+    farm = Farm(addresses, token="secret")
+    jobs = [FarmJob(f"copy{i}", [sys.executable, "tool.py", "run.tcl", "0.5"], root,
+                    external=[src], artifacts=["out/**"]) for i in range(2)]
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(farm.run, jobs))
+    assert sorted(r.worker for r in results) == sorted(addresses)
+    assert farm.slots() == 2
+    assert not (root / "run.log").exists()
+    # Command failing on the worker
+    failing = FarmJob("fail", [sys.executable, "-c", "import sys; sys.exit(3)"], root)
+    assert farm.run(failing).rc == 3
+    # Wrong token and no reachable workers
+    with pytest.raises(FarmError):
+        Farm(addresses, token="wrong").run(failing)
+    with pytest.raises(FarmError):
+        Farm(["127.0.0.1:1"], token="secret").run(failing)
+
+
+def test_token_required(tmp_path, monkeypatch):
+    monkeypatch.delenv("FARM_TOKEN", raising=False)
+    with pytest.raises(FarmError):
+        start_worker(tmp_path / "worker")
+    with pytest.raises(FarmError):
+        Farm(["127.0.0.1:1"])
+
+
+def test_include_and_links(tmp_path, workers):
+    addresses, _ = workers
+    root = tmp_path / "sim"
+    (root / "xsim.dir" / "snap").mkdir(parents=True)
+    (root / "xsim.dir" / "snap" / "xsimk").write_text("kernel")
+    (root / "other").mkdir()
+    (root / "other" / "big.bin").write_text("x" * 1000)
+    run = root / "regression" / "t0"
+    run.mkdir(parents=True)
+    os.symlink(root / "xsim.dir", run / "xsim.dir")
+    job = FarmJob("t0", [sys.executable, "-c",
+                         "print(open('xsim.dir/snap/xsimk').read()); open('xsim.log', 'w').write('ok')"],
+                  root, cwd="regression/t0", include=["xsim.dir/**", "regression/t0/**"],
+                  artifacts=["regression/t0/**"])
+    manifest, _ = job.manifest()
+    assert sorted(manifest["files"]) == ["xsim.dir/snap/xsimk"]
+    assert manifest["links"] == {"regression/t0/xsim.dir": "../../xsim.dir"}
+    assert manifest["dirs"] == ["regression", "regression/t0", "xsim.dir", "xsim.dir/snap"]
+    lines = []
+    job.log = lines.append
+    result = Farm(addresses, token="secret").run(job)
+    assert result.ok and lines == ["kernel"]
+    assert (run / "xsim.log").read_text() == "ok"
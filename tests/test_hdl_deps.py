@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module hdl_deps"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.hdl_deps import DependencyGraph, scan, scan_modules
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_scan(tmp_path):
+    f = write(tmp_path / "a.sv", '`include "defs.vh"\n// import fake::*;\nimport bus_pkg::*;\nmodule a; endmodule\n')
+    assert scan(f) == {"includes": ["defs.vh"], "imports": ["bus_pkg"], "packages": []}
+
+
+def test_graph(tmp_path):
+    inc = tmp_path / "inc"
+    inc.mkdir()
+    defs = write(inc / "defs.vh", "`define W 8\n")
+    pkg = write(tmp_path / "pkg.sv", '`include "defs.vh"\npackage bus_pkg;\nendpackage\n')
+    top = write(tmp_path / "top.sv", "module top; bus_pkg::word_t w; endmodule\n")
+    leaf = write(tmp_path / "leaf.sv", "module leaf; endmodule\n")
+    graph = DependencyGraph([top, leaf, pkg], [inc])
+    assert graph.includes[pkg] == [defs]
+    assert graph.deps[top] == [pkg]
+    assert graph.order() == [pkg, top, leaf]
+    assert graph.dependents(pkg) == [top]
+    before = graph.fingerprints()
+    # Changing an include changes the includer and everything importing it
+    write(inc / "defs.vh", "`define W 16\n")
+    after = DependencyGraph([top, leaf, pkg], [inc]).fingerprints()
+    assert before[pkg] != after[pkg]
+    assert before[top] != after[top]
+    assert before[leaf] == after[leaf]
+
+
+def test_scan_modules(tmp_path):
+    f = write(tmp_path / "top.sv", "module top(input clk);\n"
+              "  fifo #(.W(8), .D($clog2(16))) u_fifo [1:0] (.clk(clk));\n"
+              "  // ghost u_ghost();\n"
+              "  always_ff @(posedge clk) if (en) q <= d;\n"
+              "endmodule\n")
+    assert scan_modules(f) == {"modules": ["top"], "instances": ["fifo"]}
+
+
+def test_partition(tmp_path):
+    pkg = write(tmp_path / "pkg.sv", "package bus_pkg;\nendpackage\n")
+    top = write(tmp_path / "top.sv", "module top; core u_core(); glue u_glue(); endmodule\n")
+    glue = write(tmp_path / "glue.sv", "module glue; bus_pkg::word_t w; endmodule\n")
+    core = write(tmp_path / "core.sv", "module core; alu u_alu(.a(a)); endmodule\n")
+    alu = write(tmp_path / "alu.sv", "module alu(input a); import bus_pkg::*; endmodule\n")
+    graph = DependencyGraph([pkg, top, glue, core, alu])
+    assert graph.module_closure("core") == [pkg, core, alu]
+    assert graph.module_closure("top", stop=["core"]) == [pkg, top, glue]
+    top_files, closures = graph.partition("top", ["core"])
+    assert top_files == [pkg, top, glue]
+    assert closures == {"core": [pkg, core, alu]}
+    # A separated module must not share its file with the rest of the design
+    shared = write(tmp_path / "shared.sv", "module core; endmodule\nmodule glue; endmodule\n")
+    with pytest.raises(ValueError):
+        DependencyGraph([top, shared]).partition("top", ["core"])
+    with pytest.raises(KeyError):
+        graph.partition("top", ["missing"])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module history"""
+
+# Imports - standard library
+import json
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.history import History, job_metrics, main
+
+
+def test_job_metrics(tmp_path):
+    index = {"timing": {"post_route": {"wns": -0.1, "tns": -2.0, "whs": 0.02, "ths": 0.0}},
+             "utilization": {"post_place": {"slice_luts": {"used": 10, "util_pct": 1.5}},
+                             "post_route": {"slice_luts": {"used": 12, "util_pct": 2.0}}},
+             "power": {"post_route": {"total_on_chip_power_w": 0.25}}}
+    (tmp_path / "report_index.json").write_text(json.dumps(index))
+    (tmp_path / "stage_metrics.json").write_text(json.dumps({
+        "total": {"wall_s": 10, "cpu_s": 20, "peak_rss_mb": 900},
+        "stages": [{"stage": "route_design", "wall_s": 4, "cpu_s": 8, "peak_rss_mb": 900}]}))
+    (tmp_path / "top.bit").write_bytes(b"\0" * 100)
+    metrics = job_metrics(tmp_path, "top")
+    assert metrics["timing.post_route.wns"] == -0.1
+    assert metrics["util.post_route.slice_luts"] == 2.0
+    assert metrics["power.total_on_chip_power_w"] == 0.25
+    assert metrics["stage.route_design.wall_s"] == 4
+    assert metrics["bitstream.bytes"] == 100
+
+
+def test_regressions(tmp_path):
+    db = tmp_path / "history.sqlite"
+    with History(db) as hist:
+        for i in range(5):
+            hist.record("implement", "current", {"timing.post_route.wns": 0.10 + 0.001 * i,
+                                                 "total.wall_s": 100 + i},
+                        git_rev=f"rev{i}", timestamp=i)
+        assert hist.regressions("implement", "current") == []
+        hist.record("implement", "current", {"timing.post_route.wns": -0.2, "total.wall_s": 103},
+                    git_rev="bad", timestamp=10)
+        found = hist.regressions("implement", "current")
+        assert [r["name"] for r in found] == ["timing.post_route.wns"]
+        assert hist.series("implement", "current", "total.wall_s", 2) == [("bad", 10, 103), ("rev4", 4, 104)]
+    assert main([str(db), "check", "implement", "current"]) == 1
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module hw_batch (against tests/stubs/hw_manager.tcl in tclsh)"""
+
+# Imports - standard library
+from pathlib import Path
+import shutil
+import time
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.hw_batch import group_chains, plan_workers, run_batch, format_table
+
+STUB = Path(__file__).resolve().parent / "stubs" / "hw_manager.tcl"
+
+pytestmark = pytest.mark.skipif(shutil.which("tclsh") is None, reason="tclsh not installed")
+
+
+def prelude(tmp_path, targets, fail="", delay_ms=0):
+    fpath = tmp_path / "stub_config.tcl"
+    fpath.write_text(f"set ::stub_targets {{{targets}}}\nset ::stub_fail {{{fail}}}\n"
+                     f"set ::stub_delay_ms {delay_ms}\nsource {STUB}\n")
+    return str(fpath)
+
+
+def test_group_chains(tmp_path):
+    chains = group_chains([{"target": "t/1", "bitstream": "a.bit", "mask": "a.msk"},
+                           {"target": "t/1", "bitstream": "b.bit", "device": "xc7a35t_1"},
+                           {"target": "t/2", "bitstream": "c.bit", "verify": "none"}])
+    assert [len(c["devices"]) for c in chains] == [2, 1]
+    # Full verification without a mask falls back to readback crc
+    assert [d["verify"] for d in chains[0]["devices"]] == ["full", "crc"]
+    assert [len(p) for p in plan_workers(chains, 4)] == [1, 1]
+    assert len(plan_workers(chains, 1)) == 1
+
+
+def test_run_batch(tmp_path):
+    mappings = [{"target": "lab/A", "bitstream": "top.bit", "mask": "top.msk"},
+                {"target": "lab/A", "bitstream": "top.bit", "device": "xc7a35t_1", "verify": "crc"},
+                {"target": "lab/B", "bitstream": "top.bit"},
+                {"target": "lab/C", "bitstream": "top.bit"},
+                {"target": "lab/missing", "bitstream": "top.bit"}]
+    targets = "lab/A {xc7a35t_0 xc7a35t_1} lab/B {xc7z020_0} lab/C {xc7a100t_0}"
+    pre = prelude(tmp_path, targets, fail="xc7a35t_1 crc xc7a100t_0 program_hw_devices", delay_ms=300)
+    start = time.time()
+    results = run_batch(group_chains(mappings), tmp_path, lambda script, i: ["tclsh", script],
+                        workers=4, prelude=pre)
+    elapsed = time.time() - start
+    table = {(r["target"], r["device"]): r for r in results}
+    assert table[("lab/A", "xc7a35t_0")]["status"] == "ok"
+    assert table[("lab/A", "xc7a35t_0")]["verify"] == "full"
+    assert "CRC" in table[("lab/A", "xc7a35t_1")]["message"]
+    assert table[("lab/B", "xc7z020_0")]["status"] == "ok"
+    assert table[("lab/C", "xc7a100t_0")]["status"] == "failed"
+    assert table[("lab/missing", "")]["status"] == "failed"
+    assert [r["target"] for r in results][:2] == ["lab/A", "lab/A"]
+    # Chains are programmed concurrently (4 devices x 300 ms serially)
+    assert elapsed < 1.0
+    assert "xc7z020_0" in format_table(results)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for the implement tool (on the stand ins in tests/stubs without toolbox)"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+
+STAGES = ["synth", "opt", "place", "route", "bitstream"]
+
+
+@pytest.fixture(scope="module")
+def module(load_tool):
+    return load_tool("implement")
+
+
+def render(template, out, **kwargs):
+    """Stand in for JinjaTool.render_to_file writing the ooc paths of synth.tcl"""
+    with open(out, "w") as fp:
+        fp.write(f"# {template}\n")
+        for m in kwargs.get("ooc_modules", []):
+            fp.write(f"read_verilog {m['stub']}\nread_checkpoint {m['dcp']}\n")
+
+
+@pytest.fixture
+def job(module, make_tool):
+    """Function of (job_dir, timing, ooc) returning an implement tool (see make_job)"""
+    return lambda *args, **kwargs: make_job(module, make_tool, *args, **kwargs)
+
+
+def make_job(module, make_tool, job_dir, timing="create_clock -period 10 [get_ports clk]",
+             ooc=False):
+    """Implement tool with rendered stage tcl and xdc files in job_dir
+
+    With ooc the sources (shared by all job dirs) instantiate a module
+    synthesized out of context.
+    """
+    job_dir.mkdir()
+    viv = {"verilog": [], "vhdl": [], "xdc": [], "ip": [], "post_synthesis_xdc": [],
+           "ooc_modules": [], "include_dirs": [], "mode": "batch", "top": "top",
+           "part": "xc7a35ticsg324-1L", "verilog_version": "sv", "flatten_hierarchy": "rebuilt",
+           "directives": {}, "ila": {"enabled": False}, "closure": {"enabled": False}}
+    if ooc:
+        rtl = job_dir.parent / "rtl"
+        rtl.mkdir(exist_ok=True)
+        (rtl / "top.sv").write_text("module top; core u_core(); endmodule\n")
+        (rtl / "core.sv").write_text("module core; endmodule\n")
+        viv.update(verilog=[str(rtl / "top.sv"), str(rtl / "core.sv")],
+                   ooc_modules=[{"name": "core"}])
+    tool = make_tool(module.XilinxImplementTool, {"internal.job_dir": str(job_dir)}, viv=viv,
+                     ooc=None, ts={}, render_to_file=render,
+                     timing_xdc=module.File(str(job_dir / "timing.xdc"), "#"),
+                     physical_xdc=module.File(str(job_dir / "physical.xdc"), "#"))
+    tool.render_tcl()
+    tool.timing_xdc.add_line(timing)
+    tool.timing_xdc.generate()
+    tool.physical_xdc.add_line("set_property PACKAGE_PIN E3 [get_ports clk]")
+    tool.physical_xdc.generate()
+    tool.fingerprints = tool.stage_fingerprints()
+    return tool
+
+
+def test_fingerprints_ignore_header(job, tmp_path):
+    a, b = job(tmp_path / "a"), job(tmp_path / "b")
+    # Headers differ (path), contents do not
+    assert (tmp_path / "a" / "timing.xdc").read_text() != (tmp_path / "b" / "timing.xdc").read_text()
+    assert a.fingerprints == b.fingerprints
+    c = job(tmp_path / "c", timing="create_clock -period 5 [get_ports clk]")
+    assert c.fingerprints["synth"] != a.fingerprints["synth"]
+
+
+@pytest.mark.parametrize("ooc", [False, True])
+def test_cache_key_across_job_dirs(job, tmp_path, ooc):
+    a, b = job(tmp_path / "a", ooc=ooc), job(tmp_path / "b", ooc=ooc)
+    assert a.cache_key() == b.cache_key()
+    c = job(tmp_path / "c", timing="create_clock -period 5 [get_ports clk]", ooc=ooc)
+    assert c.cache_key() != a.cache_key()
+    if ooc:
+        assert "read_checkpoint ooc/core/core.dcp" in (tmp_path / "a" / "synth.tcl").read_text()
+        # Sweep runs reference the checkpoints of the job dir
+        (tmp_path / "a" / "sweep").mkdir()
+        a.render_tcl(str(tmp_path / "a" / "sweep"))
+        assert "read_checkpoint ../ooc/core/core.dcp" in \
+            (tmp_path / "a" / "sweep" / "synth.tcl").read_text()
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_lint_strict(module, job, netlist_index, tmp_path, strict):
+    tool = job(tmp_path / "job")
+    tool.viv.update(top="top", lint={"enabled": True, "strict": strict, "dir": str(tmp_path / "idx")},
+                    primary_clocks=[{"name": "sys", "object": "sys_clk"},
+                                    {"name": "missing", "object": "clk_missing"}],
+                    generated_clocks=[], input_delay_constraints=[], output_delay_constraints=[],
+                    clock_groups=[], false_paths=[], ports=[])
+    netlist_index.meta["sources"] = tool.source_digest()
+    netlist_index.save(tool.netlist_index_file())
+    if strict:
+        with pytest.raises(module.ToolError):
+            tool.lint_constraints()
+    else:
+        tool.lint_constraints()
+    report = (tmp_path / "job" / "constraint_lint.rpt").read_text()
+    assert "clk_missing" in report and "sys_clk" not in report.split("\n", 1)[1]
+
+
+@pytest.mark.parametrize("grouping, ports", [
+    ("grouped", "[get_ports {d[0] d[1]}]"),
+    ("grouped_wildcard", "[get_ports {d[*]}]"),
+])
+def test_io_delay_bus_wildcard(job, tmp_path, grouping, ports):
+    # d[2] is not pinned through ports (user xdc or unpinned), d[*] would match it too
+    tool = job(tmp_path / "job")
+    tool.time_multiplier = {"ns": 1}
+    tool.viv.update(units={"time": "ns"}, io_delay_grouping=grouping,
+                    ports=[{"name": "d[0]"}, {"name": "d[1]"}])
+    cons = [{"port": p, "clock": "clk", "clock_edge": "rise", "min_delay": 1.0, "max_delay": 2.0}
+            for p in ["d[0]", "d[1]"]]
+    lines = tool.delay_commands("set_input_delay", cons)
+    assert len(lines) == 2 and all(line.endswith(ports) for line in lines)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for per block generation of the ip tool (tests/stubs/stub_tool.py as vivado)"""
+
+# Imports - standard library
+import os
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+
+VLNV = "xilinx.com:ip:fifo_generator:13.2"
+
+
+def fifo(width):
+    return {"vlnv": VLNV, "properties": [{"name": "Input_Data_Width", "value": width},
+                                         {"name": "Input_Depth", "value": 512}]}
+
+
+@pytest.fixture
+def ip_job(tmp_path, stub_path, monkeypatch, load_tool, make_tool):
+    """Function of a job dir name returning an ip tool generating two fifos per block"""
+    module = load_tool("ip")
+    monkeypatch.setenv("STUB_CALLS", str(tmp_path / "calls.txt"))
+
+    def job(name):
+        job_dir = tmp_path / name
+        job_dir.mkdir()
+        ip = {"bin": "vivado", "execute": True, "part": "xc7a35ticsg324-1L",
+              "blocks": {"fifo_0": fifo(8), "fifo_1": fifo(16)},
+              "parallel": {"enabled": True, "mem_per_block_gb": 0.1, "max_workers": 2},
+              "cache": {"enabled": True, "dir": str(tmp_path / "cache")},
+              "farm": {"enabled": False}, "scheduler": {"enabled": False},
+              "monitor": {"enabled": False}}
+        tool = make_tool(module.IPTool, {"internal.job_dir": str(job_dir),
+                                         "internal.work_dir": str(tmp_path)},
+                         ip=ip, blocks=ip["blocks"],
+                         ip_file=module.File(str(job_dir / "ip.tcl"), "#"),
+                         ip_dir=str(job_dir / "ip"), run_dir=str(job_dir / "ip_runs"),
+                         pending=[], catalog_dir=str(job_dir / "ip_catalog"),
+                         uncataloged=set())
+        tool.messages = []
+        tool.log = lambda msg, level=None: tool.messages.append(msg)
+        return tool
+    job.module = module
+    return job
+
+
+def calls(tmp_path):
+    fpath = tmp_path / "calls.txt"
+    return fpath.read_text().splitlines() if fpath.exists() else []
+
+
+def test_generate_and_restore(ip_job, tmp_path):
+    tool = ip_job("job0")
+    tool.render_ip_tcl()
+    assert [b["name"] for b in tool.pending] == ["fifo_0", "fifo_1"]
+    tool.run_blocks()
+    assert len(calls(tmp_path)) == 2
+    for name in ["fifo_0", "fifo_1"]:
+        assert (tmp_path / "job0" / "ip" / name / f"{name}.dcp").is_file()
+    # Stored in the cache
+    cache = tool.build_cache()
+    assert all(cache.contains(tool.block_key(b)) for b in tool.blocks.values())
+    # Another job dir restores both blocks without running vivado
+    other = ip_job("job1")
+    other.render_ip_tcl()
+    assert other.pending == []
+    other.run_blocks()
+    assert len(calls(tmp_path)) == 2
+    assert (tmp_path / "job1" / "ip" / "fifo_1" / "fifo_1.dcp").read_text() == "fifo_1.dcp\n"
+    assert "IP fifo_0: restored from cache" in " ".join(other.messages)
+
+
+def test_failing_block(ip_job, tmp_path, monkeypatch):
+    monkeypatch.setenv("STUB_FAIL", "fifo_0")
+    tool = ip_job("job0")
+    tool.render_ip_tcl()
+    with pytest.raises(ip_job.module.ToolError, match="IP generation failed for: fifo_0$"):
+        tool.run_blocks()
+    # The other block was generated and cached, the failed one was not
+    assert len(calls(tmp_path)) == 2
+    assert (tmp_path / "job0" / "ip" / "fifo_1" / "fifo_1.dcp").is_file()
+    assert not (tmp_path / "job0" / "ip" / "fifo_0").exists()
+    cache = tool.build_cache()
+    assert cache.contains(tool.block_key(tool.blocks["fifo_1"]))
+    assert not cache.contains(tool.block_key(tool.blocks["fifo_0"]))
+    # The next run only generates the failed block
+    monkeypatch.delenv("STUB_FAIL")
+    retry = ip_job("job1")
+    retry.render_ip_tcl()
+    assert [b["name"] for b in retry.pending] == ["fifo_0"]
+    retry.run_blocks()
+    assert os.path.isfile(tmp_path / "job1" / "ip" / "fifo_0" / "fifo_0.dcp")
+
+
+def test_block_key(ip_job):
+    tool = ip_job("job0")
+    block = fifo(8)
+    reordered = dict(block, properties=list(reversed(block["properties"])))
+    assert tool.block_key(block) == tool.block_key(reordered)
+    # Values compare as strings (yaml ints and strings give the same tcl)
+    as_str = {"vlnv": VLNV, "properties": [{"name": "Input_Data_Width", "value": "8"},
+                                           {"name": "Input_Depth", "value": "512"}]}
+    assert tool.block_key(block) == tool.block_key(as_str)
+    assert tool.block_key(block) != tool.block_key(fifo(16))
+    assert tool.block_key(block) != tool.block_key(dict(block, vlnv="xilinx.com:ip:fifo_generator:13.1"))
+    tool.ip["part"] = "xc7a100tcsg324-1"
+    assert tool.block_key(block) != ip_job("job1").block_key(block)
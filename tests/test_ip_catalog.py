@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module ip_catalog"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.ip_catalog import IPCatalog, parse_report_property, \
+    parse_legal_values, validate, check_values, drop_defaults
+
+VLNV = "xilinx.com:ip:fifo_generator:13.2"
+PART = "xc7a35ticsg324-1L"
+
+REPORT = """Property                          Type    Read-only  Value
+CONFIG.Component_Name             string  false      fifo_0
+CONFIG.Fifo_Implementation        string  false      Common_Clock_Block_RAM
+CONFIG.Input_Data_Width           long    false      18
+CONFIG.Input_Depth                string  false      1024
+CONFIG.Use_Embedded_Registers     bool    false      false
+CONFIG.Full_Threshold_Assert_Value long   true       1022
+CONFIG.Almost_Full_Flag           string  false      false
+"""
+
+VALUES = """CONFIG.Component_Name\t
+CONFIG.Fifo_Implementation\tCommon_Clock_Block_RAM Common_Clock_Distributed_RAM Independent_Clocks_Block_RAM
+CONFIG.Input_Depth\t16 32 64 128 256 512 1024 2048 4096
+CONFIG.Input_Data_Width\t
+"""
+
+
+def test_parse():
+    props = parse_report_property(REPORT)
+    assert len(props) == 7
+    assert props["Input_Data_Width"] == {"type": "long", "read_only": False, "default": "18"}
+    assert props["Full_Threshold_Assert_Value"]["read_only"]
+    values = parse_legal_values(VALUES)
+    assert values["Input_Depth"][-1] == "4096"
+    assert values["Component_Name"] == []
+
+
+def test_validate_and_defaults(tmp_path):
+    (tmp_path / "fifo.rpt").write_text(REPORT)
+    (tmp_path / "fifo.values").write_text(VALUES)
+    db = tmp_path / "catalog.sqlite"
+    with IPCatalog(db) as catalog:
+        assert catalog.get(VLNV, PART) is None
+        assert catalog.harvest(VLNV, PART, tmp_path / "fifo.rpt", tmp_path / "fifo.values") == 7
+    with IPCatalog(db) as catalog:
+        entry = catalog.get(VLNV, PART)
+        assert catalog.cores() == [(VLNV, PART)]
+        assert catalog.get(VLNV, "xcvu9p") is None
+    props = [{"name": "input_depth", "value": 1024},
+             {"name": "Input_Data_Width", "value": 32},
+             {"name": "Use_Embedded_Registers", "value": "False"},
+             {"name": "Fifo_Implementation", "value": "Independent_Clocks_Block_RAM"}]
+    assert validate(entry, props) == []
+    assert check_values(entry, props) == []
+    kept, dropped = drop_defaults(entry, props)
+    assert dropped == ["input_depth", "Use_Embedded_Registers"]
+    assert [p["name"] for p in kept] == ["Input_Data_Width", "Fifo_Implementation"]
+    props = [{"name": "Input_Dept", "value": 1024},
+             {"name": "Input_Depth", "value": 1000},
+             {"name": "Input_Data_Width", "value": "wide"},
+             {"name": "Full_Threshold_Assert_Value", "value": 10}]
+    assert validate(entry, props) == ["unknown property Input_Dept (did you mean Input_Depth?)",
+                                      "Input_Data_Width = wide is not of type long"]
+    # Legal values and read-only state depend on other properties: warnings only
+    assert check_values(entry, props) == [
+        "Input_Depth = 1000 is not one of 16, 32, 64, 128, 256, 512, 1024, 2048, 4096 (default configuration)",
+        "property Full_Threshold_Assert_Value is read-only in the default configuration"]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module jobs"""
+
+# Imports - standard library
+import threading
+import time
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools import jobs
+from toolbox_xilinx_tools.jobs import max_workers, run_parallel
+
+GB = 1 << 30
+
+
+@pytest.fixture
+def host(monkeypatch):
+    """Host with 8 cpus and 10 GB of available memory"""
+    monkeypatch.setattr(jobs.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(jobs, "available_memory", lambda: 10 * GB)
+    return monkeypatch
+
+
+def test_max_workers_limits(host):
+    assert max_workers() == 8
+    assert max_workers(limit=3) == 3
+    assert max_workers(limit=16) == 8
+    # Memory per job bounds the count, the smallest bound wins
+    assert max_workers(mem_per_job=4 * GB) == 2
+    assert max_workers(mem_per_job=1 * GB) == 8
+    assert max_workers(mem_per_job=4 * GB, limit=1) == 1
+    # Always at least one worker
+    assert max_workers(mem_per_job=16 * GB) == 1
+    assert max_workers(limit=0) == 1
+
+
+def test_max_workers_unknown_host(host):
+    host.setattr(jobs.os, "cpu_count", lambda: None)
+    assert max_workers() == 1
+    host.setattr(jobs.os, "cpu_count", lambda: 4)
+    host.setattr(jobs, "available_memory", lambda: None)
+    # Without memory information only cpus and limit count
+    assert max_workers(mem_per_job=16 * GB) == 4
+
+
+def test_available_memory():
+    mem = jobs.available_memory()
+    assert mem is None or mem > 0
+
+
+def test_run_parallel_results():
+    def square(x):
+        if x == 3:
+            raise ValueError("three")
+        return x * x
+
+    results = run_parallel(square, range(6), 3)
+    assert sorted(results) == list(range(6))
+    assert {i: r for i, (r, e) in results.items() if e is None} == {0: 0, 1: 1, 2: 4, 4: 16, 5: 25}
+    result, exc = results[3]
+    assert result is None and isinstance(exc, ValueError) and str(exc) == "three"
+    assert run_parallel(square, [], 2) == {}
+
+
+def test_run_parallel_bounded():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def job(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return i
+
+    results = run_parallel(job, range(8), 2)
+    assert [results[i] for i in range(8)] == [(i, None) for i in range(8)]
+    assert peak[0] <= 2
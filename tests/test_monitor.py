@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module monitor"""
+
+# Imports - standard library
+import json
+import os
+import subprocess
+import sys
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.monitor import StageMonitor, run_monitored, sample_tree, vivado_stage
+
+# Stand in for vivado: prints stage commands, burns cpu and allocates memory
+STUB = r"""
+import sys, time
+print("****** Vivado v2020.2", flush=True)
+print("Command: synth_design -top top -part xc7a35t", flush=True)
+end = time.time() + 0.4
+while time.time() < end:
+    pass
+print("# synth_ip [get_ips fifo_0]", flush=True)
+buf = bytearray(64 * 2**20)
+time.sleep(0.4)
+print("Command: route_design", flush=True)
+del buf
+time.sleep(0.2)
+sys.exit(3)
+"""
+
+
+def test_vivado_stage():
+    assert vivado_stage("Command: opt_design -directive Explore\n") == "opt_design"
+    assert vivado_stage("# synth_ip [get_ips fifo_0]\n") == "synth_ip:fifo_0"
+    assert vivado_stage("INFO: [Synth 8-6157] synth_design done\n") is None
+
+
+def test_sample_tree():
+    cpu, rss = sample_tree(os.getpid())
+    assert cpu > 0 and rss > 0
+
+
+def test_stage_monitor(tmp_path):
+    mon = StageMonitor([sys.executable, "-c", STUB], tmp_path,
+                       log_file=tmp_path / "out.log", echo=False, interval=0.05)
+    assert mon.run() == 3
+    assert [s["stage"] for s in mon.stages] == ["synth_design", "synth_ip:fifo_0", "route_design"]
+    synth, ip, route = mon.stages
+    assert synth["cpu_s"] > 0
+    assert ip["peak_rss_mb"] >= 64
+    assert route["start"] >= ip["start"] + ip["wall_s"] - 0.01
+    assert mon.total["returncode"] == 3
+    assert "Command: route_design" in (tmp_path / "out.log").read_text()
+
+
+def test_total_cpu_of_own_process(tmp_path):
+    # cpu of other children of this process (earlier tools) is not counted
+    subprocess.run([sys.executable, "-c", "import time\nend = time.time() + 0.5\n"
+                    "while time.time() < end: pass"], check=True)
+    mon = StageMonitor([sys.executable, "-c", "import time; time.sleep(0.2)"], tmp_path,
+                       echo=False, interval=0.05)
+    assert mon.run() == 0
+    assert mon.total["cpu_s"] < 0.3
+
+
+def test_run_monitored(tmp_path):
+    msgs = []
+    metrics = tmp_path / "stage_metrics.json"
+    rc = run_monitored(f"{sys.executable} -c 'print(\"Command: place_design\")'",
+                       tmp_path, metrics, log=msgs.append, interval=0.05, echo=False)
+    assert rc == 0
+    assert msgs[0] == "Stage place_design started"
+    assert msgs[1].startswith("Stage place_design finished")
+    assert json.loads(metrics.read_text())["stages"][0]["stage"] == "place_design"
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module netlist_index"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.netlist_index import NetlistIndex, lint
+
+
+def test_index(tmp_path, netlist_index):
+    idx = netlist_index
+    assert idx.sets["ports"] == {"sys_clk", "led", "led[0]", "led[1]", "led[2]", "led[3]"}
+    assert {"u_core", "u_core/data_reg[0]", "u_core/cnt_reg[3]_i_1"} <= idx.sets["cells"]
+    # Pins of hierarchical cells from the module ports, of primitives from the connections
+    assert {"u_core/clk", "u_core/din[3]", "u_core/data_reg[0]/C",
+            "u_core/cnt_reg[3]_i_1/CO[3]", "u_core/cnt_reg[3]_i_1/CI"} <= idx.sets["pins"]
+    assert "u_core/cnt_reg[3]_i_1/CO[4]" not in idx.sets["pins"]
+    assert {"sys_clk_IBUF_BUFG", "u_core/data_reg[3]_0[2]"} <= idx.sets["nets"]
+    # Saved and loaded index
+    idx.save(tmp_path / "index" / "top.json")
+    loaded = NetlistIndex.load(tmp_path / "index" / "top.json")
+    assert loaded.sets == idx.sets and loaded.meta == {"sources": "abc"}
+
+
+def test_lint(netlist_index):
+    idx = netlist_index
+    assert idx.matches("ports", "led[*]")
+    assert idx.matches("pins", "data_reg[0]/C", hierarchical=True)
+    assert not idx.matches("pins", "data_reg[0]/C")
+    assert idx.matches("cells", "u_core/*_reg*")
+    targets = [{"source": "primary clock sys", "kind": "ports", "names": ["sys_clk"]},
+               {"source": "false path 0 -to", "kind": "pins", "names": ["u_core/data_reg[0]/Z"],
+                "hierarchical": True},
+               {"source": "generated clock div", "kind": "nets", "names": ["sys_clk_BUFG", "led_OBUF[*]"],
+                "hierarchical": True}]
+    assert lint(idx, targets) == [
+        "false path 0 -to: [get_pins -hierarchical u_core/data_reg[0]/Z] matches no pin (did you mean u_core/data_reg[0]/R?)",
+        "generated clock div: [get_nets -hierarchical sys_clk_BUFG] matches no net (did you mean sys_clk_IBUF?)"]
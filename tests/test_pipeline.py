@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module pipeline"""
+
+# Imports - standard library
+import threading
+import time
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.pipeline import Pipeline, Node, PipelineError, step_nodes, run_steps
+
+
+def flow(tmp_path, ran, fail=()):
+    """src -> ip -> implement -> (upload, simulate), implement also reads rtl"""
+    for name, text in [("rtl.v", "module top; endmodule"), ("ip.cfg", "depth 16")]:
+        if not (tmp_path / name).exists():
+            (tmp_path / name).write_text(text)
+
+    def write(name, *paths, src=None):
+        def run():
+            if name in fail:
+                raise RuntimeError(f"{name} broke")
+            ran.append(name)
+            for p in paths:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                p.write_text(name + (src.read_text() if src else ""))
+        return run
+
+    ip, job = tmp_path / "ip", tmp_path / "impl"
+    pipeline = Pipeline(tmp_path / "state.json", workers=4, log=lambda msg: None)
+    pipeline.add(Node("ip", write("ip", ip / "fifo" / "fifo.xci"),
+                      inputs=[tmp_path / "ip.cfg"], outputs=[ip / "**" / "*.xci"]))
+    pipeline.add(Node("implement", write("implement", job / "top.bit", job / "top_post_impl.v",
+                                            src=tmp_path / "rtl.v"),
+                      inputs=[tmp_path / "rtl.v", ip / "fifo" / "fifo.xci"],
+                      outputs=[job / "top.bit", job / "top_post_impl.v"]))
+    pipeline.add(Node("upload", write("upload"), inputs=[job / "top.bit"], always=True))
+    pipeline.add(Node("simulate", write("simulate", tmp_path / "sim" / "log"),
+                      inputs=[job / "top_post_impl.v"], outputs=[tmp_path / "sim"]))
+    return pipeline
+
+
+def test_order_and_incremental(tmp_path):
+    ran = []
+    pipeline = flow(tmp_path, ran)
+    deps = pipeline.prerequisites()
+    assert deps["implement"] == {"ip"}
+    assert deps["upload"] == deps["simulate"] == {"implement"}
+    status = pipeline.run()
+    assert ran[:2] == ["ip", "implement"] and sorted(ran[2:]) == ["simulate", "upload"]
+    assert set(status.values()) == {"ran"}
+    # Nothing changed: only the node without outputs runs
+    ran.clear()
+    status = flow(tmp_path, ran).run()
+    assert ran == ["upload"]
+    assert status["implement"] == "up_to_date"
+    # Changed rtl: ip stays up to date, downstream re-runs
+    ran.clear()
+    (tmp_path / "rtl.v").write_text("module top(input clk); endmodule")
+    flow(tmp_path, ran).run()
+    assert sorted(ran) == ["implement", "simulate", "upload"]
+    # ip re-runs but writes the same xci: implement is not re-run
+    ran.clear()
+    (tmp_path / "ip.cfg").write_text("depth 32")
+    flow(tmp_path, ran).run()
+    assert ran == ["ip", "upload"]
+    # Deleted output is regenerated, targets limit the subgraph
+    ran.clear()
+    (tmp_path / "impl" / "top.bit").unlink()
+    flow(tmp_path, ran).run(["implement"])
+    assert ran == ["implement"]
+
+
+def test_failure_skips_dependents(tmp_path):
+    ran = []
+    (tmp_path / "other").write_text("x")
+    pipeline = flow(tmp_path, ran, fail=("implement",))
+    pipeline.add(Node("lint", lambda: ran.append("lint"), inputs=[tmp_path / "other"],
+                      outputs=[tmp_path / "other"]))
+    with pytest.raises(PipelineError) as e:
+        pipeline.run()
+    assert e.value.status == {"ip": "ran", "implement": "failed", "upload": "skipped",
+                              "simulate": "skipped", "lint": "ran"}
+    # ip is not re-run after the failure was fixed
+    ran.clear()
+    flow(tmp_path, ran).run()
+    assert "ip" not in ran and "implement" in ran
+
+
+def test_concurrent_and_cycles(tmp_path):
+    barrier = threading.Barrier(3, timeout=5)
+    pipeline = Pipeline(workers=3, log=lambda msg: None)
+    for name in "abc":
+        pipeline.add(Node(name, barrier.wait))
+    start = time.time()
+    assert pipeline.run() == {"a": "ran", "b": "ran", "c": "ran"}
+    assert time.time() - start < 5
+    pipeline = Pipeline(log=lambda msg: None)
+    pipeline.add(Node("a", print, inputs=[tmp_path / "b"], outputs=[tmp_path / "a"]))
+    pipeline.add(Node("b", print, inputs=[tmp_path / "a"], outputs=[tmp_path / "b"]))
+    with pytest.raises(PipelineError, match="cycle"):
+        pipeline.run()
+    pipeline = Pipeline(log=lambda msg: None)
+    pipeline.add(Node("c", print, after=["x"]))
+    with pytest.raises(PipelineError, match="unknown"):
+        pipeline.run()
+
+
+class Steps:
+    """Tool like object with steps a -> (b, c) -> d"""
+    def __init__(self):
+        self.ran = []
+
+    def steps(self):
+        return [self.a, self.b, self.c, self.d]
+
+    def step_deps(self):
+        return {"b": ["a"], "c": ["a"], "d": ["b", "c"]}
+
+    def a(self):
+        self.ran.append("a")
+
+    def b(self):
+        time.sleep(0.05)
+        self.ran.append("b")
+
+    def c(self):
+        self.ran.append("c")
+
+    def d(self):
+        self.ran.append("d")
+
+
+def test_tool_steps():
+    tool = Steps()
+    assert [n.after for n in step_nodes(tool)] == [[], ["a"], ["a"], ["b", "c"]]
+    run_steps(tool, workers=2, log=lambda msg: None)
+    assert tool.ran == ["a", "c", "b", "d"]
+
+    class Sequential(Steps):
+        step_deps = None
+
+    # Without step_deps steps run in order
+    assert [n.after for n in step_nodes(Sequential())] == [[], ["a"], ["b"], ["c"]]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module regression"""
+
+# Imports - standard library
+import json
+import os
+import xml.etree.ElementTree as ET
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.regression import expand_runs, check_log, write_summary, run_snapshot
+
+# Default fail patterns of the simulate tool (tool.yml)
+FAIL = ["^ERROR", "^Error:", "^FATAL", "^Fatal", r"UVM_(ERROR|FATAL) :\s*[1-9]"]
+
+
+def test_expand_runs():
+    reg = {"runs": [{"name": "smoke", "plusargs": ["SHORT"]}, {"seed": 42}],
+           "seeds": 2, "first_seed": 7, "plusargs": ["VERBOSE=0"]}
+    assert expand_runs(reg) == [
+        {"name": "smoke", "seed": 7, "plusargs": ["VERBOSE=0", "SHORT"]},
+        {"name": "run_1", "seed": 42, "plusargs": ["VERBOSE=0"]},
+        {"name": "seed_7", "seed": 7, "plusargs": ["VERBOSE=0"]},
+        {"name": "seed_8", "seed": 8, "plusargs": ["VERBOSE=0"]}]
+    # Runs do not share the plusargs list of the config
+    runs = expand_runs(reg)
+    runs[2]["plusargs"].append("X")
+    assert reg["plusargs"] == ["VERBOSE=0"]
+    assert expand_runs(dict(reg, runs=[], seeds=0)) == []
+
+
+@pytest.mark.parametrize("log, pass_patterns, failure", [
+    ("run done\nUVM_ERROR :    0\nUVM_FATAL :    0\n", [], None),
+    ("start\nError: assertion failed at 100 ns\nmore\n", [], "Error: assertion failed at 100 ns"),
+    ("UVM_INFO ...\nUVM_ERROR :    3\n", [], "UVM_ERROR :    3"),
+    # Fail patterns are anchored, messages quoting them do not fail
+    ("note: ERROR count is 0\n", [], None),
+    ("TEST PASSED\n", ["^TEST PASSED"], None),
+    ("finished\n", ["^TEST PASSED"], "pass pattern not found"),
+    # A failure after the pass pattern still fails the run
+    ("TEST PASSED\nFATAL: late error\n", ["^TEST PASSED"], "FATAL: late error"),
+])
+def test_check_log(tmp_path, log, pass_patterns, failure):
+    (tmp_path / "xsim.log").write_text(log)
+    assert check_log(tmp_path / "xsim.log", FAIL, pass_patterns) == failure
+
+
+def test_check_log_missing(tmp_path):
+    assert check_log(tmp_path / "xsim.log", FAIL) == "no simulation log written"
+
+
+def test_write_summary(tmp_path):
+    runs = [{"name": "smoke", "seed": 1, "time": 1.5, "failure": None},
+            {"name": "seed_2", "seed": 2, "time": 2.25, "failure": "Error: mismatch"}]
+    failed = write_summary(tmp_path, "tb_top", runs)
+    assert [r["name"] for r in failed] == ["seed_2"]
+    summary = json.loads((tmp_path / "regression.json").read_text())
+    assert summary["tests"] == 2 and summary["failures"] == 1 and summary["runs"] == runs
+    suite = ET.parse(tmp_path / "regression.xml").getroot()
+    assert suite.tag == "testsuite"
+    assert suite.attrib == {"name": "tb_top", "tests": "2", "failures": "1", "time": "3.750"}
+    cases = suite.findall("testcase")
+    assert [(c.get("classname"), c.get("name"), c.get("time")) for c in cases] == [
+        ("tb_top", "smoke", "1.500"), ("tb_top", "seed_2", "2.250")]
+    assert cases[0].find("failure") is None
+    assert cases[1].find("failure").get("message") == "Error: mismatch"
+
+
+def test_run_snapshot(tmp_path):
+    xsim_dir = tmp_path / "xsim.dir"
+    (xsim_dir / "tb" / "webtalk").mkdir(parents=True)
+    (xsim_dir / "tb" / "xsimk").write_text("kernel")
+    (xsim_dir / "tb" / "xsimSettings.ini").write_text("[General]\n")
+    (xsim_dir / "xil_defaultlib").mkdir()
+    (xsim_dir / "xil_defaultlib" / "tb.sdb").write_text("unit")
+    runs = []
+    for name in ["seed_1", "seed_2"]:
+        run_dir = tmp_path / "regression" / name
+        run_dir.mkdir(parents=True)
+        # Runs of older versions linked the shared xsim.dir
+        os.symlink(xsim_dir, run_dir / "xsim.dir")
+        runs.append(tmp_path / run_snapshot(xsim_dir, "tb", run_dir))
+    a, b = runs
+    assert not a.is_symlink() and (a / "tb" / "webtalk").is_dir()
+    # The kernel is shared, files xsim writes at run time are not
+    assert (a / "tb" / "xsimk").stat().st_ino == (xsim_dir / "tb" / "xsimk").stat().st_ino
+    (a / "tb" / "xsimSettings.ini").write_text("run a\n")
+    assert (b / "tb" / "xsimSettings.ini").read_text() == "[General]\n"
+    assert (xsim_dir / "tb" / "xsimSettings.ini").read_text() == "[General]\n"
+    # Libraries are linked
+    assert (b / "xil_defaultlib").is_symlink()
+    assert (b / "xil_defaultlib" / "tb.sdb").read_text() == "unit"
+    # A second run replaces the run's copy
+    assert run_snapshot(xsim_dir, "tb", a.parent) == str(a)
+    assert (a / "tb" / "xsimSettings.ini").read_text() == "[General]\n"
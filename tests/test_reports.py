@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module reports"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.reports import parse_timing_summary, build_index, load_index, query
+
+TIMING_SUMMARY = """\
+------------------------------------------------------------------------------------------------
+| Design Timing Summary
+| ---------------------
+------------------------------------------------------------------------------------------------
+
+    WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)  THS Failing Endpoints  THS Total Endpoints     WPWS(ns)     TPWS(ns)  TPWS Failing Endpoints  TPWS Total Endpoints
+    -------      -------  ---------------------  -------------------      -------      -------  ---------------------  -------------------     --------     --------  ----------------------  --------------------
+     -0.412      -12.307                     57                 4120        0.031        0.000                      0                 4120        3.500        0.000                       0                  1722
+"""
+
+
+def test_parse_timing_summary(tmp_path):
+    rpt = tmp_path / "post_route_timing_summary.rpt"
+    rpt.write_text(TIMING_SUMMARY)
+    summary = parse_timing_summary(rpt)
+    assert summary["wns"] == -0.412
+    assert summary["tns"] == -12.307
+    assert summary["tns_failing_endpoints"] == 57
+    assert summary["whs"] == 0.031
+    assert summary["tpws_total_endpoints"] == 1722
+
+
+def test_parse_timing_summary_missing(tmp_path):
+    rpt = tmp_path / "empty.rpt"
+    rpt.write_text("No timing\n")
+    assert parse_timing_summary(rpt) is None
+
+
+UTILIZATION = """\
+1. Slice Logic
+--------------
+
++-------------------------+------+-------+-----------+-------+
+|        Site Type        | Used | Fixed | Available | Util% |
++-------------------------+------+-------+-----------+-------+
+| Slice LUTs*             | 1268 |     0 |     63400 |  2.00 |
+|   LUT as Logic          | 1200 |     0 |     63400 |  1.89 |
+| Slice Registers         | 2048 |     0 |    126800 |  1.62 |
++-------------------------+------+-------+-----------+-------+
+"""
+
+TIMING_PATHS = """\
+Slack (VIOLATED) :        -0.250ns  (required time - arrival time)
+  Source:                 a_reg/C
+  Destination:            b_reg/D
+  Path Group:             clk
+Slack (MET) :             1.500ns  (required time - arrival time)
+  Source:                 c_reg/C
+  Destination:            d_reg/D
+  Path Group:             clk
+"""
+
+ROUTE_STATUS = """\
+Design Route Status
+                                               :      # nets :
+   ------------------------------------------- : ----------- :
+   # of logical nets.......................... :        4096 :
+   # of nets with routing errors.............. :           0 :
+"""
+
+
+def test_build_index(tmp_path):
+    (tmp_path / "post_route_timing_summary.rpt").write_text(TIMING_SUMMARY)
+    (tmp_path / "post_route_util.rpt").write_text(UTILIZATION)
+    (tmp_path / "post_route_timing.rpt").write_text(TIMING_PATHS)
+    (tmp_path / "post_route_status.rpt").write_text(ROUTE_STATUS)
+    index = build_index(tmp_path, tmp_path / "report_index.json")
+    assert index == load_index(tmp_path / "report_index.json")
+    assert query(index, "timing.post_route.wns") == -0.412
+    assert query(index, "utilization.post_route.slice_luts.util_pct") == 2.0
+    assert query(index, "utilization.post_route.lut_as_logic.used") == 1200
+    assert query(index, "paths.post_route.slack") == [-0.25, 1.5]
+    assert query(index, "paths.post_route.endpoint.1") == "d_reg/D"
+    assert query(index, "route_status.post_route.nets_with_routing_errors") == 0
+    assert query(index, "power.post_route") is None
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module scheduler"""
+
+# Imports - standard library
+import json
+import os
+import threading
+import time
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.scheduler import JobServer, Scheduler, SchedulerError, scheduled, \
+    vivado_source
+
+
+def test_slots_queue(tmp_path):
+    sched = Scheduler(tmp_path, cpus=4, mem=8, poll=0.01)
+    with sched.slot(cpus=3, mem=4) as grant:
+        assert grant.cpus == 3
+        assert sched.usage() == (3, 4)
+        # Does not fit next to the first grant
+        with pytest.raises(SchedulerError):
+            sched.acquire(cpus=2, timeout=0.1)
+        done = []
+        waiter = threading.Thread(target=lambda: done.append(sched.acquire(cpus=2)))
+        waiter.start()
+        time.sleep(0.1)
+        assert not done
+    waiter.join(5)
+    assert done[0].cpus == 2
+    sched.release(done[0])
+    # Larger than the host is clamped to the host
+    with sched.slot(cpus=100) as grant:
+        assert grant.cpus == 4
+    assert sched.usage() == (0, 0)
+
+
+def test_reclaim_dead(tmp_path):
+    (tmp_path / "slots.json").write_text(json.dumps(
+        {"grants": {"999999999:0": {"cpus": 4, "mem": 0}}, "queue": ["999999999:1"]}))
+    sched = Scheduler(tmp_path, cpus=4, poll=0.01)
+    with sched.slot(cpus=4, mem=0, timeout=1):
+        pass
+
+
+def test_jobserver(tmp_path):
+    r, w = os.pipe()
+    os.write(w, b"++")
+    js = JobServer.from_env(f" -j3 --jobserver-auth={r},{w}")
+    sched = Scheduler(tmp_path, cpus=1, jobserver=js, poll=0.01)
+    with sched.slot(cpus=4) as grant:
+        assert grant.cpus == 3
+        assert grant.tokens == [None, b"+", b"+"]
+    assert os.read(r, 2) == b"++"
+    assert JobServer.from_env("-j4") is None
+
+
+def test_scheduled(tmp_path):
+    with scheduled({"enabled": False}) as grant:
+        assert grant is None
+    assert vivado_source("run.tcl", tmp_path, grant) == "run.tcl"
+    cfg = {"enabled": True, "threads": 2, "mem_gb": 0, "dir": str(tmp_path), "max_cpus": 4,
+           "jobserver": False}
+    with scheduled(cfg) as grant:
+        script = vivado_source("run.tcl", tmp_path, grant)
+    assert open(script).read() == "set_param general.maxThreads 2\nsource run.tcl\n"
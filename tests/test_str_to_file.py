@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module str_to_file"""
+
+# Imports - standard library
+import io
+import os
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.str_to_file import File, Section, SubSection, Line
+
+
+def make_file(fpath, n):
+    f = File(fpath, "#")
+    sec = Section("Constraints", "#")
+    sub = SubSection("Ports", "#")
+    sec.add(sub)
+    f.add(sec)
+    for i in range(n):
+        sub.add_line(f"set_property PACKAGE_PIN A{i} [get_ports p{i}]", "pin")
+    return f
+
+
+def test_stream_matches_to_str(tmp_path):
+    f = make_file(tmp_path / "a.xdc", 3)
+    buf = io.StringIO()
+    f.write(buf)
+    assert buf.getvalue() == f.to_str()
+    assert "set_property PACKAGE_PIN A2 [get_ports p2] # pin\n" in buf.getvalue()
+    assert not hasattr(Line("x"), "__dict__")
+
+
+def test_generate_only_when_changed(tmp_path):
+    fpath = tmp_path / "a.xdc"
+    assert make_file(fpath, 3).generate()
+    os.utime(fpath, (0, 0))
+    # Same contents => file untouched
+    assert not make_file(fpath, 3).generate()
+    assert os.path.getmtime(fpath) == 0
+    # Stale contents => rewritten
+    assert make_file(fpath, 4).generate()
+    assert "p3" in fpath.read_text()
+    assert make_file(fpath, 4).generate(overwrite=True)
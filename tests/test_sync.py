@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module sync"""
+
+# Imports - standard library
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.sync import sync_includes
+
+
+def test_sync_includes(tmp_path):
+    a, b, job = tmp_path / "a", tmp_path / "b", tmp_path / "job"
+    (a / "sub").mkdir(parents=True)
+    b.mkdir()
+    (a / "defs.vh").write_text("a")
+    (a / "sub" / "pkg.svh").write_text("pkg")
+    (b / "defs.vh").write_text("b")
+    report = sync_includes([a, b], job, link=False)
+    assert report.copied + report.reflinked == 2
+    assert (job / "defs.vh").read_text() == "a"
+    assert (job / "pkg.svh").read_text() == "pkg"
+    assert list(report.collisions) == ["defs.vh"]
+    # Nothing changed => nothing copied
+    report = sync_includes([a, b], job, link=False)
+    assert report.skipped == 2 and report.total == 2
+    # Removed file is cleaned up from job dir
+    (a / "sub" / "pkg.svh").unlink()
+    report = sync_includes([a, b], job)
+    assert report.removed == 1
+    assert not (job / "pkg.svh").exists()
+
+
+def test_sync_hardlinks(tmp_path):
+    inc, job = tmp_path / "inc", tmp_path / "job"
+    inc.mkdir()
+    (inc / "defs.vh").write_text("x")
+    report = sync_includes([inc], job)
+    assert report.linked == 1
+    assert sync_includes([inc], job).skipped == 1
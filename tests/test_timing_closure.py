@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for timing_closure.tcl (against tests/stubs/timing.tcl in tclsh)"""
+
+# Imports - standard library
+from pathlib import Path
+import shutil
+import subprocess
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.reports import parse_closure_log
+
+TESTS_DIR = Path(__file__).resolve().parent
+STUB = TESTS_DIR / "stubs" / "timing.tcl"
+CLOSURE = TESTS_DIR.parent / "toolbox_xilinx_tools" / "2020.2" / "timing_closure.tcl"
+PASSES = "[list {phys_opt_design -directive AggressiveExplore} {phys_opt_design -directive AlternateReplication}]"
+
+pytestmark = pytest.mark.skipif(shutil.which("tclsh") is None, reason="tclsh not installed")
+
+
+def closure(tmp_path, wns, whs, gains, stage="post_place", passes=PASSES, max_passes=4,
+            budget=3600, check_hold=0, spent=0):
+    """Runs closure_loop on the stub, returns (passes run, commands run, log)"""
+    log = tmp_path / "closure_passes.tsv"
+    script = tmp_path / "run.tcl"
+    script.write_text(f"""
+source {STUB}
+source {CLOSURE}
+set ::stub_wns {{{wns}}}
+set ::stub_whs {{{whs}}}
+set ::stub_gains {{{gains}}}
+set ::closure_spent {spent}
+set ran [closure_loop {stage} {passes} {max_passes} {budget} {log} {check_hold}]
+puts "RAN $ran"
+foreach p $::stub_passes {{ puts "PASS $p" }}
+""")
+    proc = subprocess.run(["tclsh", str(script)], capture_output=True, text=True, check=True)
+    lines = proc.stdout.splitlines()
+    ran = int(next(l for l in lines if l.startswith("RAN")).split()[1])
+    commands = [l[len("PASS "):] for l in lines if l.startswith("PASS")]
+    return ran, commands, parse_closure_log(log)
+
+
+def test_timing_met(tmp_path):
+    # Hold is not checked after placement
+    ran, commands, log = closure(tmp_path, 0.2, -0.1, "phys_opt_design 0.1")
+    assert ran == 0 and commands == []
+    assert log == {"post_place": {"initial": {"wns": 0.2, "whs": -0.1}, "passes": [], "seconds": 0.0}}
+    # No constrained paths
+    ran, _, _ = closure(tmp_path, "", "", "")
+    assert ran == 0
+
+
+def test_converges(tmp_path):
+    ran, commands, log = closure(tmp_path, -0.25, 0.0, "phys_opt_design 0.1")
+    assert ran == 3
+    assert commands == ["phys_opt_design -directive AggressiveExplore",
+                        "phys_opt_design -directive AlternateReplication",
+                        "phys_opt_design -directive AggressiveExplore"]
+    passes = log["post_place"]["passes"]
+    assert [p["name"] for p in passes] == commands
+    assert passes[-1]["wns"] > 0
+
+
+def test_limits(tmp_path):
+    # No pass improves slack: stops after one round
+    ran, _, _ = closure(tmp_path, -0.5, 0.0, "phys_opt_design 0")
+    assert ran == 2
+    # Pass limit
+    ran, _, _ = closure(tmp_path, -1.0, 0.0, "phys_opt_design 0.01", max_passes=3)
+    assert ran == 3
+    # Time budget already spent by an earlier stage
+    ran, _, _ = closure(tmp_path, -1.0, 0.0, "phys_opt_design 0.1", budget=60, spent=61)
+    assert ran == 0
+
+
+def test_route_hold(tmp_path):
+    ran, commands, log = closure(
+        tmp_path, 0.1, -0.05, "route_design 0.05", stage="post_route", check_hold=1,
+        passes="[list {route_design -unroute; route_design -directive Explore}]")
+    assert ran == 1
+    assert commands == ["route_design -unroute", "route_design -directive Explore"]
+    assert log["post_route"]["passes"][0]["whs"] > 0
+
+
+def test_budget_reset_per_run():
+    # A vivado server keeps ::closure_spent across jobs, the driver resets it
+    driver = (TESTS_DIR.parent / "toolbox_xilinx_tools" / "2020.2" / "implement" / "implement" /
+              "templates" / "implement.tcl").read_text().splitlines()
+    reset = driver.index("set ::closure_spent 0")
+    assert all(not line.startswith("source") for line in driver[:reset])
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module vivado_server (tclsh stands in for vivado)"""
+
+# Imports - standard library
+import shutil
+import threading
+import time
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.vivado_server import TclWorker, TclClient, TclWorkerError, serve
+
+pytestmark = pytest.mark.skipif(shutil.which("tclsh") is None, reason="tclsh not found")
+
+
+@pytest.fixture
+def worker():
+    w = TclWorker(["tclsh"])
+    w.start()
+    yield w
+    w.stop()
+
+
+def test_run_in_directory(worker, tmp_path):
+    job = tmp_path / "job"
+    job.mkdir()
+    script = job / "job.tcl"
+    script.write_text('set fp [open out.txt w]\nputs $fp [pwd]\nclose $fp\nputs "hello"\n')
+    result = worker.run(script, job)
+    assert result.ok
+    assert "hello" in result.output
+    assert (job / "out.txt").read_text().strip() == str(job)
+
+
+def test_isolation_and_errors(worker, tmp_path):
+    first = tmp_path / "first.tcl"
+    first.write_text("set x 1\n")
+    second = tmp_path / "second.tcl"
+    second.write_text("puts $x\n")
+    assert worker.run(first).ok
+    result = worker.run(second)
+    assert result.rc == 1
+    assert "no such variable" in result.output
+    assert worker.ping()
+
+
+def test_cleanup_between_jobs(worker, tmp_path):
+    # Stand ins for vivado's design commands
+    stub = tmp_path / "designs.tcl"
+    stub.write_text("""
+set ::designs {}
+set ::current {}
+proc ::get_designs {args} { return $::designs }
+proc ::current_design {{design ""}} { set ::current $design }
+proc ::close_design {args} {
+    set ::designs [lsearch -all -inline -not -exact $::designs $::current]
+}
+""")
+    assert worker.run(stub).ok
+    synth = tmp_path / "synth.tcl"
+    synth.write_text("lappend ::designs synth_1\nlappend ::designs checkpoint_1\n")
+    assert worker.run(synth).ok
+    check = tmp_path / "check.tcl"
+    check.write_text("puts \"open: [llength [get_designs]]\"\n")
+    assert "open: 0" in worker.run(check).output
+
+
+def test_restart_on_crash(worker, tmp_path):
+    crash = tmp_path / "crash.tcl"
+    crash.write_text("exit 3\n")
+    with pytest.raises(TclWorkerError):
+        worker.run(crash)
+    ok = tmp_path / "ok.tcl"
+    ok.write_text("puts alive\n")
+    assert "alive" in worker.run(ok).output
+    assert worker.restarts == 1
+
+
+def test_socket_server(tmp_path):
+    address = str(tmp_path / "worker.sock")
+    threading.Thread(target=serve, args=(address, ["tclsh"], []), daemon=True).start()
+    client = TclClient(address)
+    for _ in range(100):
+        if client.ping():
+            break
+        time.sleep(0.05)
+    script = tmp_path / "job.tcl"
+    script.write_text("puts [expr {6 * 7}]\n")
+    result = client.run(script)
+    assert result.ok
+    assert "42" in result.output
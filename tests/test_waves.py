@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Tests for module waves"""
+
+# Imports - standard library
+import struct
+
+# Imports - 3rd party packages
+import pytest
+
+# Imports - local source
+from toolbox_xilinx_tools.waves import export_vcd, Waves
+
+VCD = f"""$date today $end
+$version xsim $end
+$timescale 1ps $end
+$scope module tb $end
+$var wire 1 ! clk $end
+$var reg 4 " count [3:0] $end
+$scope module dut $end
+$var wire 1 ! clk $end
+$var wire 72 # wide [71:0] $end
+$var real 64 $ temp $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+bx "
+b0 #
+r0.5 $
+$end
+#5
+1!
+b11 "
+#10
+0!
+$comment reset released $end
+b1z "
+b{(1 << 65) | 3:b} #
+r1.25 $
+"""
+
+
+def read_npy(fpath):
+    """(shape, raw bytes) of a .npy file"""
+    data = fpath.read_bytes()
+    assert data[:8] == b"\x93NUMPY\x01\x00"
+    length = struct.unpack("<H", data[8:10])[0]
+    header = eval(data[10:10 + length].decode("latin1"))
+    return header["descr"], header["shape"], data[10 + length:]
+
+
+def test_export(tmp_path):
+    vcd = tmp_path / "waves.vcd"
+    vcd.write_text(VCD)
+    index = export_vcd(vcd, tmp_path / "waves")
+    assert index["timescale_s"] == 1e-12 and index["end_time"] == 10
+    signals = index["signals"]
+    assert sorted(signals) == ["tb/clk", "tb/count", "tb/dut/clk", "tb/dut/temp", "tb/dut/wide"]
+    # Aliases share arrays
+    assert signals["tb/clk"]["stem"] == signals["tb/dut/clk"]["stem"]
+    assert signals["tb/count"] == {"stem": "s1", "width": 4, "type": "reg", "changes": 3, "xz": True}
+    out = tmp_path / "waves"
+    descr, shape, raw = read_npy(out / "s0.t.npy")
+    assert (descr, shape) == ("<u8", (3,)) and struct.unpack("<3Q", raw) == (0, 5, 10)
+    _, _, raw = read_npy(out / "s1.v.npy")
+    assert struct.unpack("<3Q", raw) == (0, 3, 2)
+    _, _, raw = read_npy(out / "s1.xz.npy")
+    assert struct.unpack("<3Q", raw) == (0xf, 0, 1)
+    assert not (out / "s0.xz.npy").exists()
+    descr, shape, raw = read_npy(out / "s2.v.npy")
+    assert (descr, shape) == ("<u8", (2, 2)) and struct.unpack("<4Q", raw) == (0, 0, 3, 2)
+    descr, shape, raw = read_npy(out / "s3.v.npy")
+    assert descr == "<f8" and struct.unpack("<2d", raw) == (0.5, 1.25)
+    # Selected signals only
+    index = export_vcd(vcd, tmp_path / "clk", signals=["*/clk"])
+    assert sorted(index["signals"]) == ["tb/clk", "tb/dut/clk"]
+
+
+def test_read(tmp_path):
+    pytest.importorskip("numpy")
+    vcd = tmp_path / "waves.vcd"
+    vcd.write_text(VCD)
+    export_vcd(vcd, tmp_path / "waves")
+    waves = Waves(tmp_path / "waves")
+    assert waves.names("tb/dut/*") == ["tb/dut/clk", "tb/dut/temp", "tb/dut/wide"]
+    times, values, xz = waves.signal("tb/count")
+    assert list(times) == [0, 5, 10] and list(values) == [0, 3, 2]
+    assert waves.value_at("tb/count", 7) == 3
+    assert waves.value_at("tb/count", 12) == "x"
+    assert waves.value_at("tb/dut/wide", 10) == (1 << 65) | 3
+    assert waves.value_at("tb/dut/temp", 4) == 0.5
+
+
+def test_more_signals_than_open_files(tmp_path, monkeypatch):
+    resource = pytest.importorskip("resource")
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    n = 300
+    lines = ["$timescale 1ns $end", "$scope module tb $end"]
+    lines += [f"$var wire 16 s{i} bus{i} [15:0] $end" for i in range(n)]
+    lines += ["$upscope $end", "$enddefinitions $end"]
+    for t in range(3):
+        lines.append(f"#{t}")
+        lines += [f"b{t + i:b} s{i}" for i in range(n)]
+    vcd = tmp_path / "many.vcd"
+    vcd.write_text("\n".join(lines) + "\n")
+    # Flush buffered values to the files several times
+    monkeypatch.setattr("toolbox_xilinx_tools.waves.BUFFER_VALUES", n)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(64, soft), hard))
+    try:
+        index = export_vcd(vcd, tmp_path / "waves")
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert len(index["signals"]) == n
+    info = index["signals"][f"tb/bus{n - 1}"]
+    assert info["changes"] == 3
+    _, shape, raw = read_npy(tmp_path / "waves" / f"{info['stem']}.v.npy")
+    assert shape == (3,) and struct.unpack("<3Q", raw) == (n - 1, n, n + 1)
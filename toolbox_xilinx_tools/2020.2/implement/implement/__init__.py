@@ -9,7 +9,10 @@
 import os
 from typing import Callable, List
 import subprocess
-from shutil import copy
+import json
+import time
+import shlex
+from shutil import copy, copytree
 
 # Imports - 3rd party packages
 from toolbox.tool import Tool, ToolError
@@ -21,6 +24,42 @@ from jinja2 import StrictUndefined, Environment, FileSystemLoader
 # Imports - local source
 from jinja_tool import JinjaTool
 from toolbox_xilinx_tools.str_to_file import File, Section, SubSection
+from toolbox_xilinx_tools.build_cache import BuildCache, hash_inputs
+from toolbox_xilinx_tools.jobs import max_workers, run_parallel
+from toolbox_xilinx_tools.reports import parse_timing_summary, build_index, query
+from toolbox_xilinx_tools.vivado_server import submit
+from toolbox_xilinx_tools.farm import FarmJob, FarmError, get_farm
+from toolbox_xilinx_tools.sync import sync_includes
+from toolbox_xilinx_tools.monitor import run_monitored
+from toolbox_xilinx_tools.scheduler import scheduled, vivado_source
+from toolbox_xilinx_tools.history import History, git_revision, job_metrics
+from toolbox_xilinx_tools.hdl_deps import DependencyGraph
+from toolbox_xilinx_tools.constraints import group_delays, get_ports, group_by, \
+    check_pins, read_pin_table, object_query, xdc_clocks
+from toolbox_xilinx_tools.netlist_index import NetlistIndex, lint
+
+# Job dir artifacts (glob patterns) saved to and restored from the build cache
+CACHE_ARTIFACTS = [
+    "checkpoints", "reports", "*.bit", "*.msk", "*.ltx", "*_post_synth.v",
+    "*_post_impl.v", "*.sdf", "final_constraints.xdc", "ila_clock_map.txt"
+]
+
+# Batch ILA insertion procs (batch_insert_ila) sourced by the rendered ila.tcl
+ILA_PROCS = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "new_batch_insert_ila.tcl"))
+
+# Adaptive timing closure procs (closure_loop) sourced by place.tcl/route.tcl
+CLOSURE_PROCS = os.path.realpath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "timing_closure.tcl"))
+
+# Implementation stages in flow order with the checkpoint each stage leaves
+# behind (bitstream stage output is <top>.bit)
+STAGES = [("synth", "post_synth.dcp"), ("opt", "post_opt.dcp"),
+          ("place", "post_place.dcp"), ("route", "post_route.dcp"),
+          ("bitstream", None)]
+
+# Flow commands that accept a -directive option
+DIRECTIVES = ["synth", "opt", "place", "phys_opt", "route"]
 
 
 class XilinxImplementTool(JinjaTool):
@@ -34,80 +73,433 @@ class XilinxImplementTool(JinjaTool):
                                         "implement.tcl")
         self.timing_xdc = File(
             os.path.join(self.get_db("internal.job_dir"), "timing.xdc"), "#")
+        self.physical_xdc = File(
+            os.path.join(self.get_db("internal.job_dir"), "physical.xdc"), "#")
         self.time_multiplier = {"us": 1e3, "ns": 1, "ps": 1e-3}
         self.open_tcl = os.path.join(self.get_db("internal.job_dir"), 'open.tcl')
         self.open_sh = os.path.join(self.get_db("internal.job_dir"), 'open.sh')
+        self.stage_manifest = os.path.join(self.get_db("internal.job_dir"),
+                                           "checkpoints", "stages.json")
+        self.stages = [s for s, _ in STAGES]
+        self.ooc = None
 
     def steps(self) -> List[Callable[[], None]]:
         """Returns a list of functions to run for each step"""
         return [self.render_tcl,
                 self.render_timing_xdc,
+                self.render_physical_xdc,
                 self.copy_includes,
-                self.run_vivado]
+                self.plan_stages,
+                self.lint_constraints,
+                self.render_ila_tcl,
+                self.synth_ooc_modules,
+                self.run_vivado,
+                self.index_netlist,
+                self.store_ila_clock_map,
+                self.index_reports,
+                self.record_history]
+
+    def step_deps(self):
+        """Steps each step waits for (independent render steps run concurrently)"""
+        renders = ["render_tcl", "render_timing_xdc", "render_physical_xdc", "copy_includes"]
+        return {"plan_stages": renders,
+                "lint_constraints": ["render_timing_xdc", "render_physical_xdc"],
+                "render_ila_tcl": ["plan_stages"],
+                "synth_ooc_modules": ["plan_stages"],
+                "run_vivado": ["lint_constraints", "render_ila_tcl", "synth_ooc_modules"],
+                "index_netlist": ["run_vivado"],
+                "store_ila_clock_map": ["run_vivado"],
+                "index_reports": ["run_vivado"],
+                "record_history": ["index_reports"]}
+
+    def pipeline_io(self):
+        """Files read and written by this tool for toolbox_xilinx_tools.pipeline
+
+        Outputs are the bitstream and mask (read by upload) and the timing
+        simulation netlist and sdf files (read by simulate).
+        """
+        job_dir = self.get_db("internal.job_dir")
+        top = self.viv["top"]
+        inputs = self.viv["verilog"] + self.viv["vhdl"] + self.viv["xdc"] + \
+            self.viv["post_synthesis_xdc"] + self.viv["include_dirs"] + self.viv["ip"]
+        for m in self.viv["ooc_modules"]:
+            inputs += m.get("xdc", [])
+        if self.viv["pin_table"]:
+            inputs.append(self.viv["pin_table"])
+        outputs = []
+        if self.viv["execute"]:
+            outputs = [os.path.join(job_dir, f"{top}{suffix}")
+                       for suffix in [".bit", ".msk", "_post_impl.v", "_post_impl_*.sdf"]]
+        return {"inputs": [str(f) for f in inputs], "outputs": outputs,
+                "signature": self.viv}
+
+    def copy_includes(self, dest=None):
+        """Syncs all files from include directories to the build directory"""
+        dest = dest or self.get_db("internal.job_dir")
+        report = sync_includes(self.viv["include_dirs"], dest)
+        for name, paths in report.collisions.items():
+            self.log(
+                f'Include file "{name}" found in multiple include dirs, using {paths[0]} (ignored: {", ".join(str(p) for p in paths[1:])})',
+                LogLevel.WARNING)
+        self.log(f"Synced include dirs to job dir: {report}")
+
+    def stage_file(self, stage, job_dir=None):
+        """Path of rendered tcl script for a single implementation stage"""
+        return os.path.join(job_dir or self.get_db("internal.job_dir"),
+                            f"{stage}.tcl")
+
+    def stage_output(self, stage):
+        """Path of checkpoint (or bitstream) written by stage"""
+        job_dir = self.get_db("internal.job_dir")
+        checkpoint = dict(STAGES)[stage]
+        if checkpoint is None:
+            return os.path.join(job_dir, f"{self.viv['top']}.bit")
+        return os.path.join(job_dir, "checkpoints", checkpoint)
+
+    def stage_directives(self, overrides=None):
+        """Directive for each flow command (None => vivado default)"""
+        overrides = overrides or {}
+        return {
+            k: overrides.get(k, self.viv["directives"].get(k))
+            for k in DIRECTIVES
+        }
+
+    def render_tcl(self, job_dir=None, directives=None):
+        """Renders per stage tcl files that vivado will run in batch mode
+
+        Out-of-context checkpoints and stubs are referenced relative to the
+        dir the scripts run in, so the scripts (and their fingerprints) do
+        not depend on the job dir.
+        """
+        directives = directives or self.stage_directives()
+        plan = self.ooc_plan()
+        run_dir = job_dir or self.get_db("internal.job_dir")
+        ooc_modules = [dict(m, dcp=Path(os.path.relpath(m["dcp"], run_dir)).as_posix(),
+                            stub=Path(os.path.relpath(m["stub"], run_dir)).as_posix())
+                       for m in plan["modules"]]
+        for stage, _ in STAGES:
+            self.render_to_file(f"templates/{stage}.tcl",
+                                self.stage_file(stage, job_dir),
+                                ts=self.ts,
+                                directives=directives,
+                                verilog=plan["verilog"],
+                                ooc_modules=ooc_modules,
+                                closure_procs=CLOSURE_PROCS)
+
+    def stage_fingerprints(self):
+        """Digest of inputs for each stage (includes digest of previous stage)
+
+        synth depends on sources, pre-synthesis xdc files and include dirs,
+        opt on post synthesis xdc files (and the ILA depth), place and route on
+        the closure procs (if enabled) and every stage on its rendered script
+        (which captures ports, config, units and directives). The generated
+        xdc files are hashed without their user/date/path header, so equal
+        constraints match across job dirs, users and days.
+        """
+        fingerprints = {}
+        previous = None
+        for stage, _ in STAGES:
+            files, dirs = [self.stage_file(stage)], []
+            extra = {"previous": previous}
+            if stage == "synth":
+                files += self.viv["verilog"] + self.viv["vhdl"] + self.viv["xdc"] + \
+                    self.viv["ip"]
+                for m in self.viv["ooc_modules"]:
+                    files += m.get("xdc", [])
+                dirs = self.viv["include_dirs"]
+                extra["timing_xdc"] = self.timing_xdc.existing_digest()
+            elif stage == "opt":
+                files += self.viv["post_synthesis_xdc"]
+                extra["physical_xdc"] = self.physical_xdc.existing_digest()
+                if self.viv["ila"]["enabled"]:
+                    extra["ila_depth"] = self.viv["ila"]["depth"]
+            elif stage in ("place", "route") and self.viv["closure"]["enabled"]:
+                files.append(CLOSURE_PROCS)
+            previous = hash_inputs(files, dirs, extra=extra)
+            fingerprints[stage] = previous
+        return fingerprints
 
-    def copy_includes(self):
-        """Copies all files from include directories to the build directory"""
-        for d in self.viv["include_dirs"]:
-            p = Path(d).glob('**/*')
-            files = [x for x in p if x.is_file()]
-            for f in files:
-                copy(f, self.get_db("internal.job_dir"))
-                self.log(f"Copied {f} to job dir")
+    def plan_stages(self):
+        """Determines earliest stage with changed inputs and renders driver tcl"""
+        job_dir = self.get_db("internal.job_dir")
+        self.fingerprints = self.stage_fingerprints()
+        self.stages = [s for s, _ in STAGES]
+        resume_checkpoint = None
+        if self.viv["resume"]["enabled"]:
+            previous_dir = self.viv["resume"].get("previous_dir") or job_dir
+            previous = {}
+            manifest = os.path.join(previous_dir, "checkpoints", "stages.json")
+            if os.path.isfile(manifest):
+                with open(manifest) as fp:
+                    previous = json.load(fp)
+            # Find first stage whose inputs changed or whose output is missing
+            start = 0
+            prev_ckpts = os.path.join(previous_dir, "checkpoints")
+            for i, (stage, ckpt) in enumerate(STAGES):
+                out = os.path.join(prev_ckpts, ckpt) if ckpt else \
+                    os.path.join(previous_dir, f"{self.viv['top']}.bit")
+                if previous.get(stage) != self.fingerprints[stage] or \
+                        not os.path.isfile(out):
+                    break
+                start = i + 1
+            self.stages = [s for s, _ in STAGES[start:]]
+            if start > 0 and self.stages:
+                resume_checkpoint = STAGES[start - 1][1]
+            # Bring checkpoints of previous run into this job dir
+            if os.path.realpath(previous_dir) != os.path.realpath(job_dir):
+                os.makedirs(os.path.join(job_dir, "checkpoints"), exist_ok=True)
+                for ckpt in [resume_checkpoint, "post_route.dcp"]:
+                    if ckpt and os.path.isfile(os.path.join(prev_ckpts, ckpt)):
+                        copy(os.path.join(prev_ckpts, ckpt),
+                             os.path.join(job_dir, "checkpoints", ckpt))
+                if not self.stages:
+                    for pattern in CACHE_ARTIFACTS:
+                        for f in Path(previous_dir).glob(pattern):
+                            dst = Path(job_dir, f.relative_to(previous_dir))
+                            if f.is_dir():
+                                copytree(f, dst, dirs_exist_ok=True)
+                            else:
+                                copy(f, dst)
+                with open(self.stage_manifest, "w") as fp:
+                    json.dump(previous, fp, indent=2)
+            # Reference for incremental place and route
+            reference = os.path.join(job_dir, "checkpoints", "post_route.dcp")
+            if self.viv["resume"]["incremental"] and "place" in self.stages \
+                    and os.path.isfile(reference):
+                copy(reference, os.path.join(job_dir, "checkpoints",
+                                             "reference_routed.dcp"))
+            if not self.stages:
+                self.log("All implementation stages up to date")
+            elif resume_checkpoint:
+                self.log(f"Resuming implementation at stage \"{self.stages[0]}\" from {resume_checkpoint}")
+        self.render_to_file(self.template_file,
+                            self.render_file,
+                            ts=self.ts,
+                            stages=self.stages,
+                            resume_checkpoint=resume_checkpoint)
 
-    def render_tcl(self):
-        """Renders tcl file that vivado will run in batch mode"""
-        self.render_to_file(self.template_file, self.render_file, ts=self.ts)
+    def ila_cache(self):
+        """Returns build cache of ILA clock maps if enabled, otherwise None"""
+        cfg = self.viv["ila"]["cache"]
+        if not cfg["enabled"]:
+            return None
+        cache_dir = cfg.get("dir") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "cache", "ila")
+        max_size = cfg.get("max_size_gb")
+        return BuildCache(cache_dir,
+                          max_entries=cfg.get("max_entries"),
+                          max_size=None if max_size is None else int(max_size * 1e9))
+
+    def render_ila_tcl(self):
+        """Renders ila.tcl inserting ILA cores after synthesis (sourced by opt.tcl)
+
+        The clock map of batch_insert_ila is keyed on the synth stage
+        fingerprint, which identifies the post synthesis netlist. A map of a
+        previous run on the same netlist is restored from the ILA cache so
+        only debug nets missing from it are traced.
+        """
+        if not self.viv["ila"]["enabled"]:
+            return
+        job_dir = self.get_db("internal.job_dir")
+        key = self.fingerprints["synth"]
+        self.render_to_file("templates/ila.tcl",
+                            os.path.join(job_dir, "ila.tcl"),
+                            ts=self.ts,
+                            procs=ILA_PROCS,
+                            key=key,
+                            map_file="ila_clock_map.txt")
+        cache = self.ila_cache()
+        if cache and "opt" in self.stages and cache.restore(key, job_dir):
+            self.log(f"Restored ILA clock map of netlist {key[:12]} from {cache.entry(key)}")
+
+    def store_ila_clock_map(self):
+        """Stores the ILA clock map of this run in the ILA cache"""
+        job_dir = self.get_db("internal.job_dir")
+        cache = self.ila_cache() if self.viv["ila"]["enabled"] else None
+        if cache and os.path.isfile(os.path.join(job_dir, "ila_clock_map.txt")):
+            cache.store(self.fingerprints["synth"], job_dir, ["ila_clock_map.txt"])
+
+    def ooc_plan(self):
+        """Out-of-context modules and the verilog files of top level synthesis
+
+        Each module gets its source closure (found from the verilog sources),
+        a cache key over the closure, its xdc files and synthesis settings
+        and its checkpoint and black box stub paths in <job_dir>/ooc/<name>.
+        Top level synthesis reads all verilog files except those only needed
+        by out-of-context modules.
+        """
+        if self.ooc is not None:
+            return self.ooc
+        if not self.viv["ooc_modules"]:
+            self.ooc = {"verilog": self.viv["verilog"], "modules": []}
+            return self.ooc
+        names = [m["name"] for m in self.viv["ooc_modules"]]
+        graph = DependencyGraph(self.viv["verilog"], self.viv["include_dirs"])
+        try:
+            top_files, closures = graph.partition(self.viv["top"], names)
+        except KeyError as e:
+            raise ToolError(f"ooc_modules: module {e} not found in verilog sources")
+        except ValueError as e:
+            raise ToolError(f"ooc_modules: {e}")
+        digests = graph.fingerprints()
+        job_dir = self.get_db("internal.job_dir")
+        modules = []
+        for m in self.viv["ooc_modules"]:
+            name = m["name"]
+            out_dir = os.path.join(job_dir, "ooc", name)
+            xdc = m.get("xdc", [])
+            key = hash_inputs(xdc, extra={
+                "module": name,
+                "units": [digests[f] for f in closures[name]],
+                "part": self.viv["part"],
+                "verilog_version": self.viv["verilog_version"],
+                "flatten_hierarchy": self.viv["flatten_hierarchy"],
+                "directive": self.viv["directives"].get("synth")})
+            modules.append({"name": name, "files": closures[name], "xdc": xdc,
+                            "key": key, "dir": out_dir,
+                            "dcp": os.path.join(out_dir, f"{name}.dcp"),
+                            "stub": os.path.join(out_dir, f"{name}_stub.v")})
+        self.ooc = {"verilog": top_files, "modules": modules}
+        return self.ooc
+
+    def ooc_cache(self):
+        """Returns cache of out-of-context checkpoints if enabled, otherwise None"""
+        cfg = self.viv["ooc"]["cache"]
+        if not cfg["enabled"]:
+            return None
+        cache_dir = cfg.get("dir") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "cache", "ooc")
+        max_size = cfg.get("max_size_gb")
+        return BuildCache(cache_dir,
+                          max_entries=cfg.get("max_entries"),
+                          max_size=None if max_size is None else int(max_size * 1e9))
+
+    def synth_ooc_modules(self):
+        """Synthesizes ooc_modules out of context, each in its own vivado process
+
+        Modules whose checkpoint in the job dir matches their key are kept,
+        others are restored from the cache or synthesized concurrently
+        (bounded by ooc.mem_per_run_gb and the scheduler). Raises ToolError
+        listing failed modules at the end.
+        """
+        modules = self.ooc_plan()["modules"]
+        if not modules or not self.viv["execute"] or "synth" not in self.stages:
+            return
+        cache = self.ooc_cache()
+        pending = []
+        for m in modules:
+            os.makedirs(m["dir"], exist_ok=True)
+            key_file = os.path.join(m["dir"], "key.txt")
+            if os.path.isfile(m["dcp"]) and os.path.isfile(m["stub"]) and \
+                    os.path.isfile(key_file) and Path(key_file).read_text() == m["key"]:
+                self.log(f"OOC {m['name']}: up to date")
+            elif cache and cache.restore(m["key"], m["dir"]):
+                Path(key_file).write_text(m["key"])
+                self.log(f"OOC {m['name']}: restored from cache ({m['key'][:12]})")
+            else:
+                for f in [m["dcp"], m["stub"], key_file]:
+                    if os.path.isfile(f):
+                        os.remove(f)
+                self.render_to_file("templates/ooc.tcl",
+                                    os.path.join(m["dir"], "ooc.tcl"),
+                                    ts=self.ts,
+                                    m=m,
+                                    include_dirs=[os.path.realpath(d) for d in self.viv["include_dirs"]],
+                                    directives=self.stage_directives())
+                pending.append(m)
+        if not pending:
+            return
+        cfg = self.viv["ooc"]
+        workers = max_workers(cfg["mem_per_run_gb"] * 1e9, cfg.get("max_workers"))
+        self.log(f"Synthesizing {len(pending)} of {len(modules)} out-of-context modules with {workers} concurrent vivado processes")
+
+        def synth(m):
+            with scheduled(self.viv["scheduler"], mem_gb=cfg["mem_per_run_gb"]) as grant:
+                vivado = BinaryDriver("vivado")
+                vivado.add_option("-mode", "batch")
+                vivado.add_option("-nojournal")
+                vivado.add_option("-log", "ooc.log")
+                vivado.add_option("-source", vivado_source("ooc.tcl", m["dir"], grant))
+                if self.viv["monitor"]["enabled"]:
+                    run_monitored(vivado.get_execute_string(), m["dir"],
+                                  os.path.join(m["dir"], "stage_metrics.json"),
+                                  log=lambda msg: self.log(f"OOC {m['name']}: {msg}"),
+                                  interval=self.viv["monitor"]["interval"],
+                                  echo=False)
+                else:
+                    vivado.execute(directory=m["dir"])
+            if not os.path.isfile(m["dcp"]) or not os.path.isfile(m["stub"]):
+                raise ToolError(f"no checkpoint generated (see {m['dir']}/ooc.log)")
+
+        results = run_parallel(synth, pending, workers)
+        failed = []
+        for i, m in enumerate(pending):
+            error = results[i][1]
+            if error is not None:
+                failed.append(m["name"])
+                self.log(f"OOC {m['name']}: failed: {error}", LogLevel.WARNING)
+                continue
+            Path(m["dir"], "key.txt").write_text(m["key"])
+            self.log(f"OOC {m['name']}: synthesized")
+            if cache:
+                cache.store(m["key"], m["dir"], [Path(m["dcp"]).name, Path(m["stub"]).name])
+        if cache:
+            self.log(cache.report())
+        if failed:
+            raise ToolError(f"Out-of-context synthesis failed for: {', '.join(failed)}")
+
+    def write_stage_manifest(self, start_time):
+        """Records fingerprints of every stage whose output is current"""
+        done = {}
+        for stage, _ in STAGES:
+            out = self.stage_output(stage)
+            if not os.path.isfile(out):
+                break
+            if stage in self.stages and os.path.getmtime(out) < start_time:
+                break
+            done[stage] = self.fingerprints[stage]
+        os.makedirs(os.path.dirname(self.stage_manifest), exist_ok=True)
+        with open(self.stage_manifest, "w") as fp:
+            json.dump(done, fp, indent=2)
 
     def add_primary_clock(self, fstr_obj, clk):
         """Primary clock dictionary. Adds lines to fstr_obj"""
         # Modify units
+        scale = self.time_multiplier[self.viv["units"]["time"]]
+        period = scale * clk["period"]
+        waveform = [scale * edge for edge in clk.get("waveform", [])]
         if self.viv["units"]["time"] != "ns":
-            clk["period"] = time_multiplier[self.viv["units"]
-                                            ["time"]] * clk["period"]
             self.log(
-                f'Clock "{clk["name"]}" period translated to Vivado time units: {clk["period"]} [ns]',
+                f'Clock "{clk["name"]}" period translated to Vivado time units: {period} [ns]',
                 LogLevel.WARNING)
-            if "waveform" in clk:
-                for j, edge in enumerate(clk["waveform"]):
-                    edge = self.time_multiplier[self.viv["units"]
-                                                ["time"]] * edge
-                    self.log(
-                        f'Clock "{clk["name"]}" edge {j} translated to Vivado time units: {edge} [ns]',
-                        LogLevel.WARNING)
+            for j, edge in enumerate(waveform):
+                self.log(
+                    f'Clock "{clk["name"]}" edge {j} translated to Vivado time units: {edge} [ns]',
+                    LogLevel.WARNING)
         # Add to section
-        search_fun = "get_nets -hierarchical"
-        if clk["type"] == "port":
-            search_func = "get_ports"
-        elif clk["type"] == "pin":
-            search_func = "get_pins -hierarchical"
-        if "waveform" in clk:
-            clk["waveform"] = [str(edge) for edge in clk["waveform"]]
+        try:
+            obj_str = object_query(clk.get("type", "port"), clk["object"])
+        except ValueError as e:
+            raise ToolError(f'Primary clock "{clk["name"]}": {e}')
+        if waveform:
             fstr_obj.add_line(
-                f"create_clock -name {clk['name']} -verbose -period {clk['period']} [{search_func} {clk['object']}] \\"
+                f"create_clock -name {clk['name']} -verbose -period {period} {obj_str} \\"
             )
-            fstr_obj.add_line(f"\t-waveform {{{' '.join(clk['waveform'])}}}")
+            fstr_obj.add_line(f"\t-waveform {{{' '.join(str(edge) for edge in waveform)}}}")
         else:
             fstr_obj.add_line(
-                f"create_clock -name {clk['name']} -verbose -period {clk['period']} [{search_func} {clk['object']}]"
+                f"create_clock -name {clk['name']} -verbose -period {period} {obj_str}"
             )
 
     def add_generated_clock(self, fstr_obj, clk):
         """Generated clock dictionary. Adds lines to fstr_obj"""
-        # Get search functions
+        # Get search functions (type none => object used as given)
         name_str = clk["object"]
-        if clk["type"] == "port":
-            name_str = f"[get_ports {clk['object']}]"
-        elif clk["type"] == "pin":
-            name_str = f"[get_pins -hierarchical {clk['object']}]"
-        elif clk["type"] == "net":
-            name_str = f"[get_nets -hierarchical {clk['object']}]"
+        if clk["type"] != "none":
+            name_str = object_query(clk["type"], clk["object"])
         source_str = clk["source"]
-        if clk["source_type"] == "port":
-            source_str = f"[get_ports {clk['source']}]"
-        elif clk["source_type"] == "pin":
-            source_str = f"[get_pins -hierarchical {clk['source']}]"
-        elif clk["source_type"] == "net":
-            source_str = f"[get_nets -hierarchical {clk['source']}]"
+        if clk["source_type"] != "none":
+            source_str = object_query(clk["source_type"], clk["source"])
         # Common lines
         fstr_obj.add_line(
             f"create_generated_clock -verbose -name {clk['name']} \\")
@@ -136,64 +528,58 @@ class XilinxImplementTool(JinjaTool):
                 LogLevel.WARNING)
         fstr_obj.add_line(f"\t{name_str}")
 
+    def delay_commands(self, command, constraints):
+        """set_input_delay/set_output_delay lines for a list of delay constraints
+
+        In grouped modes ports sharing clock, edge and min/max delay are
+        constrained by one command pair over a port list, otherwise one pair
+        per port is emitted. grouped_wildcard replaces a bus by base[*] if
+        all of its bits pinned in ports are listed (bits pinned elsewhere or
+        unpinned would match the wildcard too, so it is opt-in).
+        """
+        unit = self.viv["units"]["time"]
+        scale = self.time_multiplier[unit]
+        if self.viv["io_delay_grouping"] in ("grouped", "grouped_wildcard"):
+            known_ports = [p["name"] for p in self.viv["ports"]] \
+                if self.viv["io_delay_grouping"] == "grouped_wildcard" else ()
+            groups = group_delays(constraints, scale, known_ports)
+        else:
+            groups = [dict(con, min_delay=con["min_delay"] * scale,
+                           max_delay=con["max_delay"] * scale,
+                           ports=[con["port"]]) for con in constraints]
+        lines = []
+        for group in groups:
+            if unit != "ns":
+                self.log(
+                    f"{command} on {' '.join(group['ports'])} translated to min {group['min_delay']} ns, max {group['max_delay']} ns"
+                )
+            for opt in ["min", "max"]:
+                delay_bin = BinaryDriver(command)
+                if group["clock_edge"] == "fall":
+                    delay_bin.add_option("-clock_fall")
+                delay_bin.add_option("-verbose")
+                delay_bin.add_option("-clock", f"[get_clocks {group['clock']}]")
+                delay_bin.add_option(f"-{opt}", f"{group[f'{opt}_delay']}")
+                delay_bin.add_option(get_ports(group["ports"]))
+                lines.append(delay_bin.get_execute_string())
+        self.log(
+            f"{command}: {len(constraints)} port constraints => {len(lines)} commands (was {2 * len(constraints)})"
+        )
+        return lines
+
     def io_delay_section(self):
         """Generates section with set_input_delay and set_output_delay constraints"""
         section = Section("Input/output delay constraints", "#")
         if self.viv["input_delay_constraints"]:
             section.add_line("# Input delays")
-            for con in self.viv["input_delay_constraints"]:
-                min_bin = BinaryDriver("set_input_delay")
-                max_bin = BinaryDriver("set_input_delay")
-                min_delay = con["min_delay"] * self.time_multiplier[
-                    self.viv["units"]["time"]]
-                max_delay = con["max_delay"] * self.time_multiplier[
-                    self.viv["units"]["time"]]
-                if self.viv["units"]["time"] != "ns":
-                    self.log(
-                        "Input delay translated from {con['min_delay']} {self.viv['units']['time']} to {min_delay} ns"
-                    )
-                    self.log(
-                        "Input delay translated from {con['max_delay']} {self.viv['units']['time']} to {max_delay} ns"
-                    )
-                if con["clock_edge"] == "fall":
-                    min_bin.add_option("-clock_fall")
-                    max_bin.add_option("-clock_fall")
-                min_bin.add_option("-verbose")
-                max_bin.add_option("-verbose")
-                min_bin.add_option("-clock", f"[get_clocks {con['clock']}]")
-                max_bin.add_option("-clock", f"[get_clocks {con['clock']}]")
-                min_bin.add_option("-min", f"{min_delay}")
-                max_bin.add_option("-max", f"{max_delay}")
-                min_bin.add_option(f"[get_ports {con['port']}]")
-                max_bin.add_option(f"[get_ports {con['port']}]")
-                section.add_line(min_bin.get_execute_string())
-                section.add_line(max_bin.get_execute_string())
+            for line in self.delay_commands("set_input_delay",
+                                            self.viv["input_delay_constraints"]):
+                section.add_line(line)
         if self.viv["output_delay_constraints"]:
             section.add_line("# Output delays")
-            for con in self.viv["output_delay_constraints"]:
-                min_bin = BinaryDriver("set_output_delay")
-                max_bin = BinaryDriver("set_output_delay")
-                min_delay = con["min_delay"] * self.time_multiplier[
-                    self.viv["units"]["time"]]
-                max_delay = con["max_delay"] * self.time_multiplier[
-                    self.viv["units"]["time"]]
-                if self.viv["units"]["time"] != "ns":
-                    self.log(
-                        "Output delay translated from {con['delay']} {self.viv['units']['time']} to {delay} ns"
-                    )
-                if con["clock_edge"] == "fall":
-                    min_bin.add_option("-clock_fall")
-                    max_bin.add_option("-clock_fall")
-                min_bin.add_option("-verbose")
-                max_bin.add_option("-verbose")
-                min_bin.add_option("-clock", f"[get_clocks {con['clock']}]")
-                max_bin.add_option("-clock", f"[get_clocks {con['clock']}]")
-                min_bin.add_option("-min", f"{min_delay}")
-                max_bin.add_option("-max", f"{max_delay}")
-                min_bin.add_option(f"[get_ports {con['port']}]")
-                max_bin.add_option(f"[get_ports {con['port']}]")
-                section.add_line(min_bin.get_execute_string())
-                section.add_line(max_bin.get_execute_string())
+            for line in self.delay_commands("set_output_delay",
+                                            self.viv["output_delay_constraints"]):
+                section.add_line(line)
         return section
 
     def clock_groups(self):
@@ -209,20 +595,133 @@ class XilinxImplementTool(JinjaTool):
         return section
 
     def false_paths(self):
-        """Generates clock groups"""
+        """Generates false paths"""
         section = Section("False Paths", "#")
         for path in self.viv["false_paths"]:
-            if path["from"]['type'] == "clock":
-                from_search = "get_clocks"
-            if path["to"]['type'] == "port":
-                to_search = "get_ports"
-            elif path["to"]['type'] == "pin":
-                to_search = "get_pins -hierarchical"
+            try:
+                from_str = object_query(path["from"]["type"], path["from"]["name"])
+                to_str = object_query(path["to"]["type"], path["to"]["name"])
+            except ValueError as e:
+                raise ToolError(f"False path: {e}")
             section.add_line(f"set_false_path -verbose \\")
-            section.add_line(f"\t-from [{from_search} {path['from']['name']}] \\")
-            section.add_line(f"\t-to [{to_search} {path['to']['name']}]")
+            section.add_line(f"\t-from {from_str} \\")
+            section.add_line(f"\t-to {to_str}")
         return section
 
+    def constraint_targets(self):
+        """Objects queried by the generated timing and physical xdc
+
+        Returns (targets, clocks): targets for netlist_index.lint and the
+        clock names referenced as (source, name).
+        """
+        targets, clocks = [], []
+
+        def add(source, obj_type, name):
+            if obj_type == "clock":
+                clocks.append((source, name))
+            elif obj_type != "none":
+                targets.append({"source": source, "kind": f"{obj_type}s",
+                                "names": name.strip("{}").split(),
+                                "hierarchical": obj_type != "port"})
+
+        for clk in self.viv["primary_clocks"]:
+            add(f'primary clock "{clk["name"]}"', clk.get("type", "port"), clk["object"])
+        for clk in self.viv["generated_clocks"]:
+            add(f'generated clock "{clk["name"]}"', clk["type"], clk["object"])
+            add(f'generated clock "{clk["name"]}" source', clk["source_type"], clk["source"])
+        for command, cons in [("set_input_delay", self.viv["input_delay_constraints"]),
+                              ("set_output_delay", self.viv["output_delay_constraints"])]:
+            for con in cons:
+                add(f"{command} {con['port']}", "port", con["port"])
+                add(f"{command} {con['port']}", "clock", con["clock"])
+        for cg in self.viv["clock_groups"]:
+            for group in cg["groups"]:
+                for name in group:
+                    add(f'clock group "{cg["name"]}"', "clock", name)
+        for i, path in enumerate(self.viv["false_paths"]):
+            for end in ["from", "to"]:
+                add(f"false path {i} -{end}", path[end]["type"], path[end]["name"])
+        for port in self.viv["ports"]:
+            add(f"port {port['name']} (physical.xdc)", "port", port["name"])
+        return targets, clocks
+
+    def source_digest(self):
+        """Digest of the design sources the post synthesis netlist is built from"""
+        return hash_inputs(self.viv["verilog"] + self.viv["vhdl"] + self.viv["ip"],
+                           self.viv["include_dirs"], extra={"top": self.viv["top"]})
+
+    def netlist_index_file(self):
+        cfg = self.viv["lint"]
+        cache_dir = cfg.get("dir") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "cache", "netlist_index")
+        return os.path.join(cache_dir, f"{self.viv['top']}.json")
+
+    def load_netlist_index(self):
+        """Index of the latest post synthesis netlist (cached copy or job dir netlist), or None"""
+        netlist = os.path.join(self.get_db("internal.job_dir"), f"{self.viv['top']}_post_synth.v")
+        index_file = self.netlist_index_file()
+        index = NetlistIndex.load(index_file) if os.path.isfile(index_file) else None
+        if os.path.isfile(netlist):
+            digest = hash_inputs([netlist])
+            if index is None or index.meta.get("netlist") != digest:
+                # Sources of a netlist not indexed after its run are unknown
+                index = NetlistIndex.from_netlist(netlist, self.viv["top"],
+                                                  meta={"netlist": digest, "sources": None})
+        return index
+
+    def lint_constraints(self):
+        """Checks every object queried by generated constraints against the netlist index
+
+        Missing objects are warnings. With lint.strict they fail the run
+        before vivado starts if the index was built from the current sources
+        (not if the sources changed since). Clocks not created by primary_clocks,
+        generated_clocks or the xdc files are warnings (vivado derives clocks
+        of clocking primitives). The report is written to constraint_lint.rpt.
+        """
+        if not self.viv["lint"]["enabled"]:
+            return
+        start = time.time()
+        index = self.load_netlist_index()
+        if index is None:
+            self.log("No post synthesis netlist indexed yet. Constraints not linted.")
+            return
+        targets, clocks = self.constraint_targets()
+        problems = lint(index, targets)
+        known = {c["name"] for c in self.viv["primary_clocks"] + self.viv["generated_clocks"]}
+        for f in self.viv["xdc"] + self.viv["post_synthesis_xdc"]:
+            known.update(xdc_clocks(f))
+        unknown = [f"{source}: clock {name} is not created by the constraints (derived clock?)"
+                   for source, name in clocks if name not in known]
+        current = index.meta.get("sources") == self.source_digest()
+        report = os.path.join(self.get_db("internal.job_dir"), "constraint_lint.rpt")
+        with open(report, "w") as fp:
+            fp.write(f"# Netlist index {'of current sources' if current else 'older than sources'}: "
+                     f"{', '.join(f'{len(v)} {k}' for k, v in index.sets.items())}\n")
+            for line in problems + unknown:
+                fp.write(line + "\n")
+        for line in problems + unknown:
+            self.log(line, LogLevel.WARNING)
+        self.log(f"Constraint lint: {sum(len(t['names']) for t in targets)} objects, {len(clocks)} clocks checked in {time.time() - start:.2f} s, {len(problems)} missing, {len(unknown)} unknown clocks")
+        if problems and current and self.viv["lint"].get("strict"):
+            raise ToolError(f"{len(problems)} constraint object(s) not found in post synthesis netlist (see {report})")
+        if problems and not current:
+            self.log("Netlist index is older than the sources, missing objects not treated as errors",
+                     LogLevel.WARNING)
+
+    def index_netlist(self):
+        """Saves the netlist index of this run's post synthesis netlist for the next lint"""
+        netlist = os.path.join(self.get_db("internal.job_dir"), f"{self.viv['top']}_post_synth.v")
+        if not self.viv["lint"]["enabled"] or not self.viv["execute"] or not os.path.isfile(netlist):
+            return
+        index_file = self.netlist_index_file()
+        digest = hash_inputs([netlist])
+        if os.path.isfile(index_file) and NetlistIndex.load(index_file).meta.get("netlist") == digest:
+            return
+        index = NetlistIndex.from_netlist(netlist, self.viv["top"],
+                                          meta={"netlist": digest, "sources": self.source_digest()})
+        index.save(index_file)
+        self.log(f"Netlist index saved: {index_file}")
+
     def render_timing_xdc(self):
         """Renders timing xdc file for constraining timing pre-synthesis"""
         # TODO create similar methods for all xdc types: timing, io, misc, waver, and physical
@@ -258,34 +757,308 @@ class XilinxImplementTool(JinjaTool):
         if self.timing_xdc.generate():
             self.log(f"Timing XDC generated: {self.timing_xdc.fpath.relative_to(self.get_db('internal.work_dir'))}")
         else:
-            self.log(f"Timing XDC not generated",
-                     LogLevel.WARNING)
+            self.log(f"Timing XDC up to date: {self.timing_xdc.fpath.relative_to(self.get_db('internal.work_dir'))}")
+
+    def reset_closure_log(self):
+        """Drops closure passes of the stages about to run from reports/closure_passes.tsv"""
+        fpath = os.path.join(self.get_db("internal.job_dir"), "reports", "closure_passes.tsv")
+        if not os.path.isfile(fpath):
+            return
+        rerun = {f"post_{stage}" for stage in self.stages}
+        with open(fpath) as fp:
+            lines = [l for l in fp if l.split("\t", 1)[0] not in rerun]
+        with open(fpath, "w") as fp:
+            fp.writelines(lines)
+
+    def index_reports(self):
+        """Parses all reports of the job into report_index.json"""
+        job_dir = self.get_db('internal.job_dir')
+        report_dir = os.path.join(job_dir, "reports")
+        if not os.path.isdir(report_dir):
+            self.log("No reports found. Report index not generated.", LogLevel.WARNING)
+            return
+        index_file = os.path.join(job_dir, "report_index.json")
+        index = build_index(report_dir, index_file)
+        self.log(f"Report index generated: {Path(index_file).relative_to(self.get_db('internal.work_dir'))}")
+        wns = query(index, "timing.post_route.wns")
+        whs = query(index, "timing.post_route.whs")
+        luts = query(index, "utilization.post_route.slice_luts.util_pct") or \
+            query(index, "utilization.post_route.clb_luts.util_pct")
+        self.log(f"Post route: WNS {wns} ns, WHS {whs} ns, LUT utilization {luts}%")
+        for stage, closure in index.get("closure", {}).items():
+            passes = closure["passes"]
+            final = passes[-1] if passes else closure["initial"]
+            self.log(f"Closure {stage}: {len(passes)} extra passes in {closure['seconds']:.0f} s, WNS {closure['initial']['wns']} => {final['wns']} ns, WHS {closure['initial']['whs']} => {final['whs']} ns" +
+                     (f" ({', '.join(p['name'] for p in passes)})" if passes else ""))
+
+    def record_history(self):
+        """Records metrics of this run in the build history, logs regressions"""
+        cfg = self.viv["history"]
+        if not cfg["enabled"] or not self.viv["execute"]:
+            return
+        job_dir = self.get_db("internal.job_dir")
+        work_dir = self.get_db("internal.work_dir")
+        db_path = cfg.get("db") or os.path.join(work_dir, "build", "history.sqlite")
+        metrics = job_metrics(job_dir, self.viv["top"])
+        status = "ok" if "bitstream.bytes" in metrics else "incomplete"
+        job = str(Path(job_dir).relative_to(work_dir))
+        with History(db_path) as hist:
+            run_id = hist.record("implement", job, metrics, git_revision(work_dir), status)
+            self.log(f"Recorded {len(metrics)} metrics as run {run_id} in {db_path}")
+            for r in hist.regressions("implement", job, cfg["window"], cfg["threshold"]):
+                self.log(
+                    f"Regression: {r['name']} = {r['value']} (previous {cfg['window']} runs: mean {r['mean']:.4g}, stdev {r['stdev']:.3g})",
+                    LogLevel.WARNING)
+
+    def build_cache(self):
+        """Returns build cache if enabled, otherwise None"""
+        cfg = self.viv["cache"]
+        if not cfg["enabled"]:
+            return None
+        cache_dir = cfg.get("dir") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "cache", "implement")
+        max_size = cfg.get("max_size_gb")
+        return BuildCache(cache_dir,
+                          max_entries=cfg.get("max_entries"),
+                          max_size=None if max_size is None else int(max_size * 1e9))
+
+    def cache_key(self):
+        """Digest of rendered stage tcl, timing xdc, all source/xdc files and include dirs
+
+        Built from the stage fingerprints, which hash generated xdc files
+        without their header, so identical inputs hit across job dirs,
+        users and days.
+        """
+        return hash_inputs(extra={"mode": self.viv["mode"],
+                                  "stages": self.fingerprints})
+
+    def write_open_scripts(self):
+        """Writes open.sh/open.tcl for opening the routed checkpoint in the gui"""
+        with open(self.open_sh, 'w') as fp:
+            fp.write('#!/usr/bin/env bash\n')
+            fp.write(f'vivado -mode tcl -source {self.open_tcl}')
+        os.chmod(self.open_sh, 0o755)
+        checkp = os.path.join(self.get_db('internal.job_dir'), 'checkpoints/post_route.dcp')
+        with open(self.open_tcl, 'w') as fp:
+            fp.write(f'open_checkpoint {checkp}\n')
+            fp.write('start_gui')
+        self.log("Open design with script: build/implement/current/open.sh")
+
+    def render_physical_xdc(self):
+        """Renders physical xdc (device configuration, io properties and pins)
+
+        Pin assignments are checked first (duplicates, and against the
+        package pin table when given) so mistakes fail before vivado starts.
+        Ports with identical io properties share one set_property command.
+        """
+        pin_table = None
+        if self.viv.get("pin_table"):
+            pin_table = read_pin_table(self.viv["pin_table"])
+        errors = check_pins(self.viv["ports"], pin_table)
+        for e in errors:
+            self.log(e, LogLevel.WARNING)
+        if errors:
+            raise ToolError(f"{len(errors)} pin assignment error(s) in implement ports")
+        # Device configuration
+        cfg_sec = Section("Device configuration", "#")
+        self.physical_xdc.add(cfg_sec)
+        cfg_sec.add_line("# CFGBVS => VCCO when CONFIG_VOLTAGE = 3.3V/2.5V, GND when 1.8V/1.5V")
+        cfg_sec.add_line(f"set_property CFGBVS {self.viv['config']['bank_voltage_select']} [current_design]")
+        cfg_sec.add_line(f"set_property CONFIG_VOLTAGE {self.viv['config']['voltage']} [current_design]")
+        cfg_sec.add_line("set_property BITSTREAM.CONFIG.PERSIST NO [current_design]")
+        cfg_sec.add_line(f"set_property CONFIG_MODE {self.viv['config']['mode']} [current_design]")
+        # IO properties grouped by identical property sets
+        io_sec = Section("IO properties", "#")
+        self.physical_xdc.add(io_sec)
+        key = lambda p: (p["iostandard"], p.get("slew"), p.get("drive"))
+        groups = group_by(self.viv["ports"], key)
+        for (iostandard, slew, drive), ports in groups.items():
+            props = [f"IOSTANDARD {iostandard}"]
+            if slew is not None:
+                props.append(f"SLEW {slew}")
+            if drive is not None:
+                props.append(f"DRIVE {drive}")
+            io_sec.add_line(
+                f"set_property -dict {{{' '.join(props)}}} {get_ports([p['name'] for p in ports])}")
+        # Package pins
+        pin_sec = Section("Package pins", "#")
+        self.physical_xdc.add(pin_sec)
+        for port in self.viv["ports"]:
+            pin_sec.add_line(
+                f"set_property PACKAGE_PIN {port['package_pin']} {get_ports([port['name']])}")
+        self.log(f"{len(self.viv['ports'])} ports constrained with {len(groups)} io property commands")
+        if self.physical_xdc.generate():
+            self.log(f"Physical XDC generated: {self.physical_xdc.fpath.relative_to(self.get_db('internal.work_dir'))}")
+        else:
+            self.log(f"Physical XDC up to date: {self.physical_xdc.fpath.relative_to(self.get_db('internal.work_dir'))}")
+
+    def run_sweep(self):
+        """Implements every directive set concurrently and promotes the best run
+
+        Each run gets its own sub job dir (sweep/run_<i>). The run with the
+        best (WNS, TNS) in its post route timing summary is copied into the
+        job dir. Results of all runs are written to sweep_results.json.
+        """
+        job_dir = self.get_db('internal.job_dir')
+        sweep = self.viv["sweep"]
+        start_time = time.time()
+        runs = []
+        for i, overrides in enumerate(sweep["runs"]):
+            run_dir = os.path.join(job_dir, "sweep", f"run_{i:02d}")
+            os.makedirs(run_dir, exist_ok=True)
+            directives = self.stage_directives(overrides)
+            self.render_tcl(run_dir, directives)
+            self.render_to_file(self.template_file,
+                                os.path.join(run_dir, "implement.tcl"),
+                                ts=self.ts,
+                                stages=[s for s, _ in STAGES],
+                                resume_checkpoint=None)
+            copy(self.timing_xdc.fpath, run_dir)
+            copy(self.physical_xdc.fpath, run_dir)
+            if self.viv["ila"]["enabled"]:
+                for f in ["ila.tcl", "ila_clock_map.txt"]:
+                    if os.path.isfile(os.path.join(job_dir, f)):
+                        copy(os.path.join(job_dir, f), run_dir)
+            self.copy_includes(run_dir)
+            runs.append({"name": f"run_{i:02d}", "dir": run_dir,
+                         "directives": directives})
+        workers = max_workers(sweep["mem_per_run_gb"] * 1e9,
+                              sweep.get("max_workers"))
+        self.log(f"Sweeping {len(runs)} directive sets with {workers} concurrent vivado processes")
+
+        def implement(run):
+            with scheduled(self.viv["scheduler"], mem_gb=sweep["mem_per_run_gb"]) as grant:
+                vivado = BinaryDriver("vivado")
+                vivado.add_option("-mode", "batch")
+                vivado.add_option("-source", vivado_source("implement.tcl", run["dir"], grant))
+                if self.viv["monitor"]["enabled"]:
+                    run_monitored(vivado.get_execute_string(), run["dir"],
+                                  os.path.join(run["dir"], "stage_metrics.json"),
+                                  log=lambda msg: self.log(f"Sweep {run['name']}: {msg}"),
+                                  interval=self.viv["monitor"]["interval"],
+                                  echo=False)
+                else:
+                    vivado.execute(directory=run["dir"])
+
+        results = run_parallel(implement, runs, workers)
+        for i, run in enumerate(runs):
+            rpt = os.path.join(run["dir"], "reports", "post_route_timing_summary.rpt")
+            run["timing"] = parse_timing_summary(rpt) if os.path.isfile(rpt) else None
+            if results[i][1] is not None or run["timing"] is None:
+                self.log(f"Sweep {run['name']} failed: {results[i][1] or 'no post route timing summary'}",
+                         LogLevel.WARNING)
+            else:
+                self.log(f"Sweep {run['name']}: WNS {run['timing']['wns']} ns, TNS {run['timing']['tns']} ns")
+        done = [r for r in runs if r["timing"] and r["timing"]["wns"] is not None]
+        best = max(done, key=lambda r: (r["timing"]["wns"], r["timing"]["tns"] or 0)) if done else None
+        with open(os.path.join(job_dir, "sweep_results.json"), "w") as fp:
+            json.dump({"best": best["name"] if best else None, "runs": runs}, fp, indent=2)
+        if best is None:
+            raise ToolError("No sweep run completed routing")
+        # Promote best run to main job dir
+        self.log(f"Promoting sweep {best['name']} ({best['directives']}) to job dir")
+        for pattern in CACHE_ARTIFACTS + [f"{s}.tcl" for s, _ in STAGES]:
+            for f in Path(best["dir"]).glob(pattern):
+                dst = Path(job_dir, f.relative_to(best["dir"]))
+                if f.is_dir():
+                    copytree(f, dst, dirs_exist_ok=True)
+                else:
+                    copy(f, dst)
+        self.stages = [s for s, _ in STAGES]
+        self.fingerprints = self.stage_fingerprints()
+        self.write_stage_manifest(start_time)
+
+    def run_farm(self, script):
+        """Runs vivado in batch mode on a build farm worker
+
+        The job dir (rendered tcl, includes, ooc checkpoints, previous
+        stages) is mirrored to the worker together with the sources, xdc
+        files and ip dirs read by absolute path.
+        """
+        job_dir = self.get_db("internal.job_dir")
+        external = self.viv["verilog"] + self.viv["vhdl"] + self.viv["xdc"] + \
+            self.viv["post_synthesis_xdc"] + [ILA_PROCS, CLOSURE_PROCS]
+        external += [os.path.dirname(os.path.realpath(f)) for f in self.viv["ip"]]
+        for m in self.viv["ooc_modules"]:
+            external += m.get("xdc", [])
+        self.bin.add_option("-mode", "batch")
+        self.bin.add_option("-source", str(script))
+        job = FarmJob("implement", shlex.split(self.bin.get_execute_string()), job_dir,
+                      external=external, log=self.log, log_file=os.path.join(job_dir, "farm.log"))
+        try:
+            result = get_farm(self.viv["farm"]).run(job)
+        except FarmError as e:
+            raise ToolError(f"Build farm: {e}")
+        self.log(f"Build farm: {result}")
+        if not result.ok:
+            raise ToolError(f"Vivado exited with code {result.rc} on {result.worker} (see vivado.log)")
 
     def run_vivado(self):
         """Actually runs the vivado command"""
         if self.viv["execute"]:
+            job_dir = self.get_db('internal.job_dir')
+            if self.viv["sweep"]["enabled"]:
+                self.run_sweep()
+                self.write_open_scripts()
+                return
+            if not self.stages:
+                self.log("Implementation up to date. Vivado not run.")
+                self.write_open_scripts()
+                return
+            # Skip vivado entirely if identical inputs were already implemented
+            cache = self.build_cache()
+            if cache:
+                key = self.cache_key()
+                if cache.restore(key, job_dir):
+                    self.log(f"Build cache hit ({key[:12]}): restored implementation from {cache.entry(key)}")
+                    self.log(cache.report())
+                    self.write_open_scripts()
+                    return
+                self.log(f"Build cache miss ({key[:12]}): running vivado")
             self.log('Assumes "vivado" binary added to path')
+            self.reset_closure_log()
+            start_time = time.time()
             # Add options
-            render_file_local = Path(self.render_file).relative_to(
-                self.get_db('internal.job_dir'))
-            self.bin.add_option("-mode", self.viv['mode'])
-            self.bin.add_option("-source", render_file_local)
-            # Execute binary
-            self.log(self.bin.get_execute_string())
-            self.bin.execute(directory=self.get_db('internal.job_dir'))
+            render_file_local = Path(self.render_file).relative_to(job_dir)
+            if self.viv["farm"]["enabled"]:
+                self.run_farm(render_file_local)
+            elif self.viv["server"]["enabled"]:
+                self.log(f"Submitting {render_file_local} to persistent vivado worker")
+                result = submit(self.render_file, job_dir,
+                                address=self.viv["server"].get("address"),
+                                log_file=os.path.join(job_dir, "vivado.log"))
+                if not result.ok:
+                    raise ToolError(f"Vivado worker failed running {render_file_local} (see vivado.log)")
+            else:
+                with scheduled(self.viv["scheduler"]) as grant:
+                    self.bin.add_option("-mode", self.viv['mode'])
+                    self.bin.add_option("-source", vivado_source(render_file_local, job_dir, grant))
+                    # Execute binary
+                    self.log(self.bin.get_execute_string())
+                    if self.viv["monitor"]["enabled"]:
+                        rc = run_monitored(self.bin.get_execute_string(), job_dir,
+                                           os.path.join(job_dir, "stage_metrics.json"),
+                                           log=self.log,
+                                           interval=self.viv["monitor"]["interval"])
+                        if rc != 0:
+                            raise ToolError(f"Vivado exited with code {rc} (see vivado.log)")
+                    else:
+                        self.bin.execute(directory=job_dir)
+            self.write_stage_manifest(start_time)
             self.log(
-                f"Final implementation in => {Path(self.get_db('internal.job_dir')).relative_to(self.get_db('internal.work_dir'))}"
+                f"Final implementation in => {Path(job_dir).relative_to(self.get_db('internal.work_dir'))}"
             )
+            # Only cache complete implementations
+            if cache:
+                if Path(job_dir, f"{self.viv['top']}.bit").is_file():
+                    cache.store(key, job_dir, CACHE_ARTIFACTS)
+                    self.log(f"Stored implementation in build cache ({key[:12]})")
+                else:
+                    self.log("No bitstream generated. Implementation not cached.",
+                             LogLevel.WARNING)
+                self.log(cache.report())
             # Open design script
-            with open(self.open_sh, 'w') as fp:
-                fp.write('#!/usr/bin/env bash\n')
-                fp.write(f'vivado -mode tcl -source {self.open_tcl}')
-            os.chmod(self.open_sh, 0o755)
-            checkp = os.path.join(self.get_db('internal.job_dir'), 'checkpoints/post_route.dcp')
-            with open(self.open_tcl, 'w') as fp:
-                fp.write(f'open_checkpoint {checkp}\n')
-                fp.write('start_gui')
-            self.log("Open design with script: build/implement/current/open.sh")
+            self.write_open_scripts()
         else:
             self.log(
                 "Xilinx implement execute flag set to false. Design not implemented."
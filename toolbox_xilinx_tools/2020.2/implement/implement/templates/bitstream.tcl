@@ -0,0 +1,12 @@
+#------------------------------------------------------------------------------
+# Final output generation
+#------------------------------------------------------------------------------
+write_xdc final_constraints.xdc
+write_verilog -force -mode timesim {{ts.implement.top}}_post_impl.v
+write_sdf -force -mode timesim -process_corner slow {{ts.implement.top}}_post_impl_slow.sdf
+write_sdf -force -mode timesim -process_corner fast {{ts.implement.top}}_post_impl_fast.sdf
+write_bitstream -mask_file -force -verbose {{ts.implement.top}}.bit
+{% if ts.implement.ila.enabled %}
+write_debug_probes -force {{ts.implement.top}}.ltx
+{% endif %}
+#------------------------------------------------------------------------------
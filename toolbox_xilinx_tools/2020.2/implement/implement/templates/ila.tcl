@@ -0,0 +1,7 @@
+#------------------------------------------------------------------------------
+# ILA insertion: one ILA per clock domain of the MARK_DEBUG nets
+# (post synthesis, before opt_design)
+#------------------------------------------------------------------------------
+source {{procs}}
+batch_insert_ila {{ts.implement.ila.depth}} {{key}} {{map_file}}
+#------------------------------------------------------------------------------
@@ -0,0 +1,20 @@
+#------------------------------------------------------------------------------
+# Out-of-context synthesis of {{m.name}}
+#------------------------------------------------------------------------------
+{% for f in m.files %}
+{% if ts.implement.verilog_version == "sv" %}
+read_verilog -sv -verbose {{f}}
+{% else %}
+read_verilog -verbose {{f}}
+{% endif %}
+{% endfor %}
+{% for f in m.xdc %}
+read_xdc -mode out_of_context -verbose {{f|realpath}}
+{% endfor %}
+
+synth_design -top {{m.name}} -mode out_of_context -flatten_hierarchy {{ts.implement.flatten_hierarchy}} -part {{ts.implement.part}}{% if include_dirs %} -include_dirs [list {{include_dirs|join(" ")}}]{% endif %}{% if directives.synth %} -directive {{directives.synth}}{% endif %}
+
+write_checkpoint -force -verbose {{m.name}}.dcp
+write_verilog -force -mode synth_stub {{m.name}}_stub.v
+report_utilization -file {{m.name}}_util.rpt
+#------------------------------------------------------------------------------
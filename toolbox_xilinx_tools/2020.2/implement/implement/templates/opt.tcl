@@ -0,0 +1,41 @@
+#------------------------------------------------------------------------------
+# Set Units (set once after synthesis - requires open design)
+#------------------------------------------------------------------------------
+set_units -verbose \
+    -capacitance {{ts.implement.units.capacitance}} \
+    -current {{ts.implement.units.current}} \
+    -voltage {{ts.implement.units.voltage}} \
+    -power {{ts.implement.units.power}} \
+    -resistance {{ts.implement.units.resistance}} \
+    -altitude {{ts.implement.units.altitude}}
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+# Post synthesis xdc files
+#------------------------------------------------------------------------------
+{% for f in ts.implement.post_synthesis_xdc %}
+read_xdc -verbose {{f|realpath}}
+{% endfor %}
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+# Physical constraints: device configuration, IO properties and package pins
+#------------------------------------------------------------------------------
+read_xdc -verbose physical.xdc
+#------------------------------------------------------------------------------
+{% if ts.implement.ila.enabled %}
+
+# Debug cores for MARK_DEBUG nets
+source ila.tcl
+{% endif %}
+
+#------------------------------------------------------------------------------
+# Post-Synth Optimization
+#------------------------------------------------------------------------------
+opt_design{% if directives.opt %} -directive {{directives.opt}}{% endif %}
+write_checkpoint -force -verbose checkpoints/post_opt.dcp
+report_timing_summary -file reports/post_opt_timing_summary.rpt
+report_utilization -file reports/post_opt_util.rpt
+# TODO add more reports? They show example of custom script to report critical paths
+# TODO add additional power_opt_design?
+#------------------------------------------------------------------------------
@@ -0,0 +1,23 @@
+#------------------------------------------------------------------------------
+# Placement (TODO why is report_clock_utilization done before phys_opt_design?)
+#------------------------------------------------------------------------------
+{% if ts.implement.resume.incremental %}
+# Incremental placement/routing against the previous routed checkpoint
+if {[file exists checkpoints/reference_routed.dcp]} {
+    read_checkpoint -incremental checkpoints/reference_routed.dcp
+}
+{% endif %}
+place_design{% if directives.place %} -directive {{directives.place}}{% endif %}
+report_clock_utilization -file reports/post_place_clock_util.rpt
+{% if directives.phys_opt %}
+phys_opt_design -directive {{directives.phys_opt}}
+{% endif %}
+{% if ts.implement.closure.enabled %}
+# Extra physical optimization passes only while setup slack is negative
+source {{closure_procs}}
+closure_loop post_place [list{% for p in ts.implement.closure.place_passes %} {{ '{' ~ p ~ '}' }}{% endfor %}] {{ts.implement.closure.max_passes}} {{ts.implement.closure.time_budget_min * 60}} reports/closure_passes.tsv 0
+{% endif %}
+write_checkpoint -force -verbose checkpoints/post_place.dcp
+report_timing_summary -file reports/post_place_timing_summary.rpt
+report_utilization -file reports/post_place_util.rpt
+#------------------------------------------------------------------------------
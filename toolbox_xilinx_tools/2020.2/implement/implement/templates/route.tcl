@@ -0,0 +1,17 @@
+#------------------------------------------------------------------------------
+# Route
+#------------------------------------------------------------------------------
+route_design{% if directives.route %} -directive {{directives.route}}{% endif %}
+{% if ts.implement.closure.enabled %}
+# Extra post route passes only while setup or hold slack is negative
+source {{closure_procs}}
+closure_loop post_route [list{% for p in ts.implement.closure.route_passes %} {{ '{' ~ p ~ '}' }}{% endfor %}] {{ts.implement.closure.max_passes}} {{ts.implement.closure.time_budget_min * 60}} reports/closure_passes.tsv 1
+{% endif %}
+write_checkpoint -force checkpoints/post_route.dcp
+report_utilization -file reports/post_route_util.rpt
+report_route_status -file reports/post_route_status.rpt
+report_timing_summary -file reports/post_route_timing_summary.rpt
+report_timing -sort_by group -max_paths 50 -file reports/post_route_timing.rpt
+report_power -file reports/post_route_power.rpt
+report_drc -file reports/post_route_drc.rpt
+#------------------------------------------------------------------------------
@@ -0,0 +1,47 @@
+#------------------------------------------------------------------------------
+# Read source files and constraints
+#------------------------------------------------------------------------------
+# Source files and any extra xdc files
+{% for f in verilog %}
+{% if ts.implement.verilog_version == "sv" %}
+read_verilog -sv -verbose {{f|realpath}}
+{% else %}
+read_verilog -verbose {{f|realpath}}
+{% endif %}
+{% endfor %}
+{% for m in ooc_modules %}
+# Black box of out-of-context module {{m.name}}
+read_verilog -verbose {{m.stub}}
+{% endfor %}
+{% for f in ts.implement.vhdl %}
+read_vhdl -verbose {{f|realpath}}
+{% endfor %}
+{% for f in ts.implement.ip %}
+read_ip -verbose {{f|realpath}}
+{% endfor %}
+
+# Timing constraints
+read_xdc -verbose timing.xdc
+{% for f in ts.implement.xdc %}
+read_xdc -verbose {{f|realpath}}
+{% endfor %}
+#------------------------------------------------------------------------------
+
+#------------------------------------------------------------------------------
+# Synthesis (sets top and opens design)
+#------------------------------------------------------------------------------
+synth_design -top {{ts.implement.top}} -flatten_hierarchy {{ts.implement.flatten_hierarchy}} -part {{ts.implement.part}}{% if directives.synth %} -directive {{directives.synth}}{% endif %}
+{% for m in ooc_modules %}
+# Link out-of-context checkpoint into every instance of {{m.name}}
+foreach cell [get_cells -quiet -hierarchical -filter {REF_NAME == {{m.name}}}] {
+    read_checkpoint -cell $cell {{m.dcp}}
+}
+{% endfor %}
+write_checkpoint -force -verbose checkpoints/post_synth.dcp
+report_timing_summary -file reports/post_synth_timing_summary.rpt
+report_utilization -file reports/post_synth_util.rpt
+# TODO add more reports? They show example of custom script to report critical paths
+write_verilog -force {{ts.implement.top}}_post_synth.v
+report_clocks -verbose -file reports/post_synth_clocks.rpt
+check_timing -verbose -file reports/post_synth_check_timing.rpt
+#------------------------------------------------------------------------------
@@ -7,6 +7,7 @@
 
 # Imports - standard library
 import os
+import shlex
 from typing import Callable, List
 from jinja2 import StrictUndefined, Environment, FileSystemLoader
 
@@ -19,6 +20,15 @@ from toolbox.utils import *
 # Imports - local source
 from jinja_tool import JinjaTool
 from toolbox_xilinx_tools.str_to_file import File, Section
+from toolbox_xilinx_tools.vivado_server import submit, VIVADO_COMMAND
+from toolbox_xilinx_tools.farm import FarmJob, FarmError, get_farm
+from toolbox_xilinx_tools.build_cache import BuildCache, hash_inputs
+from toolbox_xilinx_tools.jobs import max_workers, run_parallel
+from toolbox_xilinx_tools.monitor import run_monitored
+from toolbox_xilinx_tools.scheduler import scheduled, vivado_source
+from toolbox_xilinx_tools.history import History, git_revision, stage_metrics
+from toolbox_xilinx_tools.ip_catalog import IPCatalog, dump_tcl, validate, check_values, \
+    drop_defaults
 
 
 class IPTool(Tool):
@@ -30,40 +40,312 @@ class IPTool(Tool):
         self.bin = BinaryDriver(self.ip["bin"])
         self.ip_file = File(
             os.path.join(self.get_db("internal.job_dir"), "ip.tcl"), "#")
+        # Per block generation: output dir for ip and run dir per block
+        self.ip_dir = os.path.join(self.get_db("internal.job_dir"), "ip")
+        self.run_dir = os.path.join(self.get_db("internal.job_dir"), "ip_runs")
+        self.pending = []
+        # Blocks with properties equal to their catalog default removed
+        self.blocks = dict(self.ip["blocks"])
+        # Blocks without catalog entry, their properties are dumped by vivado
+        self.catalog_dir = os.path.join(self.get_db("internal.job_dir"), "ip_catalog")
+        self.uncataloged = set()
 
     def steps(self) -> List[Callable[[], None]]:
-        return [self.render_ip_tcl, self.run_vivado]
+        return [self.check_blocks, self.render_ip_tcl, self.run_vivado,
+                self.harvest_catalog, self.record_history]
+
+    def catalog_db(self):
+        """Path of the ip property catalog if enabled, otherwise None"""
+        cfg = self.ip["catalog"]
+        if not cfg["enabled"]:
+            return None
+        return cfg.get("db") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "ip_catalog.sqlite")
+
+    def catalog_files(self, name):
+        """report_property and legal value files of a block written by vivado"""
+        return (os.path.join(self.catalog_dir, f"{name}.rpt"),
+                os.path.join(self.catalog_dir, f"{name}.values"))
+
+    def check_blocks(self):
+        """Validates block properties against the ip catalog before vivado runs
+
+        Unknown properties and values not of a numeric property's type raise
+        ToolError for all blocks at once. Read-only properties and values
+        outside the legal values are only warnings, as both are harvested
+        from the default configuration and may depend on other properties.
+        Properties equal to their default are dropped (if drop_defaults).
+        Blocks whose vlnv/part is not in the catalog yet are catalogued by
+        this run.
+        """
+        db = self.catalog_db()
+        if db is None:
+            return
+        os.makedirs(os.path.dirname(db), exist_ok=True)
+        errors, dropped = [], 0
+        with IPCatalog(db) as catalog:
+            for name, block in self.ip["blocks"].items():
+                entry = catalog.get(block["vlnv"], self.ip["part"])
+                if entry is None:
+                    self.uncataloged.add(name)
+                    for f in self.catalog_files(name):
+                        if os.path.isfile(f):
+                            os.remove(f)
+                    continue
+                errors += [f"{name}: {e}" for e in validate(entry, block["properties"])]
+                for w in check_values(entry, block["properties"]):
+                    self.log(f"IP catalog: {name}: {w}", LogLevel.WARNING)
+                if self.ip["catalog"]["drop_defaults"]:
+                    kept, defaults = drop_defaults(entry, block["properties"])
+                    self.blocks[name] = dict(block, properties=kept)
+                    dropped += len(defaults)
+        if errors:
+            raise ToolError("Invalid ip block properties:\n" + "\n".join(errors))
+        self.log(f"IP catalog: {len(self.blocks) - len(self.uncataloged)} of {len(self.blocks)} blocks validated, {dropped} default properties dropped")
+        if self.uncataloged:
+            self.log(f"IP catalog: no entry for {', '.join(sorted(self.uncataloged))} (catalogued by this run)")
+
+    def harvest_catalog(self):
+        """Stores property dumps of uncatalogued blocks in the ip catalog"""
+        db = self.catalog_db()
+        if db is None or not self.ip["execute"]:
+            return
+        with IPCatalog(db) as catalog:
+            for name in sorted(self.uncataloged):
+                report, values = self.catalog_files(name)
+                if not os.path.isfile(report):
+                    # Restored from build cache (not generated by this run)
+                    self.log(f"IP catalog: {name} not generated, not catalogued")
+                    continue
+                count = catalog.harvest(self.blocks[name]["vlnv"], self.ip["part"], report,
+                                        values if os.path.isfile(values) else None)
+                self.log(f"IP catalog: stored {count} properties of {self.blocks[name]['vlnv']}")
+
+    def pipeline_io(self):
+        """Files written by this tool for toolbox_xilinx_tools.pipeline
+
+        The generated .xci/.dcp files (read by implement). Blocks are fully
+        described by the configuration, which is the signature.
+        """
+        job_dir = self.get_db("internal.job_dir")
+        outputs = []
+        if self.ip["execute"]:
+            root = self.ip_dir if self.per_block() else job_dir
+            outputs = [os.path.join(root, "**", "*.xci")]
+        return {"inputs": [], "outputs": outputs, "signature": self.ip}
+
+    def per_block(self):
+        """True if blocks are generated (and cached) one vivado process each"""
+        return self.ip["parallel"]["enabled"] or self.ip["cache"]["enabled"]
+
+    def block_section(self, name, block, ip_dir=None):
+        """Section with tcl generating a single ip block"""
+        sec = Section(f"{name}: {block['vlnv']}", "#")
+        dir_opt = f" -dir {ip_dir}" if ip_dir else ""
+        sec.add_line(
+            f"create_ip -vlnv {block['vlnv']} -module_name {name}{dir_opt}")
+        if name in self.uncataloged:
+            os.makedirs(self.catalog_dir, exist_ok=True)
+            for line in dump_tcl(name, *self.catalog_files(name)).splitlines():
+                sec.add_line(line)
+        for prop in block["properties"]:
+            sec.add_line(
+                f"set_property CONFIG.{prop['name']} {prop['value']} [get_ips {name}]")
+        sec.add_line(f"generate_target all [get_ips {name}]")
+        sec.add_line(f"synth_ip [get_ips {name}]")
+        #sec.add_line(f"lsearch -all -inline [list_property [get_ips {name}]] CONFIG.*")
+        sec.add_line(f"report_property [get_ips {name}]")
+        return sec
+
+    def block_key(self, block):
+        """Cache key of a block: vlnv, properties (sorted by name) and part"""
+        props = sorted((p["name"], str(p["value"])) for p in block["properties"])
+        return hash_inputs(extra={"vlnv": block["vlnv"],
+                                  "properties": props,
+                                  "part": self.ip["part"]})
+
+    def build_cache(self):
+        """Returns per block ip cache if enabled, otherwise None"""
+        cfg = self.ip["cache"]
+        if not cfg["enabled"]:
+            return None
+        cache_dir = cfg.get("dir") or os.path.join(
+            self.get_db("internal.work_dir"), "build", "cache", "ip")
+        max_size = cfg.get("max_size_gb")
+        return BuildCache(cache_dir,
+                          max_entries=cfg.get("max_entries"),
+                          max_size=None if max_size is None else int(max_size * 1e9))
+
+    def render_block_tcl(self):
+        """Restores cached blocks and generates one tcl file per remaining block"""
+        cache = self.build_cache()
+        self.pending = []
+        for name, block in self.blocks.items():
+            key = self.block_key(block)
+            if cache and cache.restore(key, self.ip_dir):
+                self.log(f"IP {name}: restored from cache ({key[:12]})")
+                continue
+            run_dir = os.path.join(self.run_dir, name)
+            os.makedirs(run_dir, exist_ok=True)
+            block_file = File(os.path.join(run_dir, "ip.tcl"), "#")
+            block_file.add_line(f"set_part {self.ip['part']}")
+            block_file.add(self.block_section(name, block, self.ip_dir))
+            block_file.generate()
+            self.pending.append({"name": name, "key": key, "dir": run_dir,
+                                 "tcl": block_file.fpath})
+        if cache:
+            self.log(cache.report())
+        self.log(f"{len(self.pending)} of {len(self.ip['blocks'])} IP blocks to generate")
 
     def render_ip_tcl(self):
         """Generates tcl that will be passed to vivado"""
+        if self.per_block():
+            self.render_block_tcl()
+            return
         self.ip_file.add_line(f"set_part {self.ip['part']}")
-        for name, block in self.ip["blocks"].items():
-            sec = Section(f"{name}: {block['vlnv']}", "#")
-            self.ip_file.add(sec)
-            sec.add_line(
-                f"create_ip -vlnv {block['vlnv']} -module_name {name}")
-            for prop in block["properties"]:
-                sec.add_line(
-                    f"set_property CONFIG.{prop['name']} {prop['value']}")
-            sec.add_line(f"generate_target all [get_ips {name}]")
-            sec.add_line(f"synth_ip [get_ips {name}]")
-            #sec.add_line(f"lsearch -all -inline [list_property [get_ips {name}]] CONFIG.*")
-            sec.add_line(f"report_property [get_ips {name}]")
+        for name, block in self.blocks.items():
+            self.ip_file.add(self.block_section(name, block))
         if self.ip_file.generate():
             self.log(f"File generated: {self.ip_file.fpath}")
         else:
-            self.log(f"File not generated: {self.ip_file.fpath}",
-                     LogLevel.WARNING)
+            self.log(f"File up to date: {self.ip_file.fpath}")
+
+    def run_blocks(self):
+        """Generates pending blocks concurrently, each in its own vivado process
+
+        A failing block does not stop the others. Successful blocks are
+        stored in the cache. Raises ToolError listing failed blocks at the end.
+        """
+        cache = self.build_cache()
+        if self.ip["farm"]["enabled"]:
+            workers = self.ip["parallel"].get("max_workers") or \
+                max(get_farm(self.ip["farm"]).slots(), 1)
+        else:
+            workers = max_workers(self.ip["parallel"]["mem_per_block_gb"] * 1e9,
+                                  self.ip["parallel"].get("max_workers"))
+        if not self.ip["parallel"]["enabled"]:
+            workers = 1
+        self.log(f"Generating {len(self.pending)} IP blocks with {workers} concurrent vivado processes")
+
+        job_dir = self.get_db("internal.job_dir")
+
+        def generate(block):
+            if self.ip["farm"]["enabled"]:
+                name = block["name"]
+                run_dir = Path(block["dir"]).relative_to(job_dir).as_posix()
+                self.run_farm(name, cwd=run_dir,
+                              include=[f"{run_dir}/**", "ip", "ip_catalog"],
+                              artifacts=[f"{run_dir}/**", f"ip/{name}/**", f"ip_catalog/{name}.*"])
+            else:
+                with scheduled(self.ip["scheduler"]) as grant:
+                    vivado = BinaryDriver(self.ip["bin"])
+                    vivado.add_option("-mode", "batch")
+                    vivado.add_option("-source", vivado_source(block["tcl"], block["dir"], grant))
+                    if self.ip["monitor"]["enabled"]:
+                        run_monitored(vivado.get_execute_string(), block["dir"],
+                                      os.path.join(block["dir"], "stage_metrics.json"),
+                                      log=lambda msg: self.log(f"IP {block['name']}: {msg}"),
+                                      interval=self.ip["monitor"]["interval"],
+                                      echo=False)
+                    else:
+                        vivado.execute(directory=block["dir"])
+            if not os.path.isfile(os.path.join(self.ip_dir, block["name"], f"{block['name']}.dcp")):
+                raise ToolError(f"no checkpoint generated (see {block['dir']}/vivado.log)")
+
+        results = run_parallel(generate, self.pending, workers)
+        failed = []
+        for i, block in enumerate(self.pending):
+            error = results[i][1]
+            if error is not None:
+                failed.append(block["name"])
+                self.log(f"IP {block['name']}: failed: {error}", LogLevel.WARNING)
+                continue
+            self.log(f"IP {block['name']}: generated")
+            if cache:
+                cache.store(block["key"], self.ip_dir, [block["name"]])
+        if cache:
+            self.log(cache.report())
+        if failed:
+            raise ToolError(f"IP generation failed for: {', '.join(failed)}")
+
+    def record_history(self):
+        """Records block counts and stage metrics of this run in the build history"""
+        cfg = self.ip["history"]
+        if not cfg["enabled"] or not self.ip["execute"]:
+            return
+        job_dir = self.get_db("internal.job_dir")
+        work_dir = self.get_db("internal.work_dir")
+        db_path = cfg.get("db") or os.path.join(work_dir, "build", "history.sqlite")
+        metrics = {"ip.blocks": len(self.ip["blocks"])}
+        if self.per_block():
+            metrics["ip.generated"] = len(self.pending)
+            for block in self.pending:
+                fpath = os.path.join(block["dir"], "stage_metrics.json")
+                if os.path.isfile(fpath):
+                    block_metrics = stage_metrics(fpath, f"block.{block['name']}")
+                    metrics.update({k: v for k, v in block_metrics.items()
+                                    if not k.startswith("total.")})
+        elif os.path.isfile(os.path.join(job_dir, "stage_metrics.json")):
+            metrics.update(stage_metrics(os.path.join(job_dir, "stage_metrics.json")))
+        job = str(Path(job_dir).relative_to(work_dir))
+        with History(db_path) as hist:
+            run_id = hist.record("ip", job, metrics, git_revision(work_dir))
+            self.log(f"Recorded {len(metrics)} metrics as run {run_id} in {db_path}")
+            for r in hist.regressions("ip", job, cfg["window"], cfg["threshold"]):
+                self.log(
+                    f"Regression: {r['name']} = {r['value']} (previous {cfg['window']} runs: mean {r['mean']:.4g}, stdev {r['stdev']:.3g})",
+                    LogLevel.WARNING)
+
+    def run_farm(self, name, cwd=".", include=None, artifacts=None):
+        """Runs ip.tcl (in cwd below the job dir) with vivado on a build farm worker"""
+        job_dir = self.get_db("internal.job_dir")
+        vivado = BinaryDriver(self.ip["bin"])
+        vivado.add_option("-mode", "batch")
+        vivado.add_option("-source", "ip.tcl")
+        job = FarmJob(name, shlex.split(vivado.get_execute_string()), job_dir, cwd=cwd,
+                      include=include, artifacts=artifacts,
+                      log_file=os.path.join(job_dir, cwd, "farm.log"))
+        try:
+            result = get_farm(self.ip["farm"]).run(job)
+        except FarmError as e:
+            raise ToolError(f"Build farm: {e}")
+        self.log(f"IP {name}: build farm: {result}")
+        if not result.ok:
+            raise ToolError(f"Vivado exited with code {result.rc} on {result.worker} (see {os.path.join(cwd, 'vivado.log')})")
 
     def run_vivado(self):
         """Actually runs the vivado command"""
         if self.ip["execute"]:
-            # Add options
-            self.bin.add_option("-mode", "batch")
-            self.bin.add_option("-source", self.ip_file.fpath)
-            # Execute binary
-            self.log(self.bin.get_execute_string())
-            self.bin.execute(directory=self.get_db('internal.job_dir'))
+            job_dir = self.get_db('internal.job_dir')
+            if self.per_block():
+                self.run_blocks()
+                return
+            if self.ip["farm"]["enabled"]:
+                self.run_farm("ip", include=["ip.tcl", "ip_catalog"])
+            elif self.ip["server"]["enabled"]:
+                self.log(f"Submitting {self.ip_file.fpath} to persistent vivado worker")
+                result = submit(self.ip_file.fpath, job_dir,
+                                address=self.ip["server"].get("address"),
+                                command=[self.ip["bin"]] + VIVADO_COMMAND[1:],
+                                log_file=os.path.join(job_dir, "vivado.log"))
+                if not result.ok:
+                    raise ToolError(f"Vivado worker failed running {self.ip_file.fpath} (see vivado.log)")
+            else:
+                # Add options
+                with scheduled(self.ip["scheduler"]) as grant:
+                    self.bin.add_option("-mode", "batch")
+                    self.bin.add_option("-source", vivado_source(self.ip_file.fpath, job_dir, grant))
+                    # Execute binary
+                    self.log(self.bin.get_execute_string())
+                    if self.ip["monitor"]["enabled"]:
+                        rc = run_monitored(self.bin.get_execute_string(), job_dir,
+                                           os.path.join(job_dir, "stage_metrics.json"),
+                                           log=self.log,
+                                           interval=self.ip["monitor"]["interval"])
+                        if rc != 0:
+                            raise ToolError(f"Vivado exited with code {rc} (see vivado.log)")
+                    else:
+                        self.bin.execute(directory=job_dir)
             self.log(
                 f"Final implementation in => {Path(self.get_db('internal.job_dir')).relative_to(self.get_db('internal.work_dir'))}"
             )
@@ -8,48 +8,260 @@
 # attribute mark_debug_clock of X : signal is "inst1_bufg/clock";  -- Specifies clock net to use for capturing this net.  May create a new ILA core for that clock domain
 # attribute mark_debug_depth of X : signal is "4096";              -- overrides default depth for this ILA core. valid values: 1024, 2048, ... 132072.   Last attribute that is scanned will win.
 # attribute mark_debug_adv_trigger of X : signal is "true";        -- specifies that advanced trigger capability will be added to ILA core
+#
+# Netlist queries are issued over the whole debug net list (get_* -of_objects
+# on lists, get_property on lists) instead of once per net, so the number of
+# queries grows with the number of clock domains, not with the number of
+# debug nets. Only combinational drivers and cells with several clock pins
+# are traced per net.
+#
+# The bus => clock net map found is written to map_file together with key
+# (a digest identifying the post synthesis netlist). When called again with
+# the same key only buses missing from the map are traced.
 # Engineer:  J. McCluskey
-proc batch_insert_ila { depth } {
+
+######################################################################
+# Helpers without netlist access
+
+# Bus name and bit index (-1 for scalars) of a net name
+proc ila_bus_bit {net} {
+    if {[regexp {^(.*)\[([[:digit:]]+)\]$} $net -> name index]} {
+        return [list $name $index]
+    }
+    return [list $net -1]
+}
+
+# Capture depth rounded to a power of 2 in 1024 ... 131072
+proc ila_fix_depth {depth} {
+    if {$depth < 1024} {
+        return 1024
+    } elseif {$depth > 131072} {
+        return 131072
+    } elseif {$depth & ($depth - 1)} {
+        return [expr {1 << int(ceil(log($depth) / log(2)))}]
+    }
+    return $depth
+}
+
+# Bus => clock net dict stored in fpath for key (empty dict if missing or stale)
+proc ila_read_clock_map {fpath key} {
+    if {$fpath eq "" || ![file exists $fpath]} {
+        return {}
+    }
+    set fp [open $fpath r]
+    set file_key [gets $fp]
+    set data [read -nonewline $fp]
+    close $fp
+    if {$file_key ne $key || [catch {dict size $data}]} {
+        return {}
+    }
+    return $data
+}
+
+proc ila_write_clock_map {fpath key map} {
+    set fp [open $fpath w]
+    puts $fp $key
+    puts $fp $map
+    close $fp
+}
+
+######################################################################
+# Bulk netlist queries
+
+# Debug nets not attached to debug (VIO) cores, unless MARK_DEBUG_VALID is set
+proc ila_filter_vio {nets} {
+    set cores [get_cells -quiet -hierarchical -filter {IS_DEBUG_CORE}]
+    if {[llength $cores] == 0} {
+        return $nets
+    }
+    # Every segment of every net touching a debug core, in one query
+    foreach n [get_nets -quiet -segments -of_objects [get_pins -quiet -of_objects $cores]] {
+        set vio($n) 1
+    }
+    set keep {}
+    foreach n $nets valid [get_property -quiet MARK_DEBUG_VALID $nets] {
+        if {$valid eq "true" || ![info exists vio($n)]} {
+            lappend keep $n
+        }
+    }
+    return $keep
+}
+
+# Root clock net (clock buffer output) of each net in nets as dict
+proc ila_clock_roots {nets} {
+    set roots {}
+    if {[llength $nets] == 0} {
+        return $roots
+    }
+    set segments [get_nets -quiet -segments $nets]
+    foreach n $segments p [get_property -quiet PARENT $segments] {
+        dict lappend by_parent $p $n
+    }
+    foreach {p segs} $by_parent {
+        set root [lindex [get_nets -quiet -of_objects \
+            [get_pins -quiet -leaf -filter {DIRECTION == OUT} -of_objects [lindex $segs 0]]] 0]
+        foreach n $segs {
+            dict set roots $n $root
+        }
+    }
+    return $roots
+}
+
+# Leaf driver pin of each net as dict (nets without a single driver are left out)
+proc ila_driver_pins {nets} {
+    set drivers [get_pins -quiet -leaf -filter {DIRECTION == OUT} -of_objects $nets]
+    if {[llength $drivers] == [llength $nets]} {
+        # One driver per net: the drivers come back in net order, which is
+        # confirmed by mapping them back to their (parent) nets
+        set back [get_nets -quiet -of_objects $drivers]
+        if {[get_property -quiet PARENT $back] eq [get_property -quiet PARENT $nets]} {
+            set result {}
+            foreach n $nets d $drivers {
+                dict set result $n $d
+            }
+            return $result
+        }
+    }
+    set result {}
+    foreach n $nets {
+        set d [get_pins -quiet -leaf -filter {DIRECTION == OUT} -of_objects $n]
+        if {[llength $d] == 1} {
+            dict set result $n [lindex $d 0]
+        }
+    }
+    return $result
+}
+
+# Clock net capturing each net as dict, traced backwards via the driver
+proc ila_trace_clocks {nets} {
+    set clocks {}
+    if {[llength $nets] == 0} {
+        return $clocks
+    }
+    set drivers [ila_driver_pins $nets]
+    foreach n $nets {
+        if {![dict exists $drivers $n]} {
+            puts "Critical Warning: from batch_insert_ila.tcl    Can't find a single driver of net $n"
+        }
+    }
+    set pins [dict values $drivers]
+    if {[llength $pins] == 0} {
+        return $clocks
+    }
+    # Driver cells, whether they are sequential and their clock pins
+    set cells [get_cells -quiet -of_objects $pins]
+    set seq_cells {}
+    foreach c $cells s [get_property -quiet IS_SEQUENTIAL $cells] {
+        if {$s == 1} {
+            lappend seq_cells $c
+        }
+    }
+    set cell_clock_pins {}
+    if {[llength $seq_cells] > 0} {
+        set clk_pins [get_pins -quiet -leaf -filter {IS_CLOCK} -of_objects $seq_cells]
+        foreach p $clk_pins c [get_property -quiet PARENT_CELL $clk_pins] {
+            dict lappend cell_clock_pins $c $p
+        }
+    }
+    # Clock pin of every net
+    set clock_pin {}
+    foreach n [dict keys $drivers] c [get_property -quiet PARENT_CELL $pins] {
+        set d [dict get $drivers $n]
+        if {[dict exists $cell_clock_pins $c]} {
+            set cps [dict get $cell_clock_pins $c]
+            if {[llength $cps] > 1} {
+                # Several clocks (e.g. block ram ports): the one timing the driver pin
+                set timing_arc [get_timing_arcs -quiet -to $d]
+                set cps [get_pins -quiet -filter {IS_CLOCK} [get_property -quiet FROM_PIN $timing_arc]]
+                if {[llength $cps] != 1} {
+                    puts "Error: in batch_insert_ila. Found [llength $cps] clock pins in driver cell $c with timing arc $timing_arc for net $n"
+                    continue
+                }
+            }
+            dict set clock_pin $n [lindex $cps 0]
+        } else {
+            # our driver cell is a LUT or LUTMEM in combinatorial mode, we need to trace further.
+            set paths [get_timing_paths -quiet -through $d]
+            if {[llength $paths] > 0} {
+                # note that here we arbitrarily select the start point of the FIRST timing path... there might be multiple clocks with timing paths for this net.
+                # use MARK_DEBUG_CLOCK to specify another clock in this case.
+                set start [get_pins -quiet [get_property -quiet STARTPOINT_PIN [lindex $paths 0]]]
+            } else {
+                set start {}
+            }
+            if {[llength $start] == 0} {
+                # Can't find any timing path, so skip the net, and warn the user.
+                puts "Critical Warning: from batch_insert_ila.tcl    Can't trace any clock domain on driver of net $n"
+                puts "Please attach the attribute MARK_DEBUG_CLOCK with a string containing the net name of the desired sampling clock, .i.e."
+                puts "attribute mark_debug_clock of $n : signal is \"inst_bufg/clk\";"
+                continue
+            }
+            dict set clock_pin $n [lindex $start 0]
+        }
+    }
+    if {[dict size $clock_pin] == 0} {
+        return $clocks
+    }
+    # Nets at all clock pins in one query, then one root lookup per clock net
+    set cps [lsort -unique [dict values $clock_pin]]
+    set cp_nets [get_nets -quiet -of_objects $cps]
+    set roots [ila_clock_roots $cp_nets]
+    set pin_root {}
+    foreach {seg root} $roots {
+        if {[info exists seen($root)]} {
+            continue
+        }
+        set seen($root) 1
+        foreach p [get_pins -quiet -leaf -filter {IS_CLOCK} -of_objects $seg] {
+            dict set pin_root $p $root
+        }
+    }
+    dict for {n p} $clock_pin {
+        if {[dict exists $pin_root $p]} {
+            dict set clocks $n [dict get $pin_root $p]
+        } else {
+            puts "Critical Warning: from batch_insert_ila.tcl    Can't find clock net at $p for net $n"
+        }
+    }
+    return $clocks
+}
+
+######################################################################
+proc batch_insert_ila { depth {key ""} {map_file ""} } {
     ##################################################################
     # sequence through debug nets and organize them by clock in the
     # clock_list array. Also create max and min array for bus indices
-    set dbgs [get_nets -hierarchical -filter {MARK_DEBUG}]
+    set dbgs [get_nets -quiet -hierarchical -filter {MARK_DEBUG}]
     if {[llength $dbgs] == 0} {
         puts "No nets have the MARK_DEBUG attribute.  No ILA cores created"
         return
-    } else {
-    #process list of nets to find and reject nets that are attached to VIO cores.  This has a side effect that VIO nets can't be monitored with an ILA
-    # This can be overridden by using the attribute "mark_debug_valid" = "true" on a net like this.
+    }
+    # Segments of one net marked more than once are probed once
     set net_list {}
-        foreach net $dbgs {
-            if { [get_property -quiet MARK_DEBUG_VALID $net] != "true" } { 
-                set pin_list [get_pins -of_objects [get_nets -segments $net]]
-                set not_vio_net 1
-                foreach pin $pin_list {
-                    if { [get_property IS_DEBUG_CORE [get_cells -of_object $pin]] == 1 } {
-                        # It seems this net is attached to a debug core (i.e. VIO core) already, so we should skip adding it to the netlist
-                        set not_vio_net 0
-                        break
-                        }
-                    }
-                if { $not_vio_net == 1 } { lappend net_list $net; }
-            } else { 
-                lappend net_list $net
-            }
+    foreach d $dbgs p [get_property -quiet PARENT $dbgs] {
+        if {![info exists parent_seen($p)]} {
+            set parent_seen($p) 1
+            lappend net_list $d
         }
     }
+    #process list of nets to find and reject nets that are attached to VIO cores.  This has a side effect that VIO nets can't be monitored with an ILA
+    # This can be overridden by using the attribute "mark_debug_valid" = "true" on a net like this.
+    set net_list [ila_filter_vio $net_list]
     # check again to see if we have any nets left now
     if {[llength $net_list] == 0} {
         puts "All nets with MARK_DEBUG are already connected to VIO cores.  No ILA cores created"
         return
     }
-    # Now that the netlist has been filtered,  determine bus names and clock domains
-    foreach d $net_list {
+    # Now that the netlist has been filtered,  determine bus names and index ranges
+    set attrs {}
+    foreach d $net_list \
+            clk_attr [get_property -quiet MARK_DEBUG_CLOCK $net_list] \
+            depth_attr [get_property -quiet MARK_DEBUG_DEPTH $net_list] \
+            trigger_attr [get_property -quiet MARK_DEBUG_ADV_TRIGGER $net_list] {
         # name is root name of a bus, index is the bit index in the
         # bus
-        set name [regsub {\[[[:digit:]]+\]$} $d {}]
-        set index [regsub {^.*\[([[:digit:]]+)\]$} $d {\1}]
-        if {[string is integer -strict $index]} {
+        lassign [ila_bus_bit $d] name index
+        if {$index >= 0} {
             if {![info exists max($name)]} {
                 set max($name) $index
                 set min($name) $index
@@ -61,65 +273,86 @@ proc batch_insert_ila { depth } {
         } else {
             set max($name) -1
         }
-        # Now we search for the local clock net associated with the target net.  There may be ambiguities or no answer in some cases
-        if {![info exists clocks($name)]} {
-            # does MARK_DEBUG_CLOCK decorate this net?   If not, then search backwards to the driver cell
-            set clk_name [get_property -quiet MARK_DEBUG_CLOCK $d]
-            if {  [llength $clk_name] == 0 } {
-                # trace to the clock net, tracing backwards via the driver pin.
-                set driver_pin [get_pins -filter {DIRECTION == "OUT" && IS_LEAF == TRUE } -of_objects [ get_nets -segments $d ]]
-                set driver_cell [get_cells -of_objects $driver_pin]
-                if { [get_property IS_SEQUENTIAL $driver_cell] == 1 } { 
-                    set timing_arc [get_timing_arcs -to $driver_pin]
-                    set cell_clock_pin [get_pins -filter {IS_CLOCK} [get_property FROM_PIN $timing_arc]]
-                    if { [llength $cell_clock_pin] > 1 } { 
-                        puts "Error: in batch_insert_ila. Found more than 1 clock pin in driver cell $driver_cell with timing arc $timing_arc for net $d" 
-                        continue 
-                        }
-                } else { 
-                    # our driver cell is a LUT or LUTMEM in combinatorial mode, we need to trace further.
-                    set paths [get_timing_paths -quiet -through $driver_pin ]
-                    if { [llength $paths] > 0 } {
-                        # note that here we arbitrarily select the start point of the FIRST timing path... there might be multiple clocks with timing paths for this net.
-                        # use MARK_DEBUG_CLOCK to specify another clock in this case.
-                        set cell_clock_pin [get_pins [get_property STARTPOINT_PIN [lindex $paths 0]]]  
-                    } else { 
-                        # Can't find any timing path, so skip the net, and warn the user.                    
-                        puts "Critical Warning: from batch_insert_ila.tcl    Can't trace any clock domain on driver of net $d"
-                        puts "Please attach the attribute MARK_DEBUG_CLOCK with a string containing the net name of the desired sampling clock, .i.e."
-                        puts "attribute mark_debug_clock of $d : signal is \"inst_bufg/clk\";"
-                        continue
-                    }
-                }   
-                # clk_net will usually be a list of net segments, which needs filtering to determine the net connected to the driver pin
-                set clk_net [get_nets -segments -of_objects $cell_clock_pin]
-            } else {
-                set clk_net [get_nets -segments $clk_name]
-                if { [llength $clk_net] == 0 } { puts "MARK_DEBUG_CLOCK attribute on net $d does not match any known net.  Please fix."; continue; }
-            }    
-            # trace forward to net actually connected to clock buffer output, not any of the lower level segment names
-            set clocks($name) [get_nets -of_objects [get_pins -filter {DIRECTION == "OUT" && IS_LEAF == TRUE } -of_objects $clk_net]]
-            if {![info exists clock_list($clocks($name))]} {
-              # found a new clock
-              puts "New clock found is $clocks($name)"
-              set clock_list($clocks($name)) [list $name]
-              set ila_depth($clocks($name)) $depth
-              set ila_adv_trigger($clocks($name)) false
-            } else {
-              lappend clock_list($clocks($name)) $name
-            }
-            # Does this net have a "MARK_DEBUG_DEPTH" attribute attached?
-            set clk_depth [get_property -quiet MARK_DEBUG_DEPTH $d]
-            if { [llength $clk_depth] != 0 } {
-                set ila_depth($clocks($name)) $clk_depth
+        # The first bit of a bus determines its clock domain and attributes
+        if {![dict exists $attrs $name]} {
+            dict set attrs $name [list $d $clk_attr $depth_attr $trigger_attr]
+        }
+    }
+    ##################################################################
+    # clock net of every bus: MARK_DEBUG_CLOCK, clock map of a previous
+    # run on the same netlist, or traced backwards from the driver
+    set cached [ila_read_clock_map $map_file $key]
+    if {[dict size $cached] > 0} {
+        # Drop the map if any of its clock nets vanished
+        set cached_clocks [lsort -unique [dict values $cached]]
+        if {[llength [get_nets -quiet $cached_clocks]] != [llength $cached_clocks]} {
+            puts "Clock map $map_file does not match the netlist, tracing all nets"
+            set cached {}
+        }
+    }
+    set bus_clock {}
+    set attr_clocks {}
+    set trace {}
+    dict for {name a} $attrs {
+        lassign $a d clk_name
+        if {[llength $clk_name] != 0} {
+            dict lappend attr_clocks $clk_name $name
+        } elseif {[dict exists $cached $name]} {
+            dict set bus_clock $name [dict get $cached $name]
+        } else {
+            lappend trace $d
+            set trace_bus($d) $name
+        }
+    }
+    set n_cached [dict size $bus_clock]
+    # MARK_DEBUG_CLOCK: trace forward to net actually connected to clock buffer output, not any of the lower level segment names
+    if {[dict size $attr_clocks] > 0} {
+        set roots [ila_clock_roots [dict keys $attr_clocks]]
+        dict for {clk_name names} $attr_clocks {
+            if {![dict exists $roots $clk_name]} {
+                puts "MARK_DEBUG_CLOCK attribute on net(s) $names does not match any known net ($clk_name).  Please fix."
+                continue
             }
-            # Does this net have a "MARK_DEBUG_ADV_TRIGGER" attribute attached?
-            set trigger [get_property -quiet MARK_DEBUG_ADV_TRIGGER $d]
-            if { $trigger == "true" } {
-                set ila_adv_trigger($clocks($name)) true
+            foreach name $names {
+                dict set bus_clock $name [dict get $roots $clk_name]
             }
         }
     }
+    set traced [ila_trace_clocks $trace]
+    dict for {d clk} $traced {
+        dict set bus_clock $trace_bus($d) $clk
+        dict set cached $trace_bus($d) $clk
+    }
+    puts "ILA clock domains: [dict size $bus_clock] buses, $n_cached from clock map, [dict size $traced] traced"
+    if {$map_file ne "" && [dict size $traced] > 0} {
+        ila_write_clock_map $map_file $key $cached
+    }
+    ##################################################################
+    # group buses by clock
+    dict for {name clk} $bus_clock {
+        lassign [dict get $attrs $name] d clk_name clk_depth trigger
+        if {![info exists clock_list($clk)]} {
+            # found a new clock
+            puts "New clock found is $clk"
+            set clock_list($clk) [list $name]
+            set ila_depth($clk) $depth
+            set ila_adv_trigger($clk) false
+        } else {
+            lappend clock_list($clk) $name
+        }
+        # Does this net have a "MARK_DEBUG_DEPTH" attribute attached?
+        if { [llength $clk_depth] != 0 } {
+            set ila_depth($clk) $clk_depth
+        }
+        # Does this net have a "MARK_DEBUG_ADV_TRIGGER" attribute attached?
+        if { $trigger == "true" } {
+            set ila_adv_trigger($clk) true
+        }
+    }
+    if {![array exists clock_list]} {
+        puts "No clock domain found for any MARK_DEBUG net.  No ILA cores created"
+        return
+    }
     set ila_count 0
     set trig_out ""
     set trig_out_ack ""
@@ -130,23 +363,15 @@ proc batch_insert_ila { depth } {
     }
     foreach c [array names clock_list] {
         # Now build and connect an ILA core for each clock domain
-        [incr ila_count ]
+        incr ila_count
         set ila_inst "ila_$ila_count"
         ##################################################################
         # first verify if depth is a member of the set, 1024, 2048, 4096, 8192, ... 131072
-        if { $ila_depth($c) < 1024 || [expr $ila_depth($c) & ($ila_depth($c) - 1)] || $ila_depth($c) > 131072 } {
-            # Depth is not right...  lets fix it, and continue
-            if { $ila_depth($c) < 1024 } {
-                set new_depth 1024
-            } elseif { $ila_depth($c) > 131072 } {
-                set new_depth 131072
-            } else { 
-                # round value to next highest power of 2, (in log space)
-                set new_depth [expr 1 << int( log($ila_depth($c))/log(2) + .9999 )]
-            }
+        set new_depth [ila_fix_depth $ila_depth($c)]
+        if { $new_depth != $ila_depth($c) } {
             puts "Can't create ILA core $ila_inst with depth of $ila_depth($c)!  Changed capture depth to $new_depth"
             set ila_depth($c) $new_depth
-        }    
+        }
         # create ILA and connect its clock
         puts "Creating ILA $ila_inst with capture depth $ila_depth($c) and advanced trigger = $ila_adv_trigger($c)"
         if { [expr [string range [version -short] 0 3] < 2014] } {
@@ -162,7 +387,7 @@ proc batch_insert_ila { depth } {
         set_property    C_INPUT_PIPE_STAGES 1 [get_debug_cores $ila_inst]
         set_property    C_EN_STRG_QUAL true [get_debug_cores $ila_inst]
         set_property    ALL_PROBE_SAME_MU true [get_debug_cores $ila_inst]
-        set_property    ALL_PROBE_SAME_MU_CNT $mu_cnt [get_debug_cores $ila_inst]    
+        set_property    ALL_PROBE_SAME_MU_CNT $mu_cnt [get_debug_cores $ila_inst]
         set_property    port_width 1     [get_debug_ports $ila_inst/clk]
         connect_debug_port $ila_inst/clk    $c
         # hookup trigger ports in a circle if more than one ILA is created
@@ -176,14 +401,14 @@ proc batch_insert_ila { depth } {
             }
             if { $trig_out_ack != "" } {
                 connect_debug_port $ila_inst/trig_in_ack [get_nets $trig_out_ack]
-            }   
+            }
             set trig_out ${ila_inst}_trig_out_$ila_count
             create_net $trig_out
-            connect_debug_port  $ila_inst/trig_out [get_nets $trig_out] 
+            connect_debug_port  $ila_inst/trig_out [get_nets $trig_out]
             set trig_out_ack ${ila_inst}_trig_out_ack_$ila_count
             create_net $trig_out_ack
-            connect_debug_port  $ila_inst/trig_out_ack [get_nets $trig_out_ack] 
-        }   
+            connect_debug_port  $ila_inst/trig_out_ack [get_nets $trig_out_ack]
+        }
         ##################################################################
         # add probes
         set nprobes 0
@@ -194,7 +419,7 @@ proc batch_insert_ila { depth } {
             } else {
                 # n is a bus name
                 for {set i $min($n)} {$i <= $max($n)} {incr i} {
-                    lappend nets [get_nets $n[$i]]
+                    lappend nets [get_nets "$n\[$i\]"]
                 }
             }
             set prb probe$nprobes
@@ -210,16 +435,15 @@ proc batch_insert_ila { depth } {
     if { $enable_trigger == true } {
         connect_debug_port ila_1/trig_in [get_nets $trig_out]
         connect_debug_port ila_1/trig_in_ack [get_nets $trig_out_ack]
-    } 
-    set project_found [get_projects -quiet] 
-    if { $project_found != "New Project" } {
+    }
+    set project_found [get_projects -quiet]
+    if { $project_found != "New Project" && $project_found != "" } {
         puts "Saving constraints now in project [current_project -quiet]"
         save_constraints_as debug_constraints.xdc
-    }    
+    }
     ##################################################################
     implement_debug_core
     ##################################################################
     # write out probe info file
     write_debug_probes -force debug_nets.ltx
 }
-
@@ -7,6 +7,9 @@
 
 # Imports - standard library
 import os
+import json
+import time
+import shlex
 from typing import Callable, List
 from jinja2 import StrictUndefined, Environment, FileSystemLoader
 
@@ -18,6 +21,14 @@ from toolbox.utils import *
 
 # Imports - local source
 from jinja_tool import JinjaTool
+from toolbox_xilinx_tools.hdl_deps import DependencyGraph
+from toolbox_xilinx_tools.build_cache import hash_inputs
+from toolbox_xilinx_tools.jobs import max_workers, run_parallel
+from toolbox_xilinx_tools.scheduler import scheduled
+from toolbox_xilinx_tools.farm import FarmJob, FarmError, get_farm
+from toolbox_xilinx_tools.waves import export_vcd
+from toolbox_xilinx_tools.regression import expand_runs, check_log, write_summary, \
+    run_snapshot
 
 
 class XsimTool(Tool):
@@ -26,48 +37,277 @@ class XsimTool(Tool):
         super(XsimTool, self).__init__(db, log)
         # Create binary driver
         self.sim = self.get_db(self.get_namespace("XsimTool"))
+        self.state_file = os.path.join(self.get_db("internal.job_dir"),
+                                       "xsim.dir", "incremental.json")
+        self.state = {"units": {}, "elab": None}
+        self.fingerprints = {}
+        self.recompiled = True
 
     def steps(self) -> List[Callable[[], None]]:
         return [self.parse_files, self.elaborate_design, self.simulate_design]
 
+    def pipeline_io(self):
+        """Files read by this tool for toolbox_xilinx_tools.pipeline
+
+        All sources (e.g. a post implementation netlist written by implement)
+        and include dirs. Simulation results are not cached, so simulate
+        always runs once its inputs are up to date (compilation itself is
+        incremental).
+        """
+        inputs = [f for files in self.source_libraries().values() for f in files]
+        return {"inputs": inputs + [str(d) for d in self.sim["include_dirs"]],
+                "outputs": [], "always": True}
+
+    def source_libraries(self):
+        """Library name => source files (work holds packages, test and rtl)"""
+        libs = {"work": self.sim["packages"] + self.sim["test"] + self.sim["rtl"]}
+        libs.update(self.sim["libraries"])
+        return {lib: [str(Path(f).resolve()) for f in files] for lib, files in libs.items()}
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        with open(self.state_file, "w") as fp:
+            json.dump(self.state, fp, indent=2)
+
+    @staticmethod
+    def log_errors(log_file):
+        """ERROR lines of an xvlog/xelab log (missing log counts as error)"""
+        if not os.path.isfile(log_file):
+            return [f"ERROR: {log_file} not written"]
+        with open(log_file, errors="replace") as fp:
+            return [l.strip() for l in fp if l.startswith("ERROR:")]
+
     def parse_files(self):
-        """Parsing design files with xvhdl and xvlog"""
-        vlog_bin = BinaryDriver("xvlog")
-        #vlog_bin.add_option("-verbose", 2)
-        #if self.sim["include_uvm"]:
-        #    vlog_bin.add_option("-lib UVM")
-        if self.sim["verilog_version"] == "sv":
-            vlog_bin.add_option("-sv")
-        for f in self.sim["defines"]:
-            vlog_bin.add_option(f"{Path(f).resolve()}")
-        for f in self.sim["packages"]:
-            vlog_bin.add_option(f"{Path(f).resolve()}")
-        for f in self.sim["test"]:
-            vlog_bin.add_option(f"{Path(f).resolve()}")
-        for f in self.sim["rtl"]:
-            vlog_bin.add_option(f"{Path(f).resolve()}")
-        for d in self.sim["include_dirs"]:
-            vlog_bin.add_option("-include", f"{Path(d).resolve()}")
-        # Execute
-        self.log(vlog_bin.get_execute_string())
+        """Parsing design files with xvlog, only units whose inputs changed
+
+        Every file is a compilation unit with a fingerprint of its content,
+        includes, defines, options and the packages it imports, so a changed
+        package also re-parses every importer. Libraries are compiled in
+        parallel once the libraries they import from are compiled.
+        """
         exec_dir = self.get_db('internal.job_dir')
-        vlog_bin.execute(directory=exec_dir)
+        libs = self.source_libraries()
+        lib_of = {f: lib for lib, files in libs.items() for f in files}
+        graph = DependencyGraph(list(lib_of), self.sim["include_dirs"])
+        options = {"sv": self.sim["verilog_version"],
+                   "include_dirs": [str(Path(d).resolve()) for d in self.sim["include_dirs"]],
+                   "defines": hash_inputs(self.sim["defines"]),
+                   "libraries": {f: lib for f, lib in lib_of.items()}}
+        self.fingerprints = graph.fingerprints(json.dumps(options, sort_keys=True))
+        if os.path.isfile(self.state_file):
+            with open(self.state_file) as fp:
+                self.state = json.load(fp)
+        changed = {lib: [f for f in graph.order(files)
+                         if self.state["units"].get(f) != self.fingerprints[f]]
+                   for lib, files in libs.items()}
+        lib_deps = {lib: {lib_of[d] for f in files for d in graph.deps[f]} - {lib}
+                    for lib, files in libs.items()}
+        self.recompiled = any(changed.values()) or \
+            set(self.state["units"]) != set(self.fingerprints)
+        self.log(f"{sum(len(c) for c in changed.values())} of {len(lib_of)} compilation units changed")
+
+        def compile_lib(lib):
+            vlog_bin = BinaryDriver("xvlog")
+            #vlog_bin.add_option("-verbose", 2)
+            #if self.sim["include_uvm"]:
+            #    vlog_bin.add_option("-lib UVM")
+            if self.sim["verilog_version"] == "sv":
+                vlog_bin.add_option("-sv")
+            vlog_bin.add_option("-work", lib)
+            for dep in sorted(lib_deps[lib]):
+                vlog_bin.add_option("-L", dep)
+            for f in self.sim["defines"]:
+                vlog_bin.add_option(f"{Path(f).resolve()}")
+            for f in changed[lib]:
+                vlog_bin.add_option(f)
+            for d in self.sim["include_dirs"]:
+                vlog_bin.add_option("-include", f"{Path(d).resolve()}")
+            log_file = os.path.join(exec_dir, f"xvlog_{lib}.log")
+            vlog_bin.add_option("-log", log_file)
+            # Execute
+            with scheduled(self.sim["scheduler"], cpus=1):
+                self.log(vlog_bin.get_execute_string())
+                vlog_bin.execute(directory=exec_dir)
+            errors = self.log_errors(log_file)
+            if errors:
+                raise ToolError("\n".join(errors))
+
+        # Compile libraries level by level (a library waits for its imports)
+        done, failed = set(), set()
+        remaining = set(libs)
+        while remaining:
+            ready = sorted(l for l in remaining if lib_deps[l] <= done | failed)
+            if not ready:
+                ready = sorted(remaining)  # cyclic imports, compile anyway
+            blocked = [l for l in ready if lib_deps[l] & failed]
+            todo = [l for l in ready if changed[l] and l not in blocked]
+            results = run_parallel(compile_lib, todo, max_workers(limit=len(todo) or 1))
+            for i, lib in enumerate(todo):
+                if results[i][1] is not None:
+                    failed.add(lib)
+                    self.log(f"xvlog failed for library {lib}:\n{results[i][1]}", LogLevel.WARNING)
+                else:
+                    for f in changed[lib]:
+                        self.state["units"][f] = self.fingerprints[f]
+            failed.update(blocked)
+            done.update(l for l in ready if l not in failed)
+            remaining -= set(ready)
+        # Forget units that are no longer part of the design
+        self.state["units"] = {f: fp for f, fp in self.state["units"].items()
+                               if f in self.fingerprints}
+        self.save_state()
+        if failed:
+            raise ToolError(f"Parsing failed for libraries: {', '.join(sorted(failed))}")
 
     def elaborate_design(self):
-        """Elaborate design with xelab"""
+        """Elaborate design with xelab (skipped if snapshot is still valid)"""
+        exec_dir = self.get_db('internal.job_dir')
         elab_bin = BinaryDriver("xelab")
         elab_bin.add_option(f"work.{self.sim['testbench']}")
         elab_bin.add_option("-snapshot", self.sim['testbench'])
-        elab_bin.add_option("-debug", "all")
+        # Regressions run headless and only need debug visibility to record waves
+        waves = self.sim["waves"]
+        debug = waves["debug"]
+        if self.sim["regression"]["enabled"] and not waves["regression"]:
+            debug = "off"
+        elif self.sim["regression"]["enabled"] and debug == "off":
+            raise ToolError("waves.regression records waves, which needs waves.debug typical or all")
+        if debug != "off":
+            elab_bin.add_option("-debug", debug)
+        for lib in sorted(self.sim["libraries"]):
+            elab_bin.add_option("-L", lib)
         #if self.sim["include_uvm"]:
         #    elab_bin.add_option("-lib UVM")
-        # Execute
-        self.log(elab_bin.get_execute_string())
+        elab_fp = hash_inputs(extra={"cmd": elab_bin.get_execute_string(),
+                                     "units": self.fingerprints})
+        snapshot = os.path.join(exec_dir, "xsim.dir", self.sim['testbench'])
+        if not self.recompiled and self.state.get("elab") == elab_fp and \
+                os.path.isdir(snapshot):
+            self.log(f"Snapshot {self.sim['testbench']} up to date. Elaboration skipped.")
+            return
+        log_file = os.path.join(exec_dir, "xelab.log")
+        elab_bin.add_option("-log", log_file)
+        with scheduled(self.sim["scheduler"]) as grant:
+            if grant is not None:
+                # xelab -mt takes auto, off or a number of threads > 1
+                elab_bin.add_option("-mt", grant.cpus if grant.cpus > 1 else "off")
+            # Execute
+            self.log(elab_bin.get_execute_string())
+            elab_bin.execute(directory=exec_dir)
+        errors = self.log_errors(log_file)
+        if errors:
+            self.state["elab"] = None
+            self.save_state()
+            raise ToolError("Elaboration failed:\n" + "\n".join(errors))
+        self.state["elab"] = elab_fp
+        self.save_state()
+
+    def write_waves_tcl(self, fpath, vcd=False):
+        """Writes xsim tcl recording waves.scopes (default the testbench) to the wdb
+
+        With vcd the scopes are recorded to waves.vcd instead and the
+        simulation runs to the end.
+        """
+        scopes = self.sim["waves"]["scopes"] or [f"/{self.sim['testbench']}"]
+        with open(fpath, "w") as fp:
+            if vcd:
+                fp.write("open_vcd waves.vcd\n")
+                for scope in scopes:
+                    fp.write(f"log_vcd -level 0 {{{scope}}}\n")
+                fp.write("run -all\nclose_vcd\nquit\n")
+            else:
+                for scope in scopes:
+                    fp.write(f"log_wave -recursive {{{scope}}}\n")
+
+    def export_waves(self, run_dir):
+        """Exports waves.vcd of a run to columnar arrays in waves/ (None if no vcd written)"""
+        vcd = os.path.join(run_dir, "waves.vcd")
+        if not os.path.isfile(vcd):
+            return None
+        out_dir = os.path.join(run_dir, "waves")
+        index = export_vcd(vcd, out_dir)
+        if not self.sim["waves"]["keep_vcd"]:
+            os.remove(vcd)
+        self.log(f"Exported {len(index['signals'])} signals of {vcd} to {out_dir}")
+        return out_dir
+
+    def run_regression(self):
+        """Runs one headless xsim per regression run concurrently
+
+        All runs share the elaborated snapshot, each in its own xsim.dir
+        below regression/<name> (see regression.run_snapshot). Pass/fail is
+        taken from each run's log and summarized in regression.json and
+        regression.xml (JUnit). With farm enabled the runs are spread over
+        the build farm workers instead.
+        """
+        reg = self.sim["regression"]
         exec_dir = self.get_db('internal.job_dir')
-        elab_bin.execute(directory=exec_dir)
+        runs = expand_runs(reg)
+        waves = self.sim["waves"]
+        farm = get_farm(self.sim["farm"]) if self.sim["farm"]["enabled"] else None
+        workers = max_workers(limit=reg.get("max_workers"))
+        if farm:
+            workers = reg.get("max_workers") or max(farm.slots(), 1)
+        self.log(f"Running {len(runs)} simulations with {workers} concurrent xsim processes")
+
+        def simulate(run):
+            run_dir = os.path.join(exec_dir, "regression", run["name"])
+            os.makedirs(run_dir, exist_ok=True)
+            run_snapshot(os.path.join(exec_dir, "xsim.dir"), self.sim["testbench"], run_dir)
+            sim_bin = BinaryDriver("xsim")
+            for o in self.sim["options"]:
+                sim_bin.add_option(value=o)
+            sim_bin.add_option(self.sim["testbench"])
+            if waves["regression"]:
+                self.write_waves_tcl(os.path.join(run_dir, "waves.tcl"), vcd=True)
+                sim_bin.add_option("-tclbatch", "waves.tcl")
+            else:
+                sim_bin.add_option("-runall")
+            sim_bin.add_option("-sv_seed", run["seed"])
+            for arg in run["plusargs"]:
+                sim_bin.add_option("-testplusarg", arg)
+            sim_bin.add_option("-log", "xsim.log")
+            run["log"] = os.path.join(run_dir, "xsim.log")
+            # A stale log must not pass a run that did not write one
+            for f in [run["log"], os.path.join(run_dir, "waves.vcd")]:
+                if os.path.isfile(f):
+                    os.remove(f)
+            if farm:
+                rel = f"regression/{run['name']}"
+                job = FarmJob(run["name"], shlex.split(sim_bin.get_execute_string()), exec_dir,
+                              cwd=rel, include=["xsim.dir/**", f"{rel}/**"],
+                              artifacts=[f"{rel}/**"],
+                              log_file=os.path.join(run_dir, "farm.log"))
+                try:
+                    result = farm.run(job)
+                except FarmError as e:
+                    raise ToolError(f"Build farm: {e}")
+                run["time"] = result.seconds
+                run["worker"] = result.worker
+            else:
+                with scheduled(self.sim["scheduler"], cpus=1):
+                    start = time.time()
+                    sim_bin.execute(directory=run_dir)
+                    run["time"] = time.time() - start
+            run["failure"] = check_log(run["log"], reg["fail_patterns"], reg["pass_patterns"])
+            if waves["regression"] and waves["export"]:
+                run["waves"] = self.export_waves(run_dir)
+
+        results = run_parallel(simulate, runs, workers)
+        for i, run in enumerate(runs):
+            if results[i][1] is not None:
+                run["failure"] = str(results[i][1])
+            run.setdefault("time", 0.0)
+        failed = write_summary(exec_dir, self.sim["testbench"], runs)
+        self.log(f"Regression: {len(runs) - len(failed)} passed, {len(failed)} failed (see regression.json)")
+        if failed:
+            raise ToolError(f"Regression failures: {', '.join(r['name'] for r in failed)}")
 
     def simulate_design(self):
         """Simulate design with xsim"""
+        if self.sim["regression"]["enabled"]:
+            self.run_regression()
+            return
         sim_bin = BinaryDriver("xsim")
         #if self.sim["include_uvm"]:
         #    sim_bin.add_option("-lib UVM")
@@ -76,9 +316,14 @@ class XsimTool(Tool):
             sim_bin.add_option(value=o)
         sim_bin.add_option(self.sim["testbench"])
         #sim_bin.add_option("-runall")
-        sim_bin.add_option("-wdb", "waves")
+        exec_dir = self.get_db('internal.job_dir')
+        # Without debug visibility there is nothing to record
+        if self.sim["waves"]["debug"] != "off":
+            sim_bin.add_option("-wdb", "waves")
+            if self.sim["waves"]["scopes"]:
+                self.write_waves_tcl(os.path.join(exec_dir, "waves.tcl"))
+                sim_bin.add_option("-tclbatch", "waves.tcl")
         sim_bin.add_option("-gui")
         # Execute
         self.log(sim_bin.get_execute_string())
-        exec_dir = self.get_db('internal.job_dir')
         sim_bin.execute(directory=exec_dir)
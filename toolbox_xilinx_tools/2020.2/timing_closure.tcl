@@ -0,0 +1,97 @@
+######################################################################
+# Adaptive timing closure: runs extra optimization passes only while the
+# design has negative slack
+#
+# closure_loop is called after place_design (setup slack only, hold is
+# fixed by the router) and after route_design (setup and hold slack). Every
+# pass is a tcl script (e.g. "phys_opt_design -directive AggressiveExplore"
+# or "route_design -unroute; route_design -directive Explore"). Passes are
+# run round robin until slack is met, max_passes passes ran, the time
+# budget (shared by all closure_loop calls of an implement run, reset by
+# implement.tcl) is spent or a whole round of passes did not improve slack.
+#
+# Every pass is appended to log_file as a tab separated line:
+# stage, pass, wns, whs (after the pass), seconds. The first line of each
+# stage has pass "initial".
+
+# Seconds spent in closure passes by this implement run
+if {![info exists ::closure_spent]} {
+    set ::closure_spent 0
+}
+
+# Worst slack of setup or hold paths ("" if there are no constrained paths)
+proc closure_slack {type} {
+    set path [get_timing_paths -max_paths 1 -nworst 1 -$type]
+    if {$path eq ""} {
+        return ""
+    }
+    return [get_property SLACK $path]
+}
+
+# True if wns (or whs when check_hold) is negative
+proc closure_violated {wns whs check_hold} {
+    if {$wns ne "" && $wns < 0} {
+        return 1
+    }
+    return [expr {$check_hold && $whs ne "" && $whs < 0}]
+}
+
+# True if (wns, whs) is better than (prev_wns, prev_whs)
+proc closure_improved {prev_wns prev_whs wns whs} {
+    foreach {a b} [list $prev_wns $wns $prev_whs $whs] {
+        if {$a ne "" && $b ne "" && $b > $a} {
+            return 1
+        }
+    }
+    return 0
+}
+
+proc closure_log {log_file stage pass wns whs seconds} {
+    set fp [open $log_file a]
+    puts $fp [join [list $stage $pass $wns $whs $seconds] "\t"]
+    close $fp
+}
+
+# Runs passes while slack is negative. Returns the number of passes run
+proc closure_loop {stage passes max_passes budget_s log_file {check_hold 1}} {
+    set wns [closure_slack setup]
+    set whs [closure_slack hold]
+    closure_log $log_file $stage initial $wns $whs 0
+    set ran 0
+    set idle 0
+    while {[closure_violated $wns $whs $check_hold]} {
+        if {$ran >= $max_passes} {
+            puts "Closure ($stage): WNS $wns WHS $whs after $ran passes, pass limit reached"
+            break
+        }
+        if {$::closure_spent >= $budget_s} {
+            puts "Closure ($stage): WNS $wns WHS $whs, time budget of $budget_s s spent"
+            break
+        }
+        if {$idle >= [llength $passes]} {
+            puts "Closure ($stage): WNS $wns WHS $whs, no pass improved slack"
+            break
+        }
+        set pass [lindex $passes [expr {$ran % [llength $passes]}]]
+        puts "Closure ($stage): WNS $wns WHS $whs => $pass"
+        set start [clock milliseconds]
+        uplevel #0 $pass
+        set seconds [expr {([clock milliseconds] - $start) / 1000.0}]
+        set ::closure_spent [expr {$::closure_spent + $seconds}]
+        incr ran
+        set new_wns [closure_slack setup]
+        set new_whs [closure_slack hold]
+        closure_log $log_file $stage $pass $new_wns $new_whs $seconds
+        if {[closure_improved $wns $whs $new_wns $new_whs]} {
+            set idle 0
+        } else {
+            incr idle
+        }
+        set wns $new_wns
+        set whs $new_whs
+    }
+    if {![closure_violated $wns $whs $check_hold]} {
+        puts "Closure ($stage): timing met after $ran extra passes"
+    }
+    return $ran
+}
@@ -9,6 +9,7 @@
 import os
 from typing import Callable, List
 import subprocess
+import json
 
 # Imports - 3rd party packages
 from toolbox.tool import Tool, ToolError
@@ -19,6 +20,12 @@ from jinja2 import StrictUndefined, Environment, FileSystemLoader
 
 # Imports - local source
 from jinja_tool import JinjaTool
+from toolbox_xilinx_tools.vivado_server import submit
+from toolbox_xilinx_tools.scheduler import scheduled, vivado_source
+from toolbox_xilinx_tools.monitor import run_monitored
+from toolbox_xilinx_tools.jobs import max_workers
+from toolbox_xilinx_tools.hw_batch import group_chains, batch_script, parse_results, \
+    complete_results, run_batch, format_table
 
 
 class XilinxUploadTool(JinjaTool):
@@ -35,22 +42,95 @@ class XilinxUploadTool(JinjaTool):
         """Returns a list of functions to run for each step"""
         return [self.render_tcl, self.run_vivado]
 
+    def pipeline_io(self):
+        """Files read by this tool for toolbox_xilinx_tools.pipeline
+
+        Bitstreams and masks (written by implement). Programming a board is
+        a side effect without outputs, so upload always runs.
+        """
+        if self.upload["batch"]["enabled"]:
+            targets = self.upload["batch"]["targets"]
+            inputs = [t["bitstream"] for t in targets] + [t["mask"] for t in targets if t.get("mask")]
+        else:
+            inputs = [f for f in [self.upload["bitstream"], self.upload["mask"]] if f]
+        return {"inputs": [str(f) for f in inputs], "outputs": [], "always": True}
+
     def render_tcl(self):
         """Renders tcl file that vivado will run in batch mode"""
+        if self.upload["batch"]["enabled"]:
+            return
         self.render_to_file(self.template_file, self.render_file, ts=self.ts)
 
+    def run_batch(self):
+        """Programs every batch target and writes upload_results.json
+
+        Independent targets (JTAG chains) are programmed concurrently, one
+        vivado process with a single hardware manager session per worker.
+        With the persistent vivado server all targets share its session.
+        """
+        batch = self.upload["batch"]
+        hw = self.upload["hw_server"]
+        job_dir = self.get_db('internal.job_dir')
+        chains = group_chains(batch["targets"], batch["verify"], self.upload["frequency"])
+        devices = sum(len(c["devices"]) for c in chains)
+        if self.upload["server"]["enabled"]:
+            self.log(f"Programming {devices} devices on {len(chains)} targets through persistent vivado worker")
+            script = os.path.join(job_dir, "upload_batch.tcl")
+            with open(script, "w") as fp:
+                fp.write(batch_script(chains, hw["hostname"], hw["port"]))
+            result = submit(script, job_dir,
+                            address=self.upload["server"].get("address"),
+                            log_file=os.path.join(job_dir, "vivado.log"))
+            results = complete_results(chains, parse_results(result.output),
+                                       "no result (see vivado.log)")
+        else:
+            workers = max_workers(limit=batch.get("max_workers") or len(chains))
+            self.log(f"Programming {devices} devices on {len(chains)} targets with {workers} hardware manager sessions")
+            results = run_batch(
+                chains, job_dir,
+                lambda script, i: ["vivado", "-mode", "batch", "-nojournal",
+                                   "-log", f"upload_batch_{i}.log", "-source", script],
+                workers=workers, hostname=hw["hostname"], port=hw["port"],
+                slot=lambda: scheduled(self.upload["scheduler"], cpus=1))
+        with open(os.path.join(job_dir, "upload_results.json"), "w") as fp:
+            json.dump(results, fp, indent=2)
+        self.log("Upload results:\n" + format_table(results))
+        failed = [r for r in results if r["status"] != "ok"]
+        if failed:
+            raise ToolError(f"Programming failed for {len(failed)} of {len(results)} devices")
+
     def run_vivado(self):
         """Actually runs the vivado command"""
         if self.upload["execute"]:
             self.log('Assumes "vivado" binary added to path')
+            if self.upload["batch"]["enabled"]:
+                self.run_batch()
+                return
             # Add options
-            render_file_local = Path(self.render_file).relative_to(
-                self.get_db('internal.job_dir'))
-            self.bin.add_option("-mode", "batch")
-            self.bin.add_option("-source", render_file_local)
-            # Execute binary
-            self.log(self.bin.get_execute_string())
-            self.bin.execute(directory=self.get_db('internal.job_dir'))
+            job_dir = self.get_db('internal.job_dir')
+            render_file_local = Path(self.render_file).relative_to(job_dir)
+            if self.upload["server"]["enabled"]:
+                self.log(f"Submitting {render_file_local} to persistent vivado worker")
+                result = submit(self.render_file, job_dir,
+                                address=self.upload["server"].get("address"),
+                                log_file=os.path.join(job_dir, "vivado.log"))
+                if not result.ok:
+                    raise ToolError(f"Vivado worker failed running {render_file_local} (see vivado.log)")
+            else:
+                with scheduled(self.upload["scheduler"]) as grant:
+                    self.bin.add_option("-mode", "batch")
+                    self.bin.add_option("-source", vivado_source(render_file_local, job_dir, grant))
+                    # Execute binary
+                    self.log(self.bin.get_execute_string())
+                    if self.upload["monitor"]["enabled"]:
+                        rc = run_monitored(self.bin.get_execute_string(), job_dir,
+                                           os.path.join(job_dir, "stage_metrics.json"),
+                                           log=self.log,
+                                           interval=self.upload["monitor"]["interval"])
+                        if rc != 0:
+                            raise ToolError(f"Vivado exited with code {rc} (see vivado.log)")
+                    else:
+                        self.bin.execute(directory=job_dir)
         else:
             self.log(
                 "Xilinx upload execute flag set to false. Design not uploaded."
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Timing and allocation measurement of python side generators with baselines"""
+
+# Imports - standard library
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+# A scenario regresses if it is slower/allocates more than baseline * tolerance
+DEFAULT_TOLERANCE = {"time_s": 1.5, "peak_alloc_mb": 1.25}
+# ... and by more than this absolute amount (ignores noise of tiny scenarios)
+MIN_DELTA = {"time_s": 0.02, "peak_alloc_mb": 0.5}
+
+
+def measure(func, setup=None, repeat=3):
+    """Runs func(setup()) repeat times untraced and once under tracemalloc
+
+    Returns {"time_s": fastest run, "peak_alloc_mb", "blocks"} where
+    blocks is the number of memory blocks still allocated after the traced
+    run. setup is called before every run and is not measured.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        func(arg) if setup else func()
+        times.append(time.perf_counter() - start)
+    arg = setup() if setup else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(arg) if setup else func()
+        _, peak = tracemalloc.get_traced_memory()
+        blocks = len(tracemalloc.take_snapshot().traces)
+    finally:
+        tracemalloc.stop()
+    return {"time_s": round(min(times), 6),
+            "peak_alloc_mb": round(peak / 2**20, 3),
+            "blocks": blocks}
+
+
+def load_baseline(fpath):
+    """Baseline file => {"tolerance": {...}, "scenarios": {name: result}}"""
+    if not os.path.isfile(fpath):
+        return {"tolerance": dict(DEFAULT_TOLERANCE), "scenarios": {}}
+    with open(fpath) as fp:
+        baseline = json.load(fp)
+    baseline.setdefault("scenarios", {})
+    baseline["tolerance"] = dict(DEFAULT_TOLERANCE, **baseline.get("tolerance", {}))
+    return baseline
+
+
+def save_baseline(fpath, results, tolerance=None):
+    """Writes results as new baseline (keeps tolerance of an existing one)"""
+    baseline = load_baseline(fpath)
+    if tolerance:
+        baseline["tolerance"].update(tolerance)
+    baseline["scenarios"].update(results)
+    with open(fpath, "w") as fp:
+        json.dump(baseline, fp, indent=2, sort_keys=True)
+
+
+def regressions(name, result, baseline):
+    """List of regression messages of one scenario (empty if none/no baseline)"""
+    ref = baseline["scenarios"].get(name)
+    if ref is None:
+        return []
+    found = []
+    for metric, tol in baseline["tolerance"].items():
+        if metric not in ref or metric not in result:
+            continue
+        if result[metric] > ref[metric] * tol and \
+                result[metric] - ref[metric] > MIN_DELTA.get(metric, 0):
+            found.append(f"{name}: {metric} {result[metric]} > {tol} x baseline {ref[metric]}")
+    return found
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Content addressed artifact cache for tool job directories"""
+
+# Imports - standard library
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+
+def hash_file(fpath, hasher=None, chunk_size=1 << 20):
+    """Returns sha256 hex digest of file (or updates hasher if given)"""
+    h = hasher if hasher is not None else hashlib.sha256()
+    with open(fpath, "rb") as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_inputs(files=(), dirs=(), extra=None):
+    """Returns one digest over file contents, directory trees and extra values
+
+    files are hashed in the order given (order matters to vivado). Every file
+    in dirs is hashed in sorted order together with its path relative to the
+    directory so renames are detected. extra is any json serializable value.
+    """
+    h = hashlib.sha256()
+    for f in files:
+        h.update(b"file\0")
+        h.update(Path(f).name.encode())
+        h.update(b"\0")
+        hash_file(f, h)
+    for d in dirs:
+        root = Path(d)
+        h.update(b"dir\0")
+        for f in sorted(x for x in root.glob("**/*") if x.is_file()):
+            h.update(str(f.relative_to(root)).encode())
+            h.update(b"\0")
+            hash_file(f, h)
+    if extra is not None:
+        h.update(b"extra\0")
+        h.update(json.dumps(extra, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _tree_size(path):
+    """Total size in bytes of all files below path"""
+    return sum(f.stat().st_size for f in Path(path).glob("**/*") if f.is_file())
+
+
+class BuildCache:
+    """Local artifact store keyed on a digest of all build inputs
+
+    Each entry is a directory named after its key holding a copy of the
+    artifacts of one job. Entries are evicted least recently used first once
+    max_entries or max_size (bytes) is exceeded. Hit/miss counters are kept
+    in stats.json next to the entries.
+    """
+    def __init__(self, cache_dir, max_entries=None, max_size=None):
+        self._dir = Path(cache_dir).resolve()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def dir(self):
+        return self._dir
+
+    def entry(self, key):
+        """Path of cache entry for key (may not exist)"""
+        return self._dir / key
+
+    def entries(self):
+        """Complete entries sorted from least to most recently used"""
+        entries = [e for e in self._dir.iterdir() if (e / "manifest.json").is_file()]
+        return sorted(entries, key=lambda e: (e / "manifest.json").stat().st_mtime)
+
+    def contains(self, key):
+        return (self.entry(key) / "manifest.json").is_file()
+
+    def restore(self, key, dest):
+        """Copies artifacts for key into dest. Returns True on a hit"""
+        entry = self.entry(key)
+        if not self.contains(key):
+            self.misses += 1
+            self._record("misses")
+            return False
+        with open(entry / "manifest.json") as fp:
+            manifest = json.load(fp)
+        dest = Path(dest)
+        for rel in manifest["artifacts"]:
+            src, dst = entry / "artifacts" / rel, dest / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
+        # Mark as most recently used
+        os.utime(entry / "manifest.json")
+        self.hits += 1
+        self._record("hits")
+        return True
+
+    def store(self, key, src, patterns):
+        """Copies artifacts matching glob patterns (relative to src) into cache
+
+        Directories matched by a pattern are copied recursively. Returns the
+        list of stored artifact paths relative to src.
+        """
+        src = Path(src)
+        artifacts = set()
+        for pattern in patterns:
+            for match in src.glob(pattern):
+                if match.is_dir():
+                    artifacts.update(f for f in match.glob("**/*") if f.is_file())
+                elif match.is_file():
+                    artifacts.add(match)
+        artifacts = sorted(str(f.relative_to(src)) for f in artifacts)
+        # Build entry in temporary directory so a partial entry is never seen
+        tmp = self._dir / f".{key}.{os.getpid()}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        for rel in artifacts:
+            dst = tmp / "artifacts" / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src / rel, dst)
+        tmp.mkdir(parents=True, exist_ok=True)
+        with open(tmp / "manifest.json", "w") as fp:
+            json.dump({"key": key, "created": time.time(), "artifacts": artifacts}, fp, indent=2)
+        entry = self.entry(key)
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+        self.evict()
+        return artifacts
+
+    def evict(self):
+        """Removes least recently used entries until within limits. Returns removed keys"""
+        entries = self.entries()
+        sizes = {e: _tree_size(e) for e in entries} if self.max_size is not None else {}
+        total = sum(sizes.values())
+        removed = []
+        while entries and ((self.max_entries is not None and len(entries) > self.max_entries) or
+                           (self.max_size is not None and total > self.max_size)):
+            oldest = entries.pop(0)
+            total -= sizes.get(oldest, 0)
+            shutil.rmtree(oldest)
+            removed.append(oldest.name)
+        return removed
+
+    def _record(self, counter):
+        """Increments persistent counter in stats.json"""
+        stats = self.stats()
+        stats[counter] += 1
+        with open(self._dir / "stats.json", "w") as fp:
+            json.dump(stats, fp, indent=2)
+
+    def stats(self):
+        """Returns persistent hit/miss counters for this cache"""
+        fpath = self._dir / "stats.json"
+        if fpath.is_file():
+            with open(fpath) as fp:
+                return json.load(fp)
+        return {"hits": 0, "misses": 0}
+
+    def report(self):
+        """One line summary of this session and cache totals"""
+        stats = self.stats()
+        return (f"Build cache: {self.hits} hit(s), {self.misses} miss(es) this run; "
+                f"{stats['hits']} hit(s), {stats['misses']} miss(es) total; "
+                f"{len(self.entries())} entries in {self._dir}")
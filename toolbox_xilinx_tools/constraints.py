@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Helpers for compiling constraint dictionaries into compact xdc commands"""
+
+# Imports - standard library
+import csv
+import re
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+BUS_BIT_RE = re.compile(r"^(.*)\[(\d+)\]$")
+
+
+def group_by(items, key):
+    """Groups items by key(item) preserving order of first appearance"""
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
+
+
+def bus_bits(ports):
+    """{bus base name: set of its bit ports} of all bus bits in ports"""
+    bits = {}
+    for p in ports:
+        m = BUS_BIT_RE.match(p)
+        if m:
+            bits.setdefault(m.group(1), set()).add(p)
+    return bits
+
+
+def compress_ports(ports, known_ports=()):
+    """Replaces bus bits with a base[*] wildcard when the wildcard is exact
+
+    A wildcard is only used when known_ports (all ports of the design, or
+    their bus_bits) is given and every known bit of the bus is in ports, so
+    the wildcard never matches more than the listed ports.
+    """
+    if not known_ports:
+        return list(ports)
+    known_bits = known_ports if isinstance(known_ports, dict) else bus_bits(known_ports)
+    wanted = set(ports)
+    result, emitted = [], set()
+    for p in ports:
+        m = BUS_BIT_RE.match(p)
+        base = m.group(1) if m else None
+        if base is not None and known_bits.get(base) and known_bits[base] <= wanted:
+            if base not in emitted:
+                emitted.add(base)
+                result.append(f"{base}[*]")
+        else:
+            result.append(p)
+    return result
+
+
+# Object query of each constraint object type
+OBJECT_QUERIES = {
+    "port": "get_ports",
+    "pin": "get_pins -hierarchical",
+    "net": "get_nets -hierarchical",
+    "cell": "get_cells -hierarchical",
+    "clock": "get_clocks"
+}
+
+
+def object_query(obj_type, name):
+    """Tcl query of object name of obj_type (port, pin, net, cell or clock)"""
+    if obj_type not in OBJECT_QUERIES:
+        raise ValueError(f'unsupported object type "{obj_type}" for {name}')
+    return f"[{OBJECT_QUERIES[obj_type]} {name}]"
+
+
+def xdc_clocks(fpath):
+    """Names of clocks created (create_clock/create_generated_clock -name) in an xdc file"""
+    with open(fpath, errors="replace") as fp:
+        return re.findall(r"\bcreate_(?:generated_)?clock\b[^\n]*?-name\s+\{?([^\s}\]]+)", fp.read())
+
+
+def get_ports(ports):
+    """get_ports query for one or more ports (braced when needed for tcl)"""
+    if len(ports) == 1 and "[" not in ports[0]:
+        return f"[get_ports {ports[0]}]"
+    return f"[get_ports {{{' '.join(ports)}}}]"
+
+
+def group_delays(constraints, scale=1, known_ports=()):
+    """Merges input/output delay constraints sharing clock, edge and delays
+
+    Delays are multiplied by scale once per group. Returns a list of dicts
+    with keys clock, clock_edge, min_delay, max_delay and ports (list of
+    port names/wildcards) in order of first appearance.
+    """
+    key = lambda c: (c["clock"], c["clock_edge"], c["min_delay"], c["max_delay"])
+    known_bits = bus_bits(known_ports)
+    groups = []
+    for (clock, edge, min_delay, max_delay), cons in group_by(constraints, key).items():
+        groups.append({
+            "clock": clock,
+            "clock_edge": edge,
+            "min_delay": min_delay * scale,
+            "max_delay": max_delay * scale,
+            "ports": compress_ports([c["port"] for c in cons], known_bits)
+        })
+    return groups
+
+
+def read_pin_table(fpath):
+    """Package pin table => {pin: pin_name}
+
+    Accepts a csv with "Pin" and "Pin Name" columns (e.g. exported from the
+    package pins view) or a Xilinx package file (<part>pkg.txt) in which
+    rows start with the pin followed by its pin name.
+    """
+    pins = {}
+    with open(fpath, newline="") as fp:
+        first = fp.readline()
+        fp.seek(0)
+        if "," in first:
+            for row in csv.DictReader(fp):
+                row = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+                if row.get("Pin"):
+                    pins[row["Pin"]] = row.get("Pin Name", "")
+            return pins
+        for line in fp:
+            fields = line.split()
+            if len(fields) >= 2 and fields[0] != "Pin" and \
+                    re.match(r"^[A-Z]{1,2}\d+$", fields[0]):
+                pins[fields[0]] = fields[1]
+    return pins
+
+
+def check_pins(ports, pin_table=None):
+    """Returns list of problems with port to package pin assignments
+
+    Always checks for ports listed twice and pins assigned to more than one
+    port. With a pin table (see read_pin_table) also checks that every pin
+    exists in the package and is a user IO pin (pin name starts with IO_).
+    """
+    errors = []
+    for name, dups in group_by(ports, lambda p: p["name"]).items():
+        if len(dups) > 1:
+            errors.append(f'Port "{name}" defined {len(dups)} times')
+    for pin, dups in group_by(ports, lambda p: p["package_pin"]).items():
+        if len(dups) > 1:
+            errors.append(f'Pin {pin} assigned to multiple ports: {", ".join(p["name"] for p in dups)}')
+        if pin_table is None:
+            continue
+        if pin not in pin_table:
+            errors.append(f'Pin {pin} (port "{dups[0]["name"]}") does not exist in package')
+        elif not pin_table[pin].startswith("IO_"):
+            errors.append(f'Pin {pin} (port "{dups[0]["name"]}") is not a user IO pin ({pin_table[pin]})')
+    return errors
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Build farm: runs tool processes (vivado, xsim) on remote worker daemons
+
+A worker keeps a content addressed blob store. For every job the
+coordinator (Farm, running inside the tool) mirrors a local root dir (the
+job dir) plus external inputs (sources, xdc, ip) to the worker. Only blobs
+the worker does not hold yet are uploaded. Absolute paths of the root and
+the external inputs in rendered scripts (.tcl, .xdc, ...) are rewritten to
+relative paths on the worker. The command runs in its own work dir on the
+worker with its output streamed back line by line. Files it created or
+changed are fetched back into the root (skipping files that are already
+identical locally).
+
+Start a worker on every build machine. Workers execute any command sent
+with a valid token, so they refuse to start without one (the token is
+shared by coordinator and workers, keep it secret):
+
+    FARM_TOKEN=... python -m toolbox_xilinx_tools.farm worker --host 0.0.0.0 --port 7060 --root /scratch/farm
+
+Tools with the farm property enabled run their vivado/xsim processes on
+the least loaded of farm.workers (host:port): implement the whole flow, ip
+one job per block when blocks are generated separately, simulate every
+regression run (the snapshot is uploaded once per worker). farm.token
+defaults to $FARM_TOKEN. Worker output goes to farm.log.
+
+Protocol: one json line per message over tcp, blobs follow their message
+as raw bytes (the message gives their size).
+"""
+
+# Imports - standard library
+from fnmatch import fnmatch
+from pathlib import Path
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.build_cache import hash_file
+
+# Files in the root whose absolute paths are rewritten for the worker
+REWRITE_SUFFIXES = {".tcl", ".xdc", ".prj", ".sh", ".f"}
+CHUNK = 1 << 20
+
+
+class FarmError(Exception):
+    """Raised when no worker can run a job or a worker breaks the protocol"""
+    pass
+
+
+def send(fp, msg, payload=None):
+    """Writes a message (and payload file path or bytes) to a binary stream"""
+    fp.write((json.dumps(msg) + "\n").encode())
+    if isinstance(payload, (bytes, bytearray)):
+        fp.write(payload)
+    elif payload is not None:
+        with open(payload, "rb") as src:
+            shutil.copyfileobj(src, fp, CHUNK)
+    fp.flush()
+
+
+def receive(fp):
+    line = fp.readline()
+    if not line:
+        raise FarmError("connection closed")
+    return json.loads(line)
+
+
+def receive_blob(fp, size, dst):
+    """Copies size bytes from fp to dst, returns their sha256 hex digest"""
+    h = hashlib.sha256()
+    with open(dst, "wb") as out:
+        while size > 0:
+            chunk = fp.read(min(CHUNK, size))
+            if not chunk:
+                raise FarmError("connection closed during transfer")
+            h.update(chunk)
+            out.write(chunk)
+            size -= len(chunk)
+    return h.hexdigest()
+
+
+def matches(rel, patterns):
+    """True if rel (posix path) matches one of the glob patterns (* crosses dirs)"""
+    return any(fnmatch(rel, p) for p in patterns)
+
+
+#------------------------------------------------------------------------------
+# Worker
+#------------------------------------------------------------------------------
+class Worker:
+    """Blob store and job runner of one worker daemon (root/blobs, root/jobs)"""
+    def __init__(self, root, slots=None, token=None):
+        if not token:
+            raise FarmError("a farm worker needs a token (FARM_TOKEN)")
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.jobs = self.root / "jobs"
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        self.jobs.mkdir(parents=True, exist_ok=True)
+        self.slots = slots or os.cpu_count() or 1
+        self.token = token
+        self.busy = 0
+        self._slots = threading.Semaphore(self.slots)
+        self._lock = threading.Lock()
+
+    def blob(self, digest):
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise FarmError(f"invalid digest {digest}")
+        return self.blobs / digest[:2] / digest
+
+    def put(self, fp, digest, size):
+        dst = self.blob(digest)
+        dst.parent.mkdir(exist_ok=True)
+        tmp = dst.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+        try:
+            if receive_blob(fp, size, tmp) != digest:
+                raise FarmError(f"blob {digest[:12]} corrupted in transfer")
+            os.replace(tmp, dst)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def store(self, fpath):
+        """Adds a file produced by a job to the blob store, returns its digest"""
+        digest = hash_file(fpath)
+        dst = self.blob(digest)
+        if not dst.exists():
+            dst.parent.mkdir(exist_ok=True)
+            tmp = dst.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+            shutil.copyfile(fpath, tmp)
+            os.replace(tmp, dst)
+        return digest
+
+    def materialize(self, job_dir, manifest):
+        """Creates dirs, files (copied from blobs) and links of manifest below job_dir/work
+
+        Manifest paths are relative to the work dir, external inputs are below ../ext.
+        """
+        work = job_dir / "work"
+
+        def path(rel):
+            dst = Path(os.path.normpath(work / rel))
+            if job_dir not in dst.parents:
+                raise FarmError(f"path {rel} outside of job dir")
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            return dst
+
+        work.mkdir(parents=True)
+        for d in manifest.get("dirs", []):
+            path(d).mkdir(exist_ok=True)
+        for rel, entry in manifest["files"].items():
+            dst = path(rel)
+            shutil.copyfile(self.blob(entry["digest"]), dst)
+            os.chmod(dst, entry.get("mode", 0o644))
+        for rel, target in manifest.get("links", {}).items():
+            os.symlink(target, path(rel))
+
+    def run(self, fp, request):
+        """Runs a job, streaming log messages, then its result with the changed files"""
+        job_id = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        job_dir = self.jobs / job_id
+        work = job_dir / "work"
+        with self._slots:
+            with self._lock:
+                self.busy += 1
+            try:
+                self.materialize(job_dir, request["manifest"])
+                before = {p.relative_to(work).as_posix(): (p.stat().st_size, p.stat().st_mtime_ns)
+                          for p in work.rglob("*") if p.is_file() and not p.is_symlink()}
+                start = time.time()
+                proc = subprocess.Popen(request["command"], cwd=work / request.get("cwd", "."),
+                                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        text=True, errors="replace")
+                for line in proc.stdout:
+                    send(fp, {"log": line.rstrip("\n")})
+                rc = proc.wait()
+                artifacts = {}
+                patterns = request.get("artifacts") or ["*"]
+                for p in work.rglob("*"):
+                    if not p.is_file() or p.is_symlink():
+                        continue
+                    rel = p.relative_to(work).as_posix()
+                    st = p.stat()
+                    if before.get(rel) == (st.st_size, st.st_mtime_ns) or \
+                            not matches(rel, patterns):
+                        continue
+                    artifacts[rel] = {"digest": self.store(p), "size": st.st_size,
+                                      "mode": st.st_mode & 0o777}
+                send(fp, {"rc": rc, "job": job_id, "seconds": time.time() - start,
+                          "artifacts": artifacts})
+            finally:
+                with self._lock:
+                    self.busy -= 1
+                if not request.get("keep"):
+                    shutil.rmtree(job_dir, ignore_errors=True)
+
+    def handle(self, fp):
+        request = receive(fp)
+        if not hmac.compare_digest(str(request.get("token") or ""), self.token):
+            send(fp, {"error": "invalid token"})
+            return
+        op = request.get("op")
+        if op == "status":
+            send(fp, {"slots": self.slots, "busy": self.busy})
+        elif op == "have":
+            send(fp, {"missing": [d for d in request["digests"] if not self.blob(d).exists()]})
+        elif op == "put":
+            self.put(fp, request["digest"], request["size"])
+            send(fp, {"ok": True})
+        elif op == "get":
+            src = self.blob(request["digest"])
+            if not src.exists():
+                send(fp, {"error": f"no blob {request['digest'][:12]}"})
+            else:
+                send(fp, {"size": src.stat().st_size}, src)
+        elif op == "run":
+            self.run(fp, request)
+        else:
+            send(fp, {"error": f"unknown op {op}"})
+
+
+def start_worker(root, host="127.0.0.1", port=0, slots=None, token=None):
+    """Worker server (call serve_forever), server.server_address is the bound address"""
+    worker = Worker(root, slots, token)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                worker.handle(self.connection.makefile("rwb"))
+            except (FarmError, OSError, ValueError) as e:
+                try:
+                    send(self.wfile, {"error": str(e)})
+                except OSError:
+                    pass
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.worker = worker
+    return server
+
+
+#------------------------------------------------------------------------------
+# Coordinator
+#------------------------------------------------------------------------------
+class FarmJob:
+    """One tool process to run on the farm
+
+    root is mirrored to the worker (only paths matching the include globs,
+    if given, and their parent dirs) and command runs in root/cwd. external are
+    files or dirs outside root the command reads by absolute path. Files
+    created or changed below root that match artifacts (default all) are
+    fetched back. Worker output goes to log (callable per line) and log_file.
+    """
+    def __init__(self, name, command, root, cwd=".", external=(), include=None,
+                 artifacts=None, log=None, log_file=None):
+        self.name = name
+        self.command = [str(c) for c in command]
+        self.root = os.path.abspath(root)
+        self.cwd = cwd
+        self.external = [os.path.realpath(e) for e in external if os.path.exists(e)]
+        self.include = include
+        self.artifacts = artifacts
+        self.log = log
+        self.log_file = log_file
+
+    def replacements(self):
+        """Absolute path prefix => path relative to cwd on the worker (longest first)"""
+        up = os.path.relpath(self.root, os.path.join(self.root, self.cwd))
+        pairs = {self.root: up, os.path.realpath(self.root): up}
+        for e in self.external:
+            if not e.startswith(os.path.realpath(self.root) + os.sep):
+                pairs[e] = os.path.normpath(os.path.join(up, "..", "ext" + e))
+        return sorted(pairs.items(), key=lambda p: -len(p[0]))
+
+    def manifest(self):
+        """(manifest, {digest: path or bytes}) of the job inputs"""
+        files, links, dirs, blobs = {}, {}, [], {}
+        real_root = os.path.realpath(self.root)
+        replacements = self.replacements()
+        log_file = os.path.abspath(self.log_file) if self.log_file else None
+
+        def add(rel, fpath):
+            if Path(fpath).suffix in REWRITE_SUFFIXES and fpath.startswith(self.root):
+                with open(fpath, "rb") as fp:
+                    data = fp.read()
+                for old, new in replacements:
+                    data = data.replace(old.encode(), new.encode())
+                digest = hashlib.sha256(data).hexdigest()
+                blobs[digest] = data
+            else:
+                digest = hash_file(fpath)
+                blobs.setdefault(digest, fpath)
+            files[rel] = {"digest": digest, "mode": os.stat(fpath).st_mode & 0o777}
+
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            rel_dir = Path(os.path.relpath(dirpath, self.root)).as_posix()
+            if rel_dir != "." and (self.include is None or matches(rel_dir, self.include)):
+                dirs.append(rel_dir)
+            for name in sorted(dirnames + filenames):
+                fpath = os.path.join(dirpath, name)
+                rel = Path(os.path.relpath(fpath, self.root)).as_posix()
+                if (self.include is not None and not matches(rel, self.include)) or \
+                        fpath == log_file:
+                    continue
+                if os.path.islink(fpath):
+                    target = os.path.realpath(fpath)
+                    if target == real_root or target.startswith(real_root + os.sep):
+                        links[rel] = os.path.relpath(
+                            os.path.join(self.root, os.path.relpath(target, real_root)),
+                            os.path.dirname(fpath))
+                        if name in dirnames:
+                            dirnames.remove(name)
+                        continue
+                if name in filenames and os.path.isfile(fpath):
+                    add(rel, fpath)
+        # Parent dirs of everything shipped
+        for rel in list(files) + list(links) + list(dirs):
+            parent = os.path.dirname(rel)
+            while parent and not parent.startswith(".."):
+                dirs.append(parent)
+                parent = os.path.dirname(parent)
+        dirs = sorted(set(dirs))
+        for e in self.external:
+            if e.startswith(real_root + os.sep):
+                continue
+            paths = [e] if os.path.isfile(e) else \
+                [str(p) for p in Path(e).rglob("*") if p.is_file()]
+            for p in paths:
+                add(f"../ext{p}", p)
+        return {"files": files, "links": links, "dirs": dirs}, blobs
+
+
+class FarmResult:
+    def __init__(self, rc, worker, uploaded, fetched, skipped, seconds):
+        self.rc = rc
+        self.worker = worker
+        self.uploaded = uploaded
+        self.fetched = fetched
+        self.skipped = skipped
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.rc == 0
+
+    def __str__(self):
+        return f"rc {self.rc} on {self.worker} in {self.seconds:.1f} s, uploaded {self.uploaded} bytes, fetched {self.fetched} files ({self.skipped} already up to date)"
+
+
+class Farm:
+    """Coordinator: places jobs on the least loaded worker ("host:port" addresses)"""
+    def __init__(self, workers, token=None, timeout=30):
+        if not workers:
+            raise FarmError("no farm workers configured")
+        self.workers = list(workers)
+        self.token = token if token is not None else os.environ.get("FARM_TOKEN")
+        if not self.token:
+            raise FarmError("no farm token configured (farm.token or FARM_TOKEN)")
+        self.timeout = timeout
+        self._pending = {w: 0 for w in self.workers}
+        self._lock = threading.Lock()
+
+    def connect(self, worker, timeout=None):
+        host, port = worker.rsplit(":", 1)
+        return socket.create_connection((host, int(port)), timeout=timeout or self.timeout)
+
+    def request(self, worker, msg, payload=None, handler=None):
+        """Sends one request, returns the final response (handler gets streamed messages)"""
+        with self.connect(worker) as sock:
+            fp = sock.makefile("rwb")
+            send(fp, dict(msg, token=self.token), payload)
+            if msg["op"] == "run":
+                sock.settimeout(None)
+            while True:
+                response = receive(fp)
+                if "error" in response:
+                    raise FarmError(f"{worker}: {response['error']}")
+                if "log" not in response:
+                    return response
+                if handler:
+                    handler(response["log"])
+
+    def status(self):
+        """{worker: {slots, busy}} of the reachable workers"""
+        result = {}
+        for w in self.workers:
+            try:
+                result[w] = self.request(w, {"op": "status"})
+            except (OSError, FarmError):
+                continue
+        return result
+
+    def slots(self):
+        """Total slots of the reachable workers"""
+        return sum(s["slots"] for s in self.status().values())
+
+    def choose(self, exclude=()):
+        """Reachable worker with the lowest load (busy + jobs placed by this process) per slot"""
+        status = {w: s for w, s in self.status().items() if w not in exclude}
+        if not status:
+            raise FarmError(f"no farm worker reachable ({', '.join(self.workers)})")
+        with self._lock:
+            worker = min(status, key=lambda w: ((status[w]["busy"] + self._pending[w]) / status[w]["slots"],
+                                                self.workers.index(w)))
+            self._pending[worker] += 1
+        return worker
+
+    def upload(self, worker, blobs):
+        """Uploads the blobs missing on worker, returns bytes sent"""
+        missing = self.request(worker, {"op": "have", "digests": sorted(blobs)})["missing"]
+        sent = 0
+        for digest in missing:
+            src = blobs[digest]
+            size = len(src) if isinstance(src, (bytes, bytearray)) else os.path.getsize(src)
+            self.request(worker, {"op": "put", "digest": digest, "size": size}, src)
+            sent += size
+        return sent
+
+    def fetch(self, worker, root, artifacts):
+        """Fetches artifacts into root unless identical locally. Returns (fetched, skipped)"""
+        fetched = skipped = 0
+        for rel, entry in sorted(artifacts.items()):
+            dst = Path(root, rel)
+            if dst.is_file() and dst.stat().st_size == entry["size"] and \
+                    hash_file(dst) == entry["digest"]:
+                skipped += 1
+                continue
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+            with self.connect(worker) as sock:
+                fp = sock.makefile("rwb")
+                send(fp, {"op": "get", "digest": entry["digest"], "token": self.token})
+                response = receive(fp)
+                if "error" in response:
+                    raise FarmError(f"{worker}: {response['error']}")
+                if receive_blob(fp, response["size"], tmp) != entry["digest"]:
+                    tmp.unlink()
+                    raise FarmError(f"{rel} corrupted in transfer from {worker}")
+            os.chmod(tmp, entry.get("mode", 0o644))
+            os.replace(tmp, dst)
+            fetched += 1
+        return fetched, skipped
+
+    def run(self, job):
+        """Runs job on a worker (another one if the chosen worker fails before running)"""
+        manifest, blobs = job.manifest()
+        log_fp = open(job.log_file, "w") if job.log_file else None
+
+        def on_line(line):
+            if log_fp:
+                log_fp.write(line + "\n")
+            if job.log:
+                job.log(line)
+
+        tried = []
+        try:
+            while True:
+                worker = self.choose(exclude=tried)
+                try:
+                    start = time.time()
+                    try:
+                        uploaded = self.upload(worker, blobs)
+                    except (OSError, FarmError):
+                        tried.append(worker)
+                        continue
+                    result = self.request(worker, {
+                        "op": "run", "command": job.command, "cwd": job.cwd,
+                        "manifest": manifest, "artifacts": job.artifacts}, handler=on_line)
+                    fetched, skipped = self.fetch(worker, job.root, result["artifacts"])
+                    return FarmResult(result["rc"], worker, uploaded, fetched, skipped,
+                                      time.time() - start)
+                finally:
+                    with self._lock:
+                        self._pending[worker] -= 1
+        finally:
+            if log_fp:
+                log_fp.close()
+
+
+_farms = {}
+
+
+def get_farm(cfg):
+    """Farm shared by all tools in this process for the workers of a farm config"""
+    key = (tuple(cfg["workers"]), cfg.get("token"))
+    if key not in _farms:
+        _farms[key] = Farm(cfg["workers"], cfg.get("token"))
+    return _farms[key]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("worker", help="run a worker daemon")
+    w.add_argument("--root", required=True, help="blob store and job directory")
+    w.add_argument("--host", default="127.0.0.1")
+    w.add_argument("--port", type=int, default=7060)
+    w.add_argument("--slots", type=int, help="concurrent jobs (default cpu count)")
+    s = sub.add_parser("status", help="show load of workers")
+    s.add_argument("workers", nargs="+", help="host:port")
+    args = parser.parse_args(argv)
+    if not os.environ.get("FARM_TOKEN"):
+        parser.error("FARM_TOKEN must be set (workers execute commands sent with this token)")
+    if args.cmd == "status":
+        status = Farm(args.workers).status()
+        for worker in args.workers:
+            s = status.get(worker)
+            load = "unreachable" if s is None else f"{s['busy']}/{s['slots']} busy"
+            print(f"{worker}: {load}")
+        return 0
+    server = start_worker(args.root, args.host, args.port, args.slots, os.environ["FARM_TOKEN"])
+    print(f"Farm worker on {args.host}:{server.server_address[1]} ({server.worker.slots} slots, root {args.root})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
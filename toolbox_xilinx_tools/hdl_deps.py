@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Include/import/instantiation dependency graph of verilog/systemverilog source files"""
+
+# Imports - standard library
+from pathlib import Path
+import hashlib
+import re
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+INCLUDE_RE = re.compile(r'`include\s+"([^"]+)"')
+IMPORT_RE = re.compile(r"\bimport\s+(\w+)\s*::")
+PACKAGE_RE = re.compile(r"^\s*package\s+(?:(?:static|automatic)\s+)?(\w+)\s*;", re.M)
+USE_RE = re.compile(r"\b(\w+)\s*::\s*\w+")
+MODULE_RE = re.compile(r"^\s*(?:module|macromodule)\s+(?:(?:static|automatic)\s+)?(\w+)", re.M)
+# <module> [#(<parameters>)] <instance> [<range>] ( (parameters nest 2 levels)
+PARAMS = r"#\s*\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)"
+INSTANCE_RE = re.compile(rf"\b(\w+)(?:\s*{PARAMS})?\s+\w+\s*(?:\[[^\]]*\]\s*)?\(")
+
+
+def scan(fpath):
+    """Returns {"includes", "imports", "packages"} found in a source file
+
+    imports also contains packages referenced with scope resolution
+    (pkg::name) without an import statement.
+    """
+    text = COMMENT_RE.sub("", Path(fpath).read_text(errors="replace"))
+    packages = PACKAGE_RE.findall(text)
+    imports = set(IMPORT_RE.findall(text)) | set(USE_RE.findall(text))
+    return {
+        "includes": INCLUDE_RE.findall(text),
+        "imports": sorted(imports - set(packages)),
+        "packages": packages
+    }
+
+
+def scan_modules(fpath):
+    """Returns {"modules", "instances"} of a source file
+
+    instances are the names of everything that looks like a module
+    instantiation (callers filter them against known modules).
+    """
+    text = COMMENT_RE.sub("", Path(fpath).read_text(errors="replace"))
+    return {
+        "modules": MODULE_RE.findall(text),
+        "instances": sorted(set(INSTANCE_RE.findall(text)) - {"module", "macromodule"})
+    }
+
+
+class DependencyGraph:
+    """Dependencies between compilation units (one per source file)
+
+    A unit depends on the files it includes (recursively, resolved against
+    the including file's directory and then include_dirs) and on the units
+    defining the packages it imports.
+    """
+    def __init__(self, files, include_dirs=()):
+        self.files = [str(Path(f).resolve()) for f in files]
+        self.include_dirs = [Path(d).resolve() for d in include_dirs]
+        self._scans = {}
+        self._module_scans = {}
+        self._definitions = None
+        self.providers = {}
+        for f in self.files:
+            for pkg in self._scan(f)["packages"]:
+                self.providers.setdefault(pkg, f)
+        self.includes = {f: self._include_closure(f) for f in self.files}
+        self.deps = {}
+        for f in self.files:
+            deps = set()
+            for src in [f] + self.includes[f]:
+                for pkg in self._scan(src)["imports"]:
+                    provider = self.providers.get(pkg)
+                    if provider is not None and provider != f:
+                        deps.add(provider)
+            self.deps[f] = sorted(deps)
+
+    def _scan(self, fpath):
+        if fpath not in self._scans:
+            self._scans[fpath] = scan(fpath)
+        return self._scans[fpath]
+
+    def _scan_modules(self, fpath):
+        if fpath not in self._module_scans:
+            self._module_scans[fpath] = scan_modules(fpath)
+        return self._module_scans[fpath]
+
+    def _resolve_include(self, name, including):
+        for d in [Path(including).parent] + self.include_dirs:
+            candidate = d / name
+            if candidate.is_file():
+                return str(candidate.resolve())
+        return None
+
+    def _include_closure(self, fpath):
+        """All files included by fpath (recursively, first occurrence order)"""
+        seen, stack = [], [fpath]
+        while stack:
+            current = stack.pop()
+            for name in self._scan(current)["includes"]:
+                inc = self._resolve_include(name, current)
+                if inc is not None and inc not in seen and inc != fpath:
+                    seen.append(inc)
+                    stack.append(inc)
+        return seen
+
+    def order(self, files=None):
+        """Files in dependency order (packages before importers), otherwise stable"""
+        files = self.files if files is None else [str(Path(f).resolve()) for f in files]
+        wanted = set(files)
+        ordered, visiting, done = [], set(), set()
+
+        def visit(f):
+            if f in done or f in visiting:
+                return
+            visiting.add(f)
+            for d in self.deps.get(f, []):
+                visit(d)
+            visiting.discard(f)
+            done.add(f)
+            if f in wanted:
+                ordered.append(f)
+
+        for f in files:
+            visit(f)
+        return ordered
+
+    def fingerprints(self, extra=""):
+        """Digest per unit of its content, includes, dependencies and extra"""
+        digests = {}
+        contents = {}
+
+        def content(f):
+            if f not in contents:
+                contents[f] = hashlib.sha256(Path(f).read_bytes()).hexdigest()
+            return contents[f]
+
+        for f in self.order():
+            h = hashlib.sha256(str(extra).encode())
+            for src in [f] + self.includes[f]:
+                h.update(f"{src}:{content(src)}\n".encode())
+            for d in self.deps[f]:
+                h.update(f"dep:{digests.get(d, content(d))}\n".encode())
+            digests[f] = h.hexdigest()
+        return digests
+
+    def dependents(self, fpath):
+        """Units that (transitively) depend on fpath"""
+        fpath = str(Path(fpath).resolve())
+        result, frontier = set(), {fpath}
+        while frontier:
+            frontier = {f for f in self.files
+                        if f not in result and set(self.deps[f]) & frontier}
+            result |= frontier
+        return sorted(result)
+
+    def module_definitions(self):
+        """{module: unit defining it} (first definition wins)"""
+        if self._definitions is None:
+            self._definitions = {}
+            for f in self.files:
+                for m in self._scan_modules(f)["modules"]:
+                    self._definitions.setdefault(m, f)
+        return self._definitions
+
+    def module_closure(self, module, stop=()):
+        """Units needed to elaborate module, in compilation order
+
+        These are the units defining module and every module it instantiates
+        (transitively, modules in stop are not descended into) and the units
+        providing the packages they import. Raises KeyError for an unknown
+        module.
+        """
+        definitions = self.module_definitions()
+        files, pending, seen = set(), [module], set()
+        while pending:
+            m = pending.pop()
+            if m in seen:
+                continue
+            seen.add(m)
+            f = definitions[m]
+            files.add(f)
+            for src in [f] + self.includes[f]:
+                pending += [i for i in self._scan_modules(src)["instances"]
+                            if i in definitions and i not in stop]
+        stack = list(files)
+        while stack:
+            for d in self.deps[stack.pop()]:
+                if d not in files:
+                    files.add(d)
+                    stack.append(d)
+        return self.order([f for f in self.files if f in files])
+
+    def partition(self, top, modules):
+        """Splits the units for synthesizing modules separately from top
+
+        Returns (top_files, {module: units}). top_files are all units except
+        those only needed by the separated modules. Raises KeyError for an
+        unknown module and ValueError if a separated module is defined in a
+        unit the rest of the design needs.
+        """
+        top_closure = set(self.module_closure(top, stop=modules))
+        closures = {m: self.module_closure(m) for m in modules}
+        definitions = self.module_definitions()
+        for m in modules:
+            if definitions[m] in top_closure:
+                raise ValueError(
+                    f"Module {m} is defined in {definitions[m]} which is also needed outside of it")
+        separate = set().union(*closures.values()) - top_closure
+        return [f for f in self.files if f not in separate], closures
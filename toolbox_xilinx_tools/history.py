@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""SQLite history of build metrics (runtime, timing, utilization, power)
+
+Every tool run is one row in runs (tool, job, git revision, time, status)
+with its metrics as (run_id, name, value) rows. Metric names are dotted,
+e.g. timing.post_route.wns, util.post_route.slice_luts, power.total_on_chip_power_w,
+stage.route_design.wall_s or bitstream.bytes.
+
+Tools with the history property enabled record every run (db default
+<work_dir>/build/history.sqlite) and warn about metrics more than threshold
+standard deviations worse than the mean of the previous window runs.
+"""
+
+# Imports - standard library
+from pathlib import Path
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.reports import build_index, load_index
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    tool TEXT NOT NULL,
+    job TEXT NOT NULL,
+    git_rev TEXT,
+    time REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_tool_job_time ON runs (tool, job, time);
+CREATE INDEX IF NOT EXISTS runs_git_rev ON runs (git_rev);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_name_run ON metrics (name, run_id);
+"""
+
+# Metrics for which a lower value is worse (slack), all others are costs
+HIGHER_IS_BETTER = (".wns", ".tns", ".whs", ".ths")
+# Utilization is reported for the last of these stages found
+UTIL_STAGES = ["post_route", "post_place", "post_opt", "post_synth"]
+POWER_KEYS = ["total_on_chip_power_w", "dynamic_w", "device_static_w", "junction_temperature_c"]
+
+
+def git_revision(directory="."):
+    """HEAD commit of the repository containing directory (+ "-dirty"), or None"""
+    try:
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=directory, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=directory, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{rev}-dirty" if dirty.strip() else rev
+
+
+def stage_metrics(fpath, prefix="stage"):
+    """Flat metrics from a stage_metrics.json written by monitor.StageMonitor
+
+    Repeated stages (e.g. phys_opt_design run twice) are summed, peak memory
+    is the maximum.
+    """
+    with open(fpath) as fp:
+        data = json.load(fp)
+    metrics = {}
+    for stage in data["stages"]:
+        for key in ["wall_s", "cpu_s"]:
+            name = f"{prefix}.{stage['stage']}.{key}"
+            metrics[name] = metrics.get(name, 0) + stage[key]
+        name = f"{prefix}.{stage['stage']}.peak_rss_mb"
+        metrics[name] = max(metrics.get(name, 0), stage["peak_rss_mb"])
+    for key in ["wall_s", "cpu_s", "peak_rss_mb"]:
+        metrics[f"total.{key}"] = data["total"][key]
+    return metrics
+
+
+def job_metrics(job_dir, top=None):
+    """Collects metrics of an implementation job dir
+
+    Uses report_index.json (indexed from reports/ if missing),
+    stage_metrics.json and the size of <top>.bit (any *.bit without top).
+    """
+    job_dir = Path(job_dir)
+    metrics = {}
+    index_file = job_dir / "report_index.json"
+    if index_file.is_file():
+        index = load_index(index_file)
+    elif (job_dir / "reports").is_dir():
+        index = build_index(job_dir / "reports")
+    else:
+        index = {}
+    for stage, summary in index.get("timing", {}).items():
+        for key in ["wns", "tns", "whs", "ths"]:
+            if summary and isinstance(summary.get(key), (int, float)):
+                metrics[f"timing.{stage}.{key}"] = summary[key]
+    util = index.get("utilization", {})
+    for stage in UTIL_STAGES:
+        if stage in util:
+            for site, row in util[stage].items():
+                if isinstance(row.get("util_pct"), (int, float)):
+                    metrics[f"util.{stage}.{site}"] = row["util_pct"]
+            break
+    for stage, closure in index.get("closure", {}).items():
+        metrics[f"closure.{stage}.passes"] = len(closure["passes"])
+        metrics[f"closure.{stage}.seconds"] = closure["seconds"]
+    power = index.get("power", {}).get("post_route") or {}
+    for key in POWER_KEYS:
+        if isinstance(power.get(key), (int, float)):
+            metrics[f"power.{key}"] = power[key]
+    if (job_dir / "stage_metrics.json").is_file():
+        metrics.update(stage_metrics(job_dir / "stage_metrics.json"))
+    bits = [job_dir / f"{top}.bit"] if top else sorted(job_dir.glob("*.bit"))
+    for bit in bits:
+        if bit.is_file():
+            metrics["bitstream.bytes"] = bit.stat().st_size
+            break
+    return metrics
+
+
+class History:
+    """Build metrics history in a sqlite database"""
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # Concurrent tools may record at the same time
+        self.conn = sqlite3.connect(self.db_path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def record(self, tool, job, metrics, git_rev=None, status="ok", timestamp=None):
+        """Stores one run with its metrics. Returns the run id"""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (tool, job, git_rev, time, status) VALUES (?, ?, ?, ?, ?)",
+                (tool, job, git_rev, time.time() if timestamp is None else timestamp, status))
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, k, v) for k, v in metrics.items()])
+        return run_id
+
+    def runs(self, tool, job, limit=20, before=None):
+        """Newest first list of {id, git_rev, time, status} of a tool/job"""
+        sql = "SELECT id, git_rev, time, status FROM runs WHERE tool = ? AND job = ?"
+        args = [tool, job]
+        if before is not None:
+            sql += " AND time < ?"
+            args.append(before)
+        sql += " ORDER BY time DESC LIMIT ?"
+        rows = self.conn.execute(sql, args + [limit]).fetchall()
+        return [dict(zip(["id", "git_rev", "time", "status"], r)) for r in rows]
+
+    def metrics(self, run_ids):
+        """{run_id: {name: value}} of the given runs"""
+        run_ids = list(run_ids)
+        result = {i: {} for i in run_ids}
+        if not run_ids:
+            return result
+        marks = ",".join("?" * len(run_ids))
+        for run_id, name, value in self.conn.execute(
+                f"SELECT run_id, name, value FROM metrics WHERE run_id IN ({marks})", run_ids):
+            result[run_id][name] = value
+        return result
+
+    def series(self, tool, job, name, limit=20):
+        """Newest first (git_rev, time, value) of one metric"""
+        return self.conn.execute(
+            "SELECT r.git_rev, r.time, m.value FROM runs r JOIN metrics m ON m.run_id = r.id "
+            "WHERE r.tool = ? AND r.job = ? AND m.name = ? ORDER BY r.time DESC LIMIT ?",
+            (tool, job, name, limit)).fetchall()
+
+    def regressions(self, tool, job, window=10, threshold=3.0, min_runs=3, min_change=0.02,
+                    run_id=None):
+        """Metrics of a run significantly worse than the previous window runs
+
+        A metric regresses if it is worse than the mean of the previous
+        successful runs by more than threshold standard deviations and by
+        more than min_change (relative to the mean, at least 1e-3 absolute).
+        The newest run is checked unless run_id is given. Returns a list of
+        {name, value, mean, stdev, z}, worst first.
+        """
+        if run_id is None:
+            latest = self.runs(tool, job, limit=1)
+            if not latest:
+                return []
+            run = latest[0]
+        else:
+            row = self.conn.execute("SELECT id, git_rev, time, status FROM runs WHERE id = ?",
+                                    (run_id, )).fetchone()
+            run = dict(zip(["id", "git_rev", "time", "status"], row))
+        previous = [r["id"] for r in self.runs(tool, job, limit=window, before=run["time"])
+                    if r["status"] == "ok"]
+        history = self.metrics(previous)
+        current = self.metrics([run["id"]])[run["id"]]
+        found = []
+        for name, value in current.items():
+            values = [history[i][name] for i in previous
+                      if history[i].get(name) is not None]
+            if value is None or len(values) < min_runs:
+                continue
+            mean = statistics.fmean(values)
+            stdev = statistics.stdev(values)
+            worse = mean - value if name.endswith(HIGHER_IS_BETTER) else value - mean
+            if worse <= max(min_change * abs(mean), 1e-3):
+                continue
+            z = worse / stdev if stdev > 0 else float("inf")
+            if z > threshold:
+                found.append({"name": name, "value": value, "mean": mean, "stdev": stdev, "z": z})
+        return sorted(found, key=lambda r: -r["z"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="history database")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record metrics of an implementation job dir")
+    rec.add_argument("job_dir")
+    rec.add_argument("--tool", default="implement")
+    rec.add_argument("--job", help="job name (default: job_dir)")
+    rec.add_argument("--top", help="top module (bitstream name)")
+    show = sub.add_parser("show", help="show recent values of a metric")
+    show.add_argument("tool")
+    show.add_argument("job")
+    show.add_argument("metric")
+    show.add_argument("-n", type=int, default=20)
+    check = sub.add_parser("check", help="flag regressions of the newest run (exit code 1)")
+    check.add_argument("tool")
+    check.add_argument("job")
+    check.add_argument("--window", type=int, default=10)
+    check.add_argument("--threshold", type=float, default=3.0)
+    check.add_argument("--min-change", type=float, default=0.02)
+    args = parser.parse_args(argv)
+    with History(args.db) as hist:
+        if args.command == "record":
+            metrics = job_metrics(args.job_dir, args.top)
+            run_id = hist.record(args.tool, args.job or args.job_dir, metrics,
+                                 git_revision(args.job_dir))
+            print(f"Recorded run {run_id} with {len(metrics)} metrics")
+        elif args.command == "show":
+            for rev, t, value in hist.series(args.tool, args.job, args.metric, args.n):
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(t))}  {(rev or '-')[:12]:12}  {value}")
+        else:
+            found = hist.regressions(args.tool, args.job, args.window, args.threshold,
+                                     min_change=args.min_change)
+            for r in found:
+                print(f"{r['name']}: {r['value']} (mean {r['mean']:.4g}, stdev {r['stdev']:.3g})")
+            print(f"{len(found)} regressions")
+            return 1 if found else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Batch programming of many hardware targets through the vivado hardware manager
+
+A hardware target is one JTAG chain. Devices of one chain are programmed
+one after another, independent chains are spread over workers. Every
+worker is one vivado process with a single hardware manager session (one
+connect_hw_server for all of its chains), so chains of different workers
+are programmed concurrently. Results are printed by the tcl as one
+UPLOAD_RESULT line per device and collected into a table.
+"""
+
+# Imports - standard library
+from contextlib import nullcontext
+from pathlib import Path
+import os
+import subprocess
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.jobs import run_parallel
+
+VERIFY_MODES = ["full", "crc", "none"]
+RESULT_FIELDS = ["target", "device", "status", "seconds", "verify", "message"]
+
+TCL_PROCS = r"""
+proc upload_result {target device status seconds verify message} {
+    set message [string map {"\n" " " "\t" " "} $message]
+    puts "UPLOAD_RESULT\t$target\t$device\t$status\t$seconds\t$verify\t$message"
+    flush stdout
+}
+
+proc upload_device {target device bitstream mask verify} {
+    set start [clock milliseconds]
+    set rc [catch {
+        if {$device eq ""} {
+            set dev [lindex [get_hw_devices -of_objects [current_hw_target]] 0]
+        } else {
+            set dev [get_hw_devices -of_objects [current_hw_target] $device]
+        }
+        if {$dev eq ""} {
+            error "device not found on target"
+        }
+        set device [get_property NAME $dev]
+        current_hw_device $dev
+        if {$mask ne ""} {
+            create_hw_bitstream -hw_device $dev -mask $mask $bitstream
+        } else {
+            create_hw_bitstream -hw_device $dev $bitstream
+        }
+        program_hw_devices $dev
+        refresh_hw_device $dev
+        if {$verify eq "full"} {
+            verify_hw_devices -verbose $dev
+        } elseif {$verify eq "crc"} {
+            if {[get_property REGISTER.CONFIG_STATUS.BIT00_CRC_ERROR $dev] != 0} {
+                error "readback CRC error"
+            }
+            if {[get_property REGISTER.CONFIG_STATUS.BIT14_DONE_PIN $dev] != 1} {
+                error "DONE pin not high"
+            }
+        }
+    } err]
+    set seconds [format %.3f [expr {([clock milliseconds] - $start) / 1000.0}]]
+    if {$rc} {
+        upload_result $target $device failed $seconds $verify $err
+    } else {
+        upload_result $target $device ok $seconds $verify ""
+    }
+}
+
+proc upload_chain {target frequency devices} {
+    if {[catch {
+        current_hw_target [get_hw_targets $target]
+        if {$frequency ne ""} {
+            set_property PARAM.FREQUENCY $frequency [current_hw_target]
+        }
+        open_hw_target
+    } err]} {
+        foreach d $devices {
+            upload_result $target [lindex $d 0] failed 0.000 [lindex $d 3] "open_hw_target: $err"
+        }
+        return
+    }
+    foreach d $devices {
+        upload_device $target {*}$d
+    }
+    catch {close_hw_target}
+}
+"""
+
+
+def tcl_word(value):
+    """Value as a single braced tcl word"""
+    value = "" if value is None else str(value)
+    return "{" + value.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}") + "}"
+
+
+def group_chains(mappings, verify="full", frequency=None):
+    """Groups target mappings into chains: [{target, frequency, devices}]
+
+    A mapping has target, bitstream and optionally device, mask, verify
+    and frequency. Full verification needs a mask, mappings without one
+    fall back to crc verification.
+    """
+    chains = {}
+    for m in mappings:
+        mode = m.get("verify") or verify
+        if mode not in VERIFY_MODES:
+            raise ValueError(f"Unknown verify mode {mode} for target {m['target']}")
+        if mode == "full" and not m.get("mask"):
+            mode = "crc"
+        chain = chains.setdefault(m["target"], {"target": m["target"],
+                                                "frequency": m.get("frequency") or frequency,
+                                                "devices": []})
+        chain["devices"].append({"device": m.get("device"),
+                                 "bitstream": os.path.realpath(m["bitstream"]),
+                                 "mask": os.path.realpath(m["mask"]) if m.get("mask") else None,
+                                 "verify": mode})
+    return list(chains.values())
+
+
+def plan_workers(chains, workers):
+    """Spreads chains over at most workers lists balancing device counts"""
+    plan = [[] for _ in range(max(1, min(workers, len(chains))))]
+    for chain in sorted(chains, key=lambda c: -len(c["devices"])):
+        min(plan, key=lambda p: sum(len(c["devices"]) for c in p)).append(chain)
+    return [p for p in plan if p]
+
+
+def batch_script(chains, hostname="localhost", port=3121, prelude=None):
+    """Tcl programming chains within one hardware manager session"""
+    lines = [f"source {tcl_word(prelude)}"] if prelude else []
+    lines += [TCL_PROCS.strip(), "", "open_hw_manager",
+              f"connect_hw_server -url {hostname}:{port}"]
+    for chain in chains:
+        devices = " ".join(
+            "{" + " ".join(tcl_word(d[k]) for k in ["device", "bitstream", "mask", "verify"]) + "}"
+            for d in chain["devices"])
+        lines.append(f"upload_chain {tcl_word(chain['target'])} {tcl_word(chain['frequency'])} [list {devices}]")
+    lines += ["disconnect_hw_server", "close_hw_manager", ""]
+    return "\n".join(lines)
+
+
+def parse_results(text):
+    """UPLOAD_RESULT lines of tool output as list of result dicts"""
+    results = []
+    for line in text.splitlines():
+        if line.startswith("UPLOAD_RESULT\t"):
+            fields = line.split("\t")[1:]
+            fields += [""] * (len(RESULT_FIELDS) - len(fields))
+            result = dict(zip(RESULT_FIELDS, fields))
+            result["seconds"] = float(result["seconds"] or 0)
+            results.append(result)
+    return results
+
+
+def format_table(results):
+    """Results as fixed width text table"""
+    rows = [["target", "device", "status", "time [s]", "verify", "message"]]
+    rows += [[r["target"], r["device"], r["status"], f"{r['seconds']:.1f}", r["verify"], r["message"]]
+             for r in results]
+    widths = [max(len(str(r[i])) for r in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(str(c).ljust(w) for c, w in zip(r, widths)).rstrip() for r in rows)
+
+
+def complete_results(chains, results, reason):
+    """results plus a failed result for every device of chains without one"""
+    complete = []
+    for chain in chains:
+        done = [r for r in results if r["target"] == chain["target"]]
+        complete += done
+        for d in chain["devices"][len(done):]:
+            complete.append({"target": chain["target"], "device": d["device"] or "",
+                             "status": "failed", "seconds": 0.0, "verify": d["verify"],
+                             "message": str(reason)})
+    return complete
+
+
+def run_batch(chains, directory, command_for, workers=1, hostname="localhost", port=3121,
+              prelude=None, slot=None):
+    """Programs chains with up to workers concurrent hardware manager sessions
+
+    command_for(script, index) returns the argument list running a tcl
+    script (e.g. vivado -mode batch -source script). slot is an optional
+    callable returning a context manager held while a worker runs. Devices
+    whose result is missing (worker crashed) are reported as failed.
+    Returns list of result dicts in chain order.
+    """
+    plan = plan_workers(chains, workers)
+
+    def worker(i):
+        script = Path(directory, f"upload_batch_{i}.tcl")
+        script.write_text(batch_script(plan[i], hostname, port, prelude))
+        with slot() if slot else nullcontext():
+            proc = subprocess.run(command_for(str(script), i), cwd=directory,
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        Path(directory, f"upload_batch_{i}.out").write_text(proc.stdout)
+        return proc.returncode, parse_results(proc.stdout)
+
+    outcome = run_parallel(worker, range(len(plan)), len(plan))
+    results = []
+    for i, chains_i in enumerate(plan):
+        (rc, found), error = outcome[i] if outcome[i][1] is None else ((None, []), outcome[i][1])
+        reason = error or f"no result (worker exited with {rc}, see upload_batch_{i}.out)"
+        results += complete_results(chains_i, found, reason)
+    order = {c["target"]: i for i, c in enumerate(chains)}
+    return sorted(results, key=lambda r: order[r["target"]])
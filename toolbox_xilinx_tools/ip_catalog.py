@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""SQLite catalog of IP CONFIG properties per vlnv and part
+
+Harvested from vivado: report_property of a freshly created ip (type,
+read-only flag and default of every property) and list_property_value of
+every CONFIG property (legal values of enumerated properties). With the
+catalog ip blocks are validated and stripped of default valued properties
+without starting vivado. Everything is recorded for the default
+configuration, so defaults, read-only flags and legal values of dependent
+properties (derived from other CONFIG values) may differ for a block.
+"""
+
+# Imports - standard library
+from difflib import get_close_matches
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cores (
+    vlnv TEXT NOT NULL,
+    part TEXT NOT NULL,
+    time REAL NOT NULL,
+    PRIMARY KEY (vlnv, part)
+);
+CREATE TABLE IF NOT EXISTS properties (
+    vlnv TEXT NOT NULL,
+    part TEXT NOT NULL,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    read_only INTEGER NOT NULL,
+    default_value TEXT NOT NULL,
+    legal_values TEXT NOT NULL,
+    PRIMARY KEY (vlnv, part, key)
+) WITHOUT ROWID;
+"""
+
+NUMERIC_TYPES = {"int": int, "long": int, "double": float, "float": float}
+
+
+def dump_tcl(ip, report_file, values_file):
+    """Tcl writing the catalog source files of ip (run right after create_ip)"""
+    return "\n".join([
+        f"report_property -file {report_file} [get_ips {ip}] CONFIG.*",
+        f"set catalog_fp [open {values_file} w]",
+        f"foreach p [list_property [get_ips {ip}] CONFIG.*] {{",
+        f"    puts $catalog_fp \"$p\\t[list_property_value -quiet $p [get_ips {ip}]]\"",
+        "}",
+        "close $catalog_fp"])
+
+
+def parse_report_property(text):
+    """{name: {type, read_only, default}} of the CONFIG properties in report_property output
+
+    Columns are Property, Type, Read-only and Value. Values may contain
+    spaces (everything after the read-only column).
+    """
+    props = {}
+    for line in text.splitlines():
+        fields = line.split(None, 3)
+        if len(fields) < 3 or not fields[0].startswith("CONFIG."):
+            continue
+        props[fields[0][len("CONFIG."):]] = {
+            "type": fields[1],
+            "read_only": fields[2] == "true",
+            "default": fields[3].strip() if len(fields) > 3 else ""}
+    return props
+
+
+def parse_legal_values(text):
+    """{name: [values]} from the values file written by dump_tcl"""
+    values = {}
+    for line in text.splitlines():
+        name, _, rest = line.partition("\t")
+        if name.startswith("CONFIG."):
+            values[name[len("CONFIG."):]] = rest.split()
+    return values
+
+
+def same_value(prop, value):
+    """True if value (from the configuration) equals the default of prop"""
+    default, value = prop["default"], str(value)
+    if prop["type"] == "bool" or value.lower() in ("true", "false"):
+        return default.lower() == value.lower()
+    if prop["type"] in NUMERIC_TYPES:
+        try:
+            return float(default) == float(value)
+        except ValueError:
+            return False
+    return default == value
+
+
+class IPCatalog:
+    """Catalog database (use as context manager or call close)"""
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def store(self, vlnv, part, props, legal_values=None):
+        """Replaces the catalog entry of vlnv/part"""
+        legal_values = legal_values or {}
+        with self.conn:
+            self.conn.execute("DELETE FROM properties WHERE vlnv = ? AND part = ?", (vlnv, part))
+            self.conn.execute("INSERT OR REPLACE INTO cores VALUES (?, ?, ?)",
+                              (vlnv, part, time.time()))
+            self.conn.executemany(
+                "INSERT INTO properties VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(vlnv, part, name.lower(), name, p["type"], int(p["read_only"]),
+                  p["default"], json.dumps(legal_values.get(name, [])))
+                 for name, p in props.items()])
+
+    def harvest(self, vlnv, part, report_file, values_file=None):
+        """Stores the entry parsed from files written by dump_tcl, returns property count"""
+        with open(report_file, errors="replace") as fp:
+            props = parse_report_property(fp.read())
+        legal_values = {}
+        if values_file:
+            with open(values_file, errors="replace") as fp:
+                legal_values = parse_legal_values(fp.read())
+        if props:
+            self.store(vlnv, part, props, legal_values)
+        return len(props)
+
+    def get(self, vlnv, part):
+        """{lower case name: {name, type, read_only, default, values}} or None"""
+        rows = self.conn.execute(
+            "SELECT key, name, type, read_only, default_value, legal_values FROM properties "
+            "WHERE vlnv = ? AND part = ?", (vlnv, part)).fetchall()
+        if not rows:
+            return None
+        return {key: {"name": name, "type": typ, "read_only": bool(ro),
+                      "default": default, "values": json.loads(values)}
+                for key, name, typ, ro, default, values in rows}
+
+    def cores(self):
+        return self.conn.execute("SELECT vlnv, part FROM cores ORDER BY vlnv, part").fetchall()
+
+
+def validate(entry, properties):
+    """Error messages for properties ([{name, value}]) against a catalog entry
+
+    Only problems that do not depend on other properties: unknown names
+    and values that are not of a numeric property's type.
+    """
+    errors = []
+    for p in properties:
+        prop = entry.get(p["name"].lower())
+        if prop is None:
+            hint = get_close_matches(p["name"], [e["name"] for e in entry.values()], 1)
+            errors.append(f"unknown property {p['name']}" +
+                          (f" (did you mean {hint[0]}?)" if hint else ""))
+        elif prop["type"] in NUMERIC_TYPES:
+            try:
+                NUMERIC_TYPES[prop["type"]](str(p["value"]))
+            except ValueError:
+                errors.append(f"{prop['name']} = {p['value']} is not of type {prop['type']}")
+    return errors
+
+
+def check_values(entry, properties):
+    """Warnings for read-only properties and values outside the catalogued legal values
+
+    Catalog entries are harvested from a core in its default configuration.
+    Many properties are dependent (editability and legal values follow other
+    CONFIG values), so these are hints, not errors.
+    """
+    warnings = []
+    for p in properties:
+        prop = entry.get(p["name"].lower())
+        if prop is None:
+            continue
+        value = str(p["value"])
+        if prop["read_only"]:
+            warnings.append(f"property {prop['name']} is read-only in the default configuration")
+        elif prop["values"] and not any(same_value(dict(prop, default=v), value)
+                                        for v in prop["values"]):
+            shown = ", ".join(prop["values"][:10]) + (", ..." if len(prop["values"]) > 10 else "")
+            warnings.append(f"{prop['name']} = {value} is not one of {shown} (default configuration)")
+    return warnings
+
+
+def drop_defaults(entry, properties):
+    """(properties not equal to their default, names of dropped properties)"""
+    kept, dropped = [], []
+    for p in properties:
+        prop = entry.get(p["name"].lower())
+        if prop is not None and same_value(prop, p["value"]):
+            dropped.append(p["name"])
+        else:
+            kept.append(p)
+    return kept, dropped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="catalog sqlite file")
+    parser.add_argument("vlnv", nargs="?", help="show properties of this ip (default list cores)")
+    parser.add_argument("part", nargs="?")
+    args = parser.parse_args(argv)
+    with IPCatalog(args.db) as catalog:
+        if not args.vlnv:
+            for vlnv, part in catalog.cores():
+                print(f"{vlnv} {part}")
+            return 0
+        parts = [args.part] if args.part else [p for v, p in catalog.cores() if v == args.vlnv]
+        for part in parts:
+            entry = catalog.get(args.vlnv, part) or {}
+            for prop in sorted(entry.values(), key=lambda p: p["name"]):
+                ro = " (read-only)" if prop["read_only"] else ""
+                values = f" [{' '.join(prop['values'])}]" if prop["values"] else ""
+                print(f"{part} {prop['name']} {prop['type']}{ro} = {prop['default']}{values}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
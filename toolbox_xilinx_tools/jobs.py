@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Bounded worker pool for running independent tool processes concurrently"""
+
+# Imports - standard library
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+
+def available_memory():
+    """Available memory in bytes (None if it cannot be determined)"""
+    try:
+        with open("/proc/meminfo") as fp:
+            for line in fp:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def max_workers(mem_per_job=None, limit=None):
+    """Number of concurrent jobs the host can sustain
+
+    Bounded by cpu count, by available memory divided by mem_per_job (bytes)
+    when given and by limit when given. Always at least 1.
+    """
+    workers = os.cpu_count() or 1
+    mem = available_memory()
+    if mem_per_job and mem is not None:
+        workers = min(workers, int(mem // mem_per_job))
+    if limit is not None:
+        workers = min(workers, limit)
+    return max(1, workers)
+
+
+def run_parallel(func, items, workers):
+    """Calls func(item) for every item with at most workers in flight
+
+    Returns {item_index: (result, exception)}. An exception in one job never
+    cancels the others.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = (future.result(), None)
+            except Exception as e:
+                results[i] = (None, e)
+    return results
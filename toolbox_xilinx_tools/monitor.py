@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Runs a tool process while streaming its log and recording per stage metrics
+
+Stage boundaries are recognised from the tool output (vivado prints
+"Command: <cmd>" and batch mode echoes sourced commands as "# <cmd>"). The
+process tree is sampled through /proc for cpu time and resident memory, and
+one record per stage (wall time, cpu time, peak rss) is written as json
+(stage_metrics.json in the job dir of the tools, synth_ip and
+generate_target stages per ip block). The tools' monitor.interval is the
+/proc sampling period in seconds.
+The total cpu time also counts the rusage of the monitored process itself
+(not of other children of this process, e.g. concurrent monitored runs).
+"""
+
+# Imports - standard library
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+# Commands that start a new stage in vivado output
+VIVADO_STAGE_RE = re.compile(
+    r"^(?:Command:|#)\s*(synth_design|opt_design|power_opt_design|place_design|"
+    r"phys_opt_design|route_design|write_bitstream|generate_target|synth_ip|"
+    r"program_hw_devices|verify_hw_devices)\b(.*)$")
+IP_NAME_RE = re.compile(r"get_ips\s+\{?([\w.]+)")
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def vivado_stage(line):
+    """Stage name started by an output line (None if no new stage)
+
+    synth_ip/generate_target stages are qualified with the ip name.
+    """
+    m = VIVADO_STAGE_RE.match(line)
+    if not m:
+        return None
+    stage = m.group(1)
+    ip = IP_NAME_RE.search(m.group(2))
+    if ip and stage in ["synth_ip", "generate_target"]:
+        stage = f"{stage}:{ip.group(1)}"
+    return stage
+
+
+def process_tree(pid):
+    """pid and all of its descendants (linux /proc)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fp:
+                stat = fp.read()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(children.get(p, []))
+    return tree
+
+
+def sample_tree(pid):
+    """(cpu seconds, rss bytes) summed over the process tree of pid"""
+    cpu, rss = 0.0, 0
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as fp:
+                fields = fp.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{p}/statm") as fp:
+                resident = int(fp.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        # utime, stime, cutime, cstime (fields 14-17 of stat)
+        cpu += sum(int(f) for f in fields[11:15]) / CLK_TCK
+        rss += resident * PAGE_SIZE
+    return cpu, rss
+
+
+class StageMonitor:
+    """Runs command, tees its output and records metrics per stage"""
+    def __init__(self, command, directory=None, log_file=None,
+                 stage_func=vivado_stage, on_stage=None, echo=True, interval=1.0):
+        self.command = command
+        self.directory = directory
+        self.log_file = log_file
+        self.stage_func = stage_func
+        self.on_stage = on_stage
+        self.echo = echo
+        self.interval = interval
+        self.stages = []
+        self.total = None
+        self._lock = threading.Lock()
+        self._peak = 0
+        self._cpu = 0.0
+
+    def _start_stage(self, name):
+        now = time.time()
+        with self._lock:
+            self._close_stage(now)
+            self.stages.append({"stage": name, "start": now, "cpu_start": self._cpu})
+            self._peak = 0
+        if self.on_stage:
+            self.on_stage(name, self.stages[-2] if len(self.stages) > 1 else None)
+
+    def _close_stage(self, now):
+        if self.stages and "wall_s" not in self.stages[-1]:
+            stage = self.stages[-1]
+            stage["wall_s"] = round(now - stage["start"], 3)
+            stage["cpu_s"] = round(self._cpu - stage.pop("cpu_start"), 3)
+            stage["peak_rss_mb"] = round(self._peak / 2**20, 1)
+
+    def _sampler(self, pid, done):
+        overall_peak = 0
+        while not done.is_set():
+            cpu, rss = sample_tree(pid)
+            with self._lock:
+                self._cpu = max(self._cpu, cpu)
+                self._peak = max(self._peak, rss)
+                overall_peak = max(overall_peak, rss)
+                self._overall_peak = overall_peak
+            done.wait(self.interval)
+
+    def run(self):
+        """Runs command to completion. Returns its exit code"""
+        self._overall_peak = 0
+        start = time.time()
+        proc = subprocess.Popen(self.command, cwd=self.directory,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, bufsize=1)
+        done = threading.Event()
+        sampler = threading.Thread(target=self._sampler, args=(proc.pid, done), daemon=True)
+        sampler.start()
+        log = open(self.log_file, "w") if self.log_file else None
+        try:
+            for line in proc.stdout:
+                if log:
+                    log.write(line)
+                    log.flush()
+                if self.echo:
+                    sys.stdout.write(line)
+                stage = self.stage_func(line)
+                if stage:
+                    self._start_stage(stage)
+            # rusage of this child (and the descendants it waited for) only
+            _, status, usage = os.wait4(proc.pid, 0)
+            rc = proc.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            done.set()
+            sampler.join()
+            if log:
+                log.close()
+        end = time.time()
+        with self._lock:
+            self._close_stage(end)
+        for stage in self.stages:
+            stage["start"] = round(stage["start"] - start, 3)
+        self.total = {"wall_s": round(end - start, 3),
+                      "cpu_s": round(max(self._cpu, usage.ru_utime + usage.ru_stime), 3),
+                      "peak_rss_mb": round(self._overall_peak / 2**20, 1),
+                      "returncode": rc}
+        return rc
+
+    def write(self, fpath):
+        """Writes {"command", "total", "stages"} as json"""
+        with open(fpath, "w") as fp:
+            json.dump({"command": self.command, "total": self.total, "stages": self.stages},
+                      fp, indent=2)
+
+
+def run_monitored(command, directory, metrics_file, log=print, interval=1.0, echo=True):
+    """Runs command with a StageMonitor, logging stage boundaries
+
+    command is an argument list or a shell style string (e.g. from
+    BinaryDriver.get_execute_string()). Metrics are written to metrics_file.
+    Returns the exit code.
+    """
+    if isinstance(command, str):
+        command = shlex.split(command)
+
+    def finished(stage):
+        log(f"Stage {stage['stage']} finished: {stage['wall_s']:.1f} s wall, "
+            f"{stage['cpu_s']:.1f} s cpu, {stage['peak_rss_mb']:.0f} MB peak")
+
+    def on_stage(name, previous):
+        if previous is not None:
+            finished(previous)
+        log(f"Stage {name} started")
+
+    mon = StageMonitor(command, directory, on_stage=on_stage, echo=echo, interval=interval)
+    rc = mon.run()
+    if mon.stages:
+        finished(mon.stages[-1])
+    mon.write(metrics_file)
+    log(f"Total: {mon.total['wall_s']:.1f} s wall, {mon.total['cpu_s']:.1f} s cpu, "
+        f"{mon.total['peak_rss_mb']:.0f} MB peak (metrics in {metrics_file})")
+    return rc
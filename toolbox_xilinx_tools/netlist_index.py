@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Index of ports, cells, pins and nets of a structural verilog netlist
+
+Built from the netlist vivado writes with write_verilog (e.g.
+<top>_post_synth.v) and flattened from the top module with vivado's
+hierarchical names (u_core/u_fifo/data_reg[3]/C). Used to check the objects
+queried by generated constraints before vivado runs.
+"""
+
+# Imports - standard library
+from difflib import get_close_matches
+import argparse
+import json
+import os
+import re
+import sys
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+KINDS = ["ports", "cells", "pins", "nets"]
+
+TOKEN_RE = re.compile(r"\"[^\"]*\"|\\\S+|[A-Za-z_][\w$]*|\d*'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+|\d+|\S")
+COMMENT_RE = re.compile(r"//[^\n]*|`[^\n]*|/\*.*?\*/|\(\*.*?\*\)", re.S)
+DECLARATIONS = {"input", "output", "inout", "wire", "reg", "tri", "supply0", "supply1"}
+PORT_DIRECTIONS = {"input", "output", "inout"}
+SKIPPED = {"assign", "parameter", "localparam", "defparam", "timescale", "specify",
+           "initial", "always", "genvar"}
+
+
+def tokens(text):
+    """Verilog tokens of text without comments, directives and attributes (escaped names unescaped)"""
+    for tok in TOKEN_RE.findall(COMMENT_RE.sub(" ", text)):
+        yield tok[1:] if tok.startswith("\\") else tok
+
+
+def statements(text):
+    """Token lists of the statements (terminated by ; or endmodule) in text"""
+    stmt = []
+    for tok in tokens(text):
+        if tok == "endmodule":
+            if stmt:
+                yield stmt
+            yield [tok]
+            stmt = []
+        elif tok == ";":
+            yield stmt
+            stmt = []
+        else:
+            stmt.append(tok)
+    if stmt:
+        yield stmt
+
+
+def closing(toks, i):
+    """Index of the bracket closing the one at toks[i]"""
+    pairs = {"(": ")", "[": "]", "{": "}"}
+    depth = 0
+    for j in range(i, len(toks)):
+        if toks[j] in pairs:
+            depth += 1
+        elif toks[j] in pairs.values():
+            depth -= 1
+            if depth == 0:
+                return j
+    raise ValueError(f"unbalanced {toks[i]} in {' '.join(toks[:8])} ...")
+
+
+def parse_range(toks, i):
+    """(width, index after range) of a [msb:lsb] range at toks[i] (width 0 if none)"""
+    if i < len(toks) and toks[i] == "[":
+        end = closing(toks, i)
+        inner = toks[i + 1:end]
+        if ":" in inner and all(t.isdigit() for t in inner if t != ":"):
+            msb, lsb = inner[0], inner[-1]
+            return abs(int(msb) - int(lsb)) + 1, end + 1
+        return 0, end + 1
+    return 0, i
+
+
+def expr_width(toks, widths):
+    """Bit width of a connection expression (sum over concatenation items)"""
+    if not toks:
+        return 0
+    if toks[0] == "{":
+        items, depth, current = [], 0, []
+        for t in toks[1:-1]:
+            if t in "({[":
+                depth += 1
+            elif t in ")}]":
+                depth -= 1
+            if t == "," and depth == 0:
+                items.append(current)
+                current = []
+            else:
+                current.append(t)
+        items.append(current)
+        return sum(expr_width(i, widths) for i in items)
+    m = re.match(r"^(\d+)'", toks[0])
+    if m:
+        return int(m.group(1))
+    if len(toks) > 1 and toks[1] == "[":
+        width, _ = parse_range(toks, 1)
+        return width or 1
+    return widths.get(toks[0], 1) or 1
+
+
+def parse_modules(text):
+    """{module: {ports: {name: width}, nets: {name: width}, instances: [(type, name, {pin: width})]}}
+
+    Width 0 means scalar.
+    """
+    modules, current = {}, None
+    for stmt in statements(text):
+        head = stmt[0] if stmt else ""
+        if head == "module":
+            current = {"ports": {}, "nets": {}, "instances": []}
+            modules[stmt[1]] = current
+            continue
+        if head == "endmodule" or current is None or not head or head in SKIPPED:
+            if head == "endmodule":
+                current = None
+            continue
+        if head in DECLARATIONS:
+            i = 1
+            while i < len(stmt) and stmt[i] in ("wire", "reg", "signed"):
+                i += 1
+            width, i = parse_range(stmt, i)
+            for name in stmt[i:]:
+                if name == ",":
+                    continue
+                if name == "=":
+                    break
+                current["nets"][name] = width
+                if head in PORT_DIRECTIONS:
+                    current["ports"][name] = width
+            continue
+        # Instance: type [#(params)] name [range] (connections)
+        i = 1
+        if i < len(stmt) and stmt[i] == "#":
+            i = closing(stmt, i + 1) + 1
+        if i + 1 >= len(stmt):
+            continue
+        name = stmt[i]
+        _, i = parse_range(stmt, i + 1)
+        if i >= len(stmt) or stmt[i] != "(":
+            continue
+        end = closing(stmt, i)
+        pins, j = {}, i + 1
+        while j < end:
+            if stmt[j] == "." and j + 2 < end and stmt[j + 2] == "(":
+                close = closing(stmt, j + 2)
+                pins[stmt[j + 1]] = stmt[j + 3:close]
+                j = close + 1
+            else:
+                j += 1
+        current["instances"].append((head, name, pins))
+    for module in modules.values():
+        module["instances"] = [
+            (typ, name, {pin: expr_width(expr, module["nets"]) for pin, expr in pins.items()})
+            for typ, name, pins in module["instances"]]
+    return modules
+
+
+def add_bits(names, name, width):
+    names.add(name)
+    for i in range(width):
+        names.add(f"{name}[{i}]")
+
+
+def find_top(modules):
+    instantiated = {typ for m in modules.values() for typ, _, _ in m["instances"]}
+    tops = [m for m in modules if m not in instantiated]
+    return tops[-1] if tops else None
+
+
+def pattern_re(pattern, hierarchical=False):
+    """Regex of a vivado name pattern (* and ? are wildcards, brackets are literal)
+
+    Hierarchical patterns also match at every level of the hierarchy.
+    """
+    body = "".join(".*" if c == "*" else "." if c == "?" else re.escape(c) for c in pattern)
+    return re.compile(f"(?:.*/)?{body}$" if hierarchical else f"{body}$")
+
+
+class NetlistIndex:
+    """Sets of port, cell, pin and net names (bus names are included with their bits)"""
+    def __init__(self, ports=(), cells=(), pins=(), nets=(), meta=None):
+        self.sets = {"ports": set(ports), "cells": set(cells), "pins": set(pins),
+                     "nets": set(nets)}
+        self.meta = meta or {}
+        self._suffixes = {}
+
+    @classmethod
+    def from_netlist(cls, fpath, top=None, meta=None):
+        with open(fpath, errors="replace") as fp:
+            modules = parse_modules(fp.read())
+        top = top or find_top(modules)
+        if top not in modules:
+            raise ValueError(f"top module {top} not found in {fpath}")
+        index = cls(meta=meta)
+        ports = index.sets["ports"]
+        for name, width in modules[top]["ports"].items():
+            add_bits(ports, name, width)
+        index._flatten(modules, top, "")
+        return index
+
+    def _flatten(self, modules, module, prefix):
+        cells, pins, nets = self.sets["cells"], self.sets["pins"], self.sets["nets"]
+        for name, width in modules[module]["nets"].items():
+            add_bits(nets, prefix + name, width)
+        for typ, name, conns in modules[module]["instances"]:
+            path = prefix + name
+            cells.add(path)
+            if typ in modules:
+                for port, width in modules[typ]["ports"].items():
+                    add_bits(pins, f"{path}/{port}", width)
+                self._flatten(modules, typ, path + "/")
+            else:
+                for pin, width in conns.items():
+                    add_bits(pins, f"{path}/{pin}", width if width > 1 else 0)
+
+    @classmethod
+    def load(cls, fpath):
+        with open(fpath) as fp:
+            data = json.load(fp)
+        return cls(*(data.get(k, []) for k in KINDS), meta=data.get("meta"))
+
+    def save(self, fpath):
+        os.makedirs(os.path.dirname(os.path.abspath(fpath)), exist_ok=True)
+        tmp = f"{fpath}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fp:
+            json.dump(dict({k: sorted(self.sets[k]) for k in KINDS}, meta=self.meta), fp)
+        os.replace(tmp, fpath)
+
+    def suffixes(self, kind):
+        """Names of kind without every leading hierarchy level (for -hierarchical lookups)"""
+        if kind not in self._suffixes:
+            result = set()
+            for name in self.sets[kind]:
+                pos = name.find("/")
+                while pos != -1:
+                    result.add(name[pos + 1:])
+                    pos = name.find("/", pos + 1)
+            self._suffixes[kind] = result
+        return self._suffixes[kind]
+
+    def matches(self, kind, pattern, hierarchical=False):
+        """True if pattern (vivado get_<kind> pattern) matches at least one object"""
+        names = self.sets[kind]
+        if "*" not in pattern and "?" not in pattern:
+            return pattern in names or (hierarchical and pattern in self.suffixes(kind))
+        regex = pattern_re(pattern, hierarchical)
+        return any(regex.match(n) for n in names)
+
+    def suggest(self, kind, pattern):
+        """Closest name of kind to pattern (or None)"""
+        leaf = pattern.rsplit("/", 1)[-1]
+        same_leaf = [n for n in self.sets[kind] if n.rsplit("/", 1)[-1] == leaf]
+        hits = get_close_matches(pattern, same_leaf or self.sets[kind], 1, 0.6)
+        return hits[0] if hits else None
+
+
+def lint(index, targets):
+    """Problems of constraint targets against index
+
+    targets are dicts with source (where the query comes from, e.g.
+    'primary clock sys_clk'), kind (ports/cells/pins/nets), names (list of
+    patterns) and hierarchical. Returns a list of messages.
+    """
+    problems = []
+    for t in targets:
+        for name in t["names"]:
+            if index.matches(t["kind"], name, t.get("hierarchical", False)):
+                continue
+            query = f"get_{t['kind']}{' -hierarchical' if t.get('hierarchical') else ''} {name}"
+            hint = index.suggest(t["kind"], name)
+            problems.append(f"{t['source']}: [{query}] matches no {t['kind'][:-1]}" +
+                            (f" (did you mean {hint}?)" if hint else ""))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("netlist", help="structural verilog netlist or saved index (.json)")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("patterns", nargs="+")
+    parser.add_argument("--top", help="top module (default the module not instantiated)")
+    parser.add_argument("--hierarchical", action="store_true")
+    args = parser.parse_args(argv)
+    if args.netlist.endswith(".json"):
+        index = NetlistIndex.load(args.netlist)
+    else:
+        index = NetlistIndex.from_netlist(args.netlist, args.top)
+    problems = lint(index, [{"source": "query", "kind": args.kind, "names": args.patterns,
+                             "hierarchical": args.hierarchical}])
+    for p in problems:
+        print(p)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Dependency pipeline of tools and tool steps
+
+Nodes declare the files they read (inputs) and write (outputs) as paths,
+directories or glob patterns. A node runs after every node producing one of
+its inputs and after the nodes named in after. Independent nodes run
+concurrently. A node is skipped while its outputs exist and the digest of
+its inputs and signature equals the one recorded after its last successful
+run, so only the out-of-date part of the graph is executed.
+"""
+
+# Imports - standard library
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fnmatch import fnmatch
+from pathlib import Path
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.build_cache import hash_file
+
+GLOB_CHARS = "*?["
+
+
+class PipelineError(Exception):
+    def __init__(self, msg, status=None):
+        super().__init__(msg)
+        self.status = status or {}
+
+
+class Node:
+    """One unit of work of a pipeline
+
+    func is called without arguments. signature is any json serializable
+    value (e.g. the tool configuration) that is part of the digest. A node
+    without inputs, outputs and signature, or with always set, is never up
+    to date.
+    """
+    def __init__(self, name, func, inputs=(), outputs=(), after=(), signature=None,
+                 always=False):
+        self.name = name
+        self.func = func
+        self.inputs = [os.path.abspath(p) for p in inputs]
+        self.outputs = [os.path.abspath(p) for p in outputs]
+        self.after = list(after)
+        self.signature = signature
+        self.always = always or not (self.inputs or self.outputs or signature is not None)
+
+    def __repr__(self):
+        return f"Node({self.name})"
+
+
+def overlaps(a, b):
+    """True if path/pattern a and path/pattern b can name the same file"""
+    a, b = a.rstrip("/"), b.rstrip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/") or \
+        fnmatch(a, b) or fnmatch(b, a)
+
+
+def expand(pattern):
+    """Files named by a path, directory or glob pattern (sorted)"""
+    if any(c in pattern for c in GLOB_CHARS):
+        matches = sorted(glob.glob(pattern, recursive=True))
+    else:
+        matches = [pattern] if os.path.exists(pattern) else []
+    files = []
+    for m in matches:
+        if os.path.isdir(m):
+            files += sorted(str(f) for f in Path(m).glob("**/*") if f.is_file())
+        else:
+            files.append(m)
+    return files
+
+
+class Pipeline:
+    """Runs nodes in dependency order with up to workers nodes in flight
+
+    Digests of successful runs (and a size/mtime keyed digest memo of input
+    files) are kept in state_file. Without state_file every node runs.
+    """
+    def __init__(self, state_file=None, workers=None, log=print):
+        self.nodes = {}
+        self.state_file = state_file
+        self.workers = workers or os.cpu_count() or 1
+        self.log = log
+        self._lock = threading.Lock()
+        self.state = {"stamps": {}, "files": {}}
+        if state_file and os.path.isfile(state_file):
+            with open(state_file) as fp:
+                self.state.update(json.load(fp))
+
+    def add(self, node):
+        if node.name in self.nodes:
+            raise PipelineError(f"Duplicate pipeline node {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    def prerequisites(self):
+        """{name: set of names of nodes that must finish first}"""
+        deps = {}
+        for node in self.nodes.values():
+            unknown = [a for a in node.after if a not in self.nodes]
+            if unknown:
+                raise PipelineError(f"Node {node.name} runs after unknown node(s) {', '.join(unknown)}")
+            deps[node.name] = set(node.after)
+            for other in self.nodes.values():
+                if other is not node and any(overlaps(i, o) for i in node.inputs
+                                             for o in other.outputs):
+                    deps[node.name].add(other.name)
+        return deps
+
+    def order(self):
+        """Node names in dependency order. Raises PipelineError on a cycle"""
+        deps = self.prerequisites()
+        ordered, visiting, done = [], [], set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                cycle = visiting[visiting.index(name):] + [name]
+                raise PipelineError(f"Dependency cycle: {' -> '.join(cycle)}")
+            visiting.append(name)
+            for d in sorted(deps[name]):
+                visit(d)
+            visiting.pop()
+            done.add(name)
+            ordered.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return ordered
+
+    def subgraph(self, targets=None):
+        """Names of targets and everything they depend on (all nodes without targets)"""
+        if targets is None:
+            return set(self.nodes)
+        deps = self.prerequisites()
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.nodes:
+                raise PipelineError(f"Unknown pipeline node {name}")
+            if name not in needed:
+                needed.add(name)
+                stack += deps[name]
+        return needed
+
+    def _file_digest(self, fpath):
+        st = os.stat(fpath)
+        with self._lock:
+            memo = self.state["files"].get(fpath)
+        if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+        digest = hash_file(fpath)
+        with self._lock:
+            self.state["files"][fpath] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def stamp(self, node):
+        """Digest of the input files (content and path) and signature of node"""
+        h = hashlib.sha256()
+        for pattern in node.inputs:
+            h.update(f"input:{pattern}\n".encode())
+            for f in expand(pattern):
+                h.update(f"{f}:{self._file_digest(f)}\n".encode())
+        h.update(json.dumps(node.signature, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def outdated(self, node):
+        """(reason, stamp): reason is None when node is up to date"""
+        if node.always:
+            return "always runs", None
+        stamp = self.stamp(node)
+        for pattern in node.outputs:
+            if not expand(pattern):
+                return f"missing {pattern}", stamp
+        with self._lock:
+            recorded = self.state["stamps"].get(node.name)
+        if recorded is None:
+            return "never run", stamp
+        if recorded != stamp:
+            return "inputs changed", stamp
+        return None, stamp
+
+    def _execute(self, node, force):
+        reason, stamp = self.outdated(node)
+        if force and reason is None:
+            reason = "forced"
+        if reason is None:
+            self.log(f"{node.name}: up to date")
+            return "up_to_date"
+        self.log(f"{node.name}: running ({reason})")
+        start = time.time()
+        node.func()
+        missing = [p for p in node.outputs if not expand(p)]
+        if missing:
+            raise PipelineError(f"{node.name} did not produce {', '.join(missing)}")
+        if stamp is not None:
+            with self._lock:
+                self.state["stamps"][node.name] = stamp
+        self.log(f"{node.name}: finished in {time.time() - start:.1f} s")
+        return "ran"
+
+    def save(self):
+        if not self.state_file:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        tmp = f"{self.state_file}.{os.getpid()}.tmp"
+        with self._lock, open(tmp, "w") as fp:
+            json.dump(self.state, fp, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def run(self, targets=None, force=False):
+        """Runs the out-of-date nodes of targets (default all) and their dependencies
+
+        Nodes depending on a failed node are skipped, all others still run.
+        Returns {name: "ran" | "up_to_date"}. Raises PipelineError (with
+        the status of every node as attribute status) if any node failed.
+        """
+        order = self.order()
+        needed = self.subgraph(targets)
+        deps = {n: d & needed for n, d in self.prerequisites().items() if n in needed}
+        pending = [n for n in order if n in needed]
+        status, errors, futures = {}, {}, {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+            def launch():
+                for name in list(pending):
+                    if not all(d in status for d in deps[name]):
+                        continue
+                    pending.remove(name)
+                    failed = [d for d in deps[name] if status[d] in ("failed", "skipped")]
+                    if failed:
+                        status[name] = "skipped"
+                        self.log(f"{name}: skipped ({', '.join(sorted(failed))} did not complete)")
+                        return True
+                    futures[pool.submit(self._execute, self.nodes[name], force)] = name
+                return False
+
+            while launch():
+                pass
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        status[name] = future.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        errors[name] = e
+                        self.log(f"{name}: failed: {e}")
+                while launch():
+                    pass
+        self.save()
+        if errors:
+            raise PipelineError(f"Pipeline failed at: {', '.join(errors)}", status)
+        return status
+
+
+def step_nodes(tool, prefix=""):
+    """Nodes for the steps of a tool
+
+    Steps run after the steps named in tool.step_deps() ({step: [steps]}),
+    or one after another if the tool does not define step_deps.
+    """
+    steps = tool.steps()
+    names = [s.__name__ for s in steps]
+    if getattr(tool, "step_deps", None):
+        graph = tool.step_deps()
+    else:
+        graph = {n: names[i - 1:i] for i, n in enumerate(names)}
+    return [Node(f"{prefix}{n}", s, after=[f"{prefix}{d}" for d in graph.get(n, [])])
+            for n, s in zip(names, steps)]
+
+
+def run_steps(tool, workers=None, log=print):
+    """Runs the steps of a tool, independent steps concurrently"""
+    pipeline = Pipeline(workers=workers, log=log)
+    for node in step_nodes(tool):
+        pipeline.add(node)
+    return pipeline.run()
+
+
+def tool_node(name, tool, after=(), workers=None, log=print):
+    """Node running all steps of a tool with the inputs/outputs of tool.pipeline_io()"""
+    io = tool.pipeline_io()
+    return Node(name, lambda: run_steps(tool, workers, lambda msg: log(f"{name}.{msg}")),
+                inputs=io.get("inputs", []), outputs=io.get("outputs", []), after=after,
+                signature=io.get("signature"), always=io.get("always", False))
+
+
+def command_node(name, spec, base_dir="."):
+    """Node running a shell command from a flow file entry
+
+    spec has command and optionally cwd, inputs, outputs, after and always.
+    Relative paths are relative to base_dir.
+    """
+    cwd = os.path.join(base_dir, spec.get("cwd", "."))
+
+    def run():
+        proc = subprocess.run(spec["command"], shell=True, cwd=cwd)
+        if proc.returncode != 0:
+            raise PipelineError(f"{spec['command']} exited with code {proc.returncode}")
+
+    return Node(name, run,
+                inputs=[os.path.join(base_dir, p) for p in spec.get("inputs", [])],
+                outputs=[os.path.join(base_dir, p) for p in spec.get("outputs", [])],
+                after=spec.get("after", []),
+                signature=spec["command"],
+                always=spec.get("always", False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("flow", help="json file: {node name: {command, inputs, outputs, after, cwd, always}}")
+    parser.add_argument("targets", nargs="*", help="nodes to bring up to date (default all)")
+    parser.add_argument("-j", "--jobs", type=int, help="nodes run concurrently (default cpu count)")
+    parser.add_argument("--state", help="state file (default .<flow>.state.json next to flow)")
+    parser.add_argument("--force", action="store_true", help="run nodes even if up to date")
+    parser.add_argument("--list", action="store_true", help="list nodes in dependency order with status")
+    args = parser.parse_args(argv)
+    base_dir = os.path.dirname(os.path.abspath(args.flow))
+    with open(args.flow) as fp:
+        flow = json.load(fp)
+    state = args.state or os.path.join(base_dir, f".{Path(args.flow).stem}.state.json")
+    pipeline = Pipeline(state, args.jobs)
+    for name, spec in flow.items():
+        pipeline.add(command_node(name, spec, base_dir))
+    if args.list:
+        deps = pipeline.prerequisites()
+        for name in pipeline.order():
+            reason = pipeline.outdated(pipeline.nodes[name])[0] or "up to date"
+            print(f"{name}: {reason} (after: {', '.join(sorted(deps[name])) or '-'})")
+        return 0
+    try:
+        pipeline.run(args.targets or None, args.force)
+    except PipelineError as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
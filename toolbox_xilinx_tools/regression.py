@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Regression runs of the simulate tool: run list, log checks and summaries
+
+A regression config (simulate property regression) lists explicit runs
+({name, seed, plusargs}) plus a number of random seeds. Every run writes
+its own xsim log, which passes if no fail pattern and (if any are given) a
+pass pattern matched. The runs are summarized in regression.json and a
+JUnit regression.xml.
+
+Concurrent runs share the elaborated snapshot, but xsim writes run time
+files (xsimSettings.ini, webtalk, protoinst files, ...) into the snapshot
+dir. Every run therefore gets its own xsim.dir with a private copy of the
+snapshot dir in which only the simulation kernel is hard linked.
+"""
+
+# Imports - standard library
+from fnmatch import fnmatch
+import json
+import os
+import re
+import shutil
+import xml.etree.ElementTree as ET
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+# Snapshot files xsim only reads (the simulation kernel), hard linked into runs
+KERNEL_FILES = ["xsimk", "xsimk.exe", "*.so", "*.dll"]
+
+
+def expand_runs(reg):
+    """List of {name, seed, plusargs} for every run of a regression config
+
+    Explicit runs default to run_<i> and first_seed, their plusargs are
+    appended to the common plusargs. seeds more runs named seed_<seed>
+    follow with seeds counting up from first_seed.
+    """
+    runs = []
+    for i, run in enumerate(reg["runs"]):
+        runs.append({"name": run.get("name", f"run_{i}"),
+                     "seed": run.get("seed", reg["first_seed"]),
+                     "plusargs": reg["plusargs"] + run.get("plusargs", [])})
+    for seed in range(reg["first_seed"], reg["first_seed"] + reg["seeds"]):
+        runs.append({"name": f"seed_{seed}", "seed": seed,
+                     "plusargs": list(reg["plusargs"])})
+    return runs
+
+
+def check_log(log_file, fail_patterns, pass_patterns=()):
+    """Returns None if a run passed, otherwise the reason it failed
+
+    The first line matching a fail pattern is the reason. With pass
+    patterns a log passes only if one of them matched.
+    """
+    if not os.path.isfile(log_file):
+        return "no simulation log written"
+    fail = [re.compile(p) for p in fail_patterns]
+    passed = [re.compile(p) for p in pass_patterns]
+    found_pass = not passed
+    with open(log_file, errors="replace") as fp:
+        for line in fp:
+            for p in fail:
+                if p.search(line):
+                    return line.strip()
+            if not found_pass and any(p.search(line) for p in passed):
+                found_pass = True
+    return None if found_pass else "pass pattern not found"
+
+
+def write_summary(out_dir, suite, runs):
+    """Writes regression.json and regression.xml (JUnit) to out_dir
+
+    runs are dicts with name, time (s) and failure (None if passed).
+    Returns the failed runs.
+    """
+    failed = [r for r in runs if r["failure"]]
+    with open(os.path.join(out_dir, "regression.json"), "w") as fp:
+        json.dump({"tests": len(runs), "failures": len(failed), "runs": runs}, fp, indent=2)
+    root = ET.Element("testsuite", name=suite, tests=str(len(runs)),
+                      failures=str(len(failed)),
+                      time=f"{sum(r['time'] for r in runs):.3f}")
+    for run in runs:
+        case = ET.SubElement(root, "testcase", classname=suite,
+                             name=run["name"], time=f"{run['time']:.3f}")
+        if run["failure"]:
+            ET.SubElement(case, "failure", message=run["failure"])
+    ET.ElementTree(root).write(os.path.join(out_dir, "regression.xml"),
+                               encoding="utf-8", xml_declaration=True)
+    return failed
+
+
+def run_snapshot(xsim_dir, snapshot, run_dir):
+    """Creates run_dir/xsim.dir for one run of snapshot elaborated in xsim_dir
+
+    The snapshot dir is copied (kernel files hard linked if possible), the
+    other entries of xsim_dir (compiled libraries) are linked. An existing
+    run_dir/xsim.dir (or link) is replaced.
+    """
+    dst = os.path.join(run_dir, "xsim.dir")
+    if os.path.islink(dst) or os.path.isfile(dst):
+        os.remove(dst)
+    elif os.path.isdir(dst):
+        shutil.rmtree(dst)
+    os.makedirs(dst)
+
+    def copy(src, dst):
+        if any(fnmatch(os.path.basename(src), p) for p in KERNEL_FILES):
+            try:
+                os.link(src, dst)
+                return dst
+            except OSError:
+                pass
+        return shutil.copy2(src, dst)
+
+    for entry in os.listdir(xsim_dir):
+        if entry == snapshot:
+            shutil.copytree(os.path.join(xsim_dir, entry), os.path.join(dst, entry),
+                            symlinks=True, copy_function=copy)
+        else:
+            os.symlink(os.path.relpath(os.path.join(xsim_dir, entry), dst),
+                       os.path.join(dst, entry))
+    return dst
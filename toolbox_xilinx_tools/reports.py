@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Streaming parsers for Vivado report files and per job report index
+
+Every parser reads its report one line at a time so multi-hundred MB timing
+reports are never held in memory. Results are compact records (dicts of
+scalars, tables as lists of rows, paths as columns) that are collected by
+build_index into a single json file per job.
+"""
+
+# Imports - standard library
+from pathlib import Path
+import json
+import re
+import sys
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+SECTION_RE = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+(\S.*)$")
+SLACK_RE = re.compile(r"^\s*Slack(?:\s+\((\w+)\))?\s*:\s*(-?[\d.]+|inf)ns")
+ROUTE_STATUS_RE = re.compile(r"^\s*#\s*of\s+(.*?)\s*\.{2,}\s*:\s*(\d+)\s*:")
+
+
+def to_num(value):
+    """Converts report cell to int/float (None for NA or empty)"""
+    value = value.strip().rstrip("%").strip()
+    if value in ["", "NA", "N/A", "-"]:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def key_name(name):
+    """Normalizes a report label into a lower case key"""
+    name = name.replace("%", " pct").replace("#", "num")
+    return re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+
+
+def parse_timing_summary(fpath):
+    """Design timing summary (WNS, TNS, WHS, ...) from report_timing_summary
+
+    Reads line by line and stops as soon as the summary table is found.
+    Returns dict with keys wns, tns, tns_failing_endpoints,
+    tns_total_endpoints, whs, ths, ... (values in ns) or None if not found.
+    """
+    keys = [
+        "wns", "tns", "tns_failing_endpoints", "tns_total_endpoints", "whs",
+        "ths", "ths_failing_endpoints", "ths_total_endpoints", "wpws", "tpws",
+        "tpws_failing_endpoints", "tpws_total_endpoints"
+    ]
+    in_summary = False
+    with open(fpath) as fp:
+        for line in fp:
+            if line.startswith("| Design Timing Summary"):
+                in_summary = True
+            elif in_summary:
+                fields = line.split()
+                if not fields or fields[0].startswith(("WNS", "|")) or \
+                        set(fields[0]) == {"-"}:
+                    continue
+                return dict(zip(keys, (to_num(f) for f in fields)))
+    return None
+
+
+def iter_tables(fpath):
+    """Yields (section, header, rows) for every ascii table in a report
+
+    Tables are blocks of "+---+" border and "| a | b |" row lines. When a
+    table has more than one block of rows the first row is the header,
+    otherwise header is None (key/value tables). section is the title of the
+    closest numbered section heading above the table.
+    """
+    section = None
+    blocks = None
+    with open(fpath) as fp:
+        for line in fp:
+            line = line.rstrip("\n")
+            if line.startswith("+-") or line.startswith("+="):
+                if blocks is None:
+                    blocks = []
+                blocks.append([])
+            elif line.startswith("|") and blocks is not None:
+                blocks[-1].append([c.strip() for c in line.strip().strip("|").split("|")])
+            else:
+                if blocks is not None:
+                    yield _table(section, blocks)
+                    blocks = None
+                m = SECTION_RE.match(line)
+                if m:
+                    section = m.group(2).strip()
+        if blocks is not None:
+            yield _table(section, blocks)
+
+
+def _table(section, blocks):
+    """Builds (section, header, rows) from row blocks of one table"""
+    blocks = [b for b in blocks if b]
+    if len(blocks) > 1 and len(blocks[0]) == 1:
+        header = blocks[0][0]
+        rows = [r for b in blocks[1:] for r in b]
+    else:
+        header = None
+        rows = [r for b in blocks for r in b]
+    return section, header, [[to_num(c) for c in r] for r in rows]
+
+
+def parse_tables(fpath):
+    """All tables of a report as list of {section, header, rows}"""
+    return [{"section": s, "header": h, "rows": r} for s, h, r in iter_tables(fpath)]
+
+
+def parse_utilization(fpath):
+    """Flat utilization summary from report_utilization
+
+    Returns {site_type: {"used", "available", "util_pct"}} with keys such as
+    slice_luts, slice_registers, block_ram_tile, dsps, bonded_iob.
+    """
+    summary = {}
+    for _, header, rows in iter_tables(fpath):
+        if not header or "Site Type" not in header or "Used" not in header:
+            continue
+        cols = {c: i for i, c in enumerate(header)}
+        for row in rows:
+            site = key_name(str(row[cols["Site Type"]]).rstrip("*"))
+            if not site or site in summary:
+                continue
+            summary[site] = {
+                "used": row[cols["Used"]],
+                "available": row[cols["Available"]] if "Available" in cols else None,
+                "util_pct": row[cols["Util%"]] if "Util%" in cols else None
+            }
+    return summary
+
+
+def parse_key_values(fpath):
+    """Two column (label | value) tables flattened into one dict (e.g. power)"""
+    values = {}
+    for _, header, rows in iter_tables(fpath):
+        if header is not None:
+            continue
+        for row in rows:
+            if len(row) == 2 and row[0] is not None:
+                values.setdefault(key_name(str(row[0])), row[1])
+    return values
+
+
+def parse_route_status(fpath):
+    """Net counts from report_route_status (e.g. nets_with_routing_errors)"""
+    status = {}
+    with open(fpath) as fp:
+        for line in fp:
+            m = ROUTE_STATUS_RE.match(line)
+            if m:
+                status[key_name(m.group(1))] = int(m.group(2))
+    return status
+
+
+def parse_timing_paths(fpath):
+    """Per path columns from report_timing
+
+    Returns {"slack": [...], "status": [...], "startpoint": [...],
+    "endpoint": [...], "group": [...]}, one entry per path in report order.
+    """
+    paths = {"slack": [], "status": [], "startpoint": [], "endpoint": [], "group": []}
+    with open(fpath) as fp:
+        for line in fp:
+            m = SLACK_RE.match(line)
+            if m:
+                paths["slack"].append(float(m.group(2)))
+                paths["status"].append(m.group(1))
+                for k in ["startpoint", "endpoint", "group"]:
+                    paths[k].append(None)
+                continue
+            if not paths["slack"]:
+                continue
+            stripped = line.strip()
+            if stripped.startswith("Source:"):
+                paths["startpoint"][-1] = stripped.split(None, 1)[1]
+            elif stripped.startswith("Destination:"):
+                paths["endpoint"][-1] = stripped.split(None, 1)[1]
+            elif stripped.startswith("Path Group:"):
+                paths["group"][-1] = stripped.split(":", 1)[1].strip()
+    return paths
+
+
+# Report name suffix => (index category, parser). Checked in order, reports
+# with a category of None are not indexed.
+PARSERS = [
+    ("_timing_summary", "timing", parse_timing_summary),
+    ("_check_timing", None, None),
+    ("_clock_util", "clock_utilization", parse_tables),
+    ("_util", "utilization", parse_utilization),
+    ("_status", "route_status", parse_route_status),
+    ("_timing", "paths", parse_timing_paths),
+    ("_power", "power", parse_key_values),
+    ("_drc", "drc", parse_tables),
+    ("_clocks", "clocks", parse_tables),
+]
+
+
+def parse_closure_log(fpath):
+    """Closure passes log (timing_closure.tcl) => {stage: {initial, passes, seconds}}
+
+    initial is {wns, whs} before the extra passes, passes a list of {pass,
+    wns, whs, seconds} (slack after the pass).
+    """
+    closure = {}
+    with open(fpath, errors="replace") as fp:
+        for line in fp:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 5:
+                continue
+            stage, name, wns, whs, seconds = fields
+            slack = {"wns": to_num(wns), "whs": to_num(whs)}
+            if name == "initial":
+                closure[stage] = {"initial": slack, "passes": [], "seconds": 0.0}
+            elif stage in closure:
+                closure[stage]["passes"].append(dict(slack, name=name, seconds=to_num(seconds)))
+                closure[stage]["seconds"] += to_num(seconds)
+    return closure
+
+
+def build_index(report_dir, index_file=None):
+    """Parses every known report in report_dir into one index dict
+
+    Reports are named <stage>_<kind>.rpt and indexed as index[kind][stage],
+    e.g. index["timing"]["post_route"]["wns"]. Extra closure passes are
+    indexed as index["closure"][stage]. Written to index_file as json when
+    given.
+    """
+    index = {}
+    for rpt in sorted(Path(report_dir).glob("*.rpt")):
+        for suffix, category, parser in PARSERS:
+            if rpt.stem.endswith(suffix):
+                if category is not None:
+                    stage = rpt.stem[:-len(suffix)]
+                    index.setdefault(category, {})[stage] = parser(rpt)
+                break
+    closure_log = Path(report_dir, "closure_passes.tsv")
+    if closure_log.is_file():
+        index["closure"] = parse_closure_log(closure_log)
+    if index_file is not None:
+        with open(index_file, "w") as fp:
+            json.dump(index, fp, separators=(",", ":"))
+    return index
+
+
+def load_index(index_file):
+    with open(index_file) as fp:
+        return json.load(fp)
+
+
+def query(index, path):
+    """Looks up a dotted path (e.g. "timing.post_route.wns") in an index"""
+    value = index
+    for k in path.split("."):
+        if isinstance(value, list):
+            value = value[int(k)]
+        elif isinstance(value, dict) and k in value:
+            value = value[k]
+        else:
+            return None
+    return value
+
+
+if __name__ == '__main__':
+    # Usage: reports.py <report_index.json> <dotted.path> [...]
+    idx = load_index(sys.argv[1])
+    for p in sys.argv[2:]:
+        print(f"{p} = {json.dumps(query(idx, p))}")
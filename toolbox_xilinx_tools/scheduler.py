@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Host wide cpu/memory slots for tool processes
+
+Every tool process is launched inside a slot granting it a number of cpus
+(used as vivado general.maxThreads / xelab -mt) and an amount of memory.
+Slots are accounted in a small json ledger shared by all processes of the
+host (guarded by flock) and handed out first come first served, so jobs
+queue instead of overcommitting the machine. When running under GNU make
+with a jobserver (MAKEFLAGS --jobserver-auth) cpus are taken as jobserver
+tokens instead and the ledger only accounts memory.
+
+The scheduler property of the tools sets threads (cpus per process) and
+mem_gb (memory per process). The ledger lives in dir (default a per user
+temp dir) and accounts against max_cpus/max_mem_gb (default all cpus and
+90% of memory).
+"""
+
+# Imports - standard library
+from contextlib import contextmanager
+from pathlib import Path
+import errno
+import fcntl
+import itertools
+import json
+import os
+import re
+import select
+import tempfile
+import threading
+import time
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+# Largest general.maxThreads vivado accepts
+VIVADO_MAX_THREADS = 32
+DEFAULT_SLOT_DIR = os.path.join(tempfile.gettempdir(), f"toolbox_xilinx_slots_{os.getuid()}")
+
+
+class SchedulerError(Exception):
+    pass
+
+
+def cpu_count():
+    """Cpus this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def total_memory():
+    """Physical memory in bytes (None if it cannot be determined)"""
+    try:
+        with open("/proc/meminfo") as fp:
+            for line in fp:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobServer:
+    """Client of the GNU make jobserver
+
+    Every process started by make owns one implicit token, further tokens
+    are read from (and must be written back to) the jobserver pipe or fifo.
+    Only the first token of a request blocks, additional tokens are taken
+    if immediately available, so partial holders never deadlock each other.
+    """
+    def __init__(self, read_fd, write_fd):
+        self.write_fd = write_fd
+        # Private non blocking description of the pipe (the shared one must
+        # stay blocking for make and the other jobs)
+        try:
+            self.read_fd = os.open(f"/proc/self/fd/{read_fd}", os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            self.read_fd = read_fd
+        self._implicit = True
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, makeflags=None):
+        """JobServer from MAKEFLAGS (None if make does not provide one)"""
+        makeflags = os.environ.get("MAKEFLAGS", "") if makeflags is None else makeflags
+        m = re.search(r"--jobserver-(?:auth|fds)=(?:fifo:(\S+)|(\d+),(\d+))", makeflags)
+        if not m:
+            return None
+        try:
+            if m.group(1):
+                fd = os.open(m.group(1), os.O_RDWR)
+                return cls(fd, fd)
+            read_fd, write_fd = int(m.group(2)), int(m.group(3))
+            os.fstat(read_fd)
+            os.fstat(write_fd)
+        except OSError:
+            # make did not pass the fds to us (recipe without "+")
+            return None
+        return cls(read_fd, write_fd)
+
+    def _read_token(self, block):
+        while True:
+            try:
+                token = os.read(self.read_fd, 1)
+                if token:
+                    return token
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                if e.errno != errno.EINTR:
+                    raise
+            if not block:
+                return None
+            select.select([self.read_fd], [], [], 1.0)
+
+    def acquire(self, n):
+        """Takes 1 to n tokens (blocks for the first). Returns list of tokens
+
+        The implicit token is returned as None.
+        """
+        tokens = []
+        with self._lock:
+            if self._implicit:
+                self._implicit = False
+                tokens.append(None)
+        if not tokens:
+            tokens.append(self._read_token(block=True))
+        while len(tokens) < n:
+            token = self._read_token(block=False)
+            if token is None:
+                break
+            tokens.append(token)
+        return tokens
+
+    def release(self, tokens):
+        for token in tokens:
+            if token is None:
+                with self._lock:
+                    self._implicit = True
+            else:
+                os.write(self.write_fd, token)
+
+
+class Grant:
+    """Resources granted to one process"""
+    __slots__ = ("cpus", "mem", "ticket", "tokens")
+
+    def __init__(self, cpus, mem, ticket=None, tokens=()):
+        self.cpus = cpus
+        self.mem = mem
+        self.ticket = ticket
+        self.tokens = list(tokens)
+
+    def __repr__(self):
+        return f"Grant(cpus={self.cpus}, mem={self.mem})"
+
+
+class Scheduler:
+    """Hands out cpu/memory slots from a ledger shared by all host processes
+
+    Requests are queued in order of arrival and granted when they fit in
+    the capacity (cpus defaults to the cpus of this process, mem to 90% of
+    physical memory). Requests larger than the capacity are clamped so
+    they run alone. Grants of processes that died are reclaimed.
+    """
+    _ids = itertools.count()
+
+    def __init__(self, directory=DEFAULT_SLOT_DIR, cpus=None, mem=None, jobserver=None,
+                 poll=0.5):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cpus = cpus or cpu_count()
+        mem_total = total_memory()
+        self.mem = mem or (int(mem_total * 0.9) if mem_total else None)
+        self.jobserver = jobserver
+        self.poll = poll
+        self.ledger = self.directory / "slots.json"
+        self.lock_file = self.directory / "slots.lock"
+
+    @contextmanager
+    def _locked(self):
+        with open(self.lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.ledger) as fp:
+                        state = json.load(fp)
+                except (OSError, ValueError):
+                    state = {"grants": {}, "queue": []}
+                yield state
+                tmp = self.ledger.with_name(f".slots.{os.getpid()}.tmp")
+                with open(tmp, "w") as fp:
+                    json.dump(state, fp)
+                os.replace(tmp, self.ledger)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _reclaim(state):
+        pid = lambda ticket: int(ticket.split(":")[0])
+        state["grants"] = {t: g for t, g in state["grants"].items() if pid_alive(pid(t))}
+        state["queue"] = [t for t in state["queue"] if pid_alive(pid(t))]
+
+    def usage(self):
+        """(cpus, mem) currently granted on the host"""
+        with self._locked() as state:
+            self._reclaim(state)
+            return (sum(g["cpus"] for g in state["grants"].values()),
+                    sum(g["mem"] for g in state["grants"].values()))
+
+    def acquire(self, cpus=1, mem=0, timeout=None):
+        """Blocks until cpus and mem (bytes) are available. Returns a Grant"""
+        tokens = []
+        if self.jobserver is not None:
+            tokens = self.jobserver.acquire(cpus)
+            cpus_granted, cpus = len(tokens), 0
+        else:
+            cpus = cpus_granted = min(max(cpus, 1), self.cpus)
+        mem = min(mem, self.mem) if self.mem else mem
+        ticket = f"{os.getpid()}:{next(self._ids)}"
+        deadline = None if timeout is None else time.time() + timeout
+        try:
+            while deadline is None or time.time() < deadline:
+                with self._locked() as state:
+                    self._reclaim(state)
+                    if ticket not in state["queue"]:
+                        state["queue"].append(ticket)
+                    used_cpus = sum(g["cpus"] for g in state["grants"].values())
+                    used_mem = sum(g["mem"] for g in state["grants"].values())
+                    if state["queue"][0] == ticket and used_cpus + cpus <= self.cpus and \
+                            (not self.mem or used_mem + mem <= self.mem):
+                        state["queue"].pop(0)
+                        state["grants"][ticket] = {"cpus": cpus, "mem": mem, "time": time.time()}
+                        return Grant(cpus_granted, mem, ticket, tokens)
+                time.sleep(self.poll)
+            raise SchedulerError(f"No slot for {cpus} cpus/{mem / 1e9:.1f} GB within {timeout} s")
+        except BaseException:
+            # Leave the queue so waiters behind this request are not blocked
+            with self._locked() as state:
+                if ticket in state["queue"]:
+                    state["queue"].remove(ticket)
+            if self.jobserver is not None:
+                self.jobserver.release(tokens)
+            raise
+
+    def release(self, grant):
+        with self._locked() as state:
+            state["grants"].pop(grant.ticket, None)
+        if self.jobserver is not None:
+            self.jobserver.release(grant.tokens)
+
+    @contextmanager
+    def slot(self, cpus=1, mem=0, timeout=None):
+        grant = self.acquire(cpus, mem, timeout)
+        try:
+            yield grant
+        finally:
+            self.release(grant)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(cfg):
+    """Process wide Scheduler for a tool "scheduler" property"""
+    max_mem = cfg.get("max_mem_gb")
+    key = (cfg.get("dir") or DEFAULT_SLOT_DIR, cfg.get("max_cpus"),
+           None if max_mem is None else int(max_mem * 1e9))
+    with _schedulers_lock:
+        if key not in _schedulers:
+            jobserver = JobServer.from_env() if cfg.get("jobserver", True) else None
+            _schedulers[key] = Scheduler(key[0], key[1], key[2], jobserver)
+        return _schedulers[key]
+
+
+@contextmanager
+def scheduled(cfg, cpus=None, mem_gb=None):
+    """Slot for one process as configured by a tool "scheduler" property
+
+    Yields None (and does not wait) when the scheduler is disabled.
+    cpus/mem_gb default to the threads/mem_gb of the property.
+    """
+    if not cfg["enabled"]:
+        yield None
+        return
+    cpus = cfg["threads"] if cpus is None else cpus
+    mem_gb = cfg["mem_gb"] if mem_gb is None else mem_gb
+    with get_scheduler(cfg).slot(cpus, int(mem_gb * 1e9)) as grant:
+        yield grant
+
+
+def vivado_source(script, directory, grant):
+    """Script to pass to vivado -source that applies the granted threads
+
+    Writes <script stem>_threads.tcl setting general.maxThreads and
+    sourcing script into directory. Returns script unchanged without grant.
+    """
+    if grant is None:
+        return script
+    wrapper = Path(directory, f"{Path(script).stem}_threads.tcl")
+    threads = min(max(grant.cpus, 1), VIVADO_MAX_THREADS)
+    wrapper.write_text(f"set_param general.maxThreads {threads}\nsource {script}\n")
+    return str(wrapper)
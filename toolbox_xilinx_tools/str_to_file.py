@@ -9,6 +9,10 @@
 from pathlib import Path
 from abc import ABC, abstractmethod
 import getpass
+import hashlib
+import itertools
+import os
+import tempfile
 from datetime import date
 
 # Imports - 3rd party packages
@@ -17,6 +21,8 @@ from datetime import date
 
 
 class FileStr(ABC):
+    __slots__ = ("_fstrings", "_comment_char")
+
     def __init__(self, comment_char="//"):
         self._fstrings = []
         self._comment_char = comment_char
@@ -35,17 +41,26 @@ class FileStr(ABC):
         line = Line(line, comment, self._comment_char)
         self.add(line)
 
+    def iter_str(self):
+        """Yields output chunk by chunk without building the whole string"""
+        yield self.pre_to_str()
+        for obj in self._fstrings:
+            yield from obj.iter_str()
+        yield self.post_to_str()
+
     def to_str(self):
         """Stringify me!"""
-        rstr = self.pre_to_str()
-        for obj in self._fstrings:
-            rstr += obj.to_str()
-        rstr += self.post_to_str()
-        return rstr
+        return "".join(self.iter_str())
+
+    def write(self, fp):
+        """Streams output into open file/buffer fp"""
+        fp.writelines(self.iter_str())
 
 
 class File(FileStr):
     """Top level file str"""
+    __slots__ = ("_fpath", )
+
     def __init__(self, fpath, comment_char="//"):
         """Creates file object that can be output to file
         name is a str that the file should be output to
@@ -66,18 +81,49 @@ class File(FileStr):
         rstr += f"{self._comment_char}{'='*(80-len(self._comment_char))}\n"
         return rstr
 
+    def _header_lines(self):
+        return self.pre_to_str().count("\n")
+
+    def existing_digest(self):
+        """Digest of the existing file's contents after the header (None if missing)"""
+        if not self._fpath.is_file():
+            return None
+        h = hashlib.sha256()
+        with open(self._fpath) as fp:
+            for line in itertools.islice(fp, self._header_lines(), None):
+                h.update(line.encode())
+        return h.hexdigest()
+
     def generate(self, overwrite=False):
-        """Creates a file at fpath with all sections, subsections, and headers"""
-        if self._fpath.exists() and not overwrite:
-            return False
-        else:
-            with open(self._fpath, "w") as fp:
-                fp.write(self.to_str())
+        """Creates a file at fpath with all sections, subsections, and headers
+
+        Streams the contents to a temporary file and only replaces fpath when
+        the contents (ignoring the user/date header) changed, or overwrite is
+        set. Returns True if fpath was written, False if it was up to date.
+        """
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self._fpath.parent, prefix=f".{self._fpath.name}.")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                chunks = self.iter_str()
+                fp.write(next(chunks))  # header is not part of the digest
+                for chunk in chunks:
+                    h.update(chunk.encode())
+                    fp.write(chunk)
+            if not overwrite and h.hexdigest() == self.existing_digest():
+                return False
+            os.chmod(tmp, 0o666 & ~_UMASK)
+            os.replace(tmp, self._fpath)
             return True
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
 
 
 class Section(FileStr):
     """A portion of a file"""
+    __slots__ = ("_comment", )
+
     def __init__(self, comment, comment_char="//"):
         """Creates a section with a comment"""
         super(Section, self).__init__(comment_char)
@@ -97,6 +143,8 @@ class Section(FileStr):
 
 class SubSection(FileStr):
     """A portion of a file"""
+    __slots__ = ("_comment", )
+
     def __init__(self, comment, comment_char="//"):
         """Creates a section with a comment"""
         super(SubSection, self).__init__(comment_char)
@@ -109,19 +157,33 @@ class SubSection(FileStr):
 
 
 class Line(FileStr):
-    """Single line. Smallest file string unit"""
+    """Single line. Smallest file string unit (holds nothing but its text)"""
+    __slots__ = ("_line", )
+
     def __init__(self, line, comment=None, comment_char="//"):
-        super(Line, self).__init__(comment_char)
-        self._comment = comment
-        if self._comment:
+        if comment:
             self._line = f"{line} {comment_char} {comment}\n"
         else:
             self._line = line + "\n"
 
+    def iter_str(self):
+        yield self._line
+
     def to_str(self):
         return self._line
 
 
+def _umask():
+    """Current process umask"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import (os.umask is process wide and not thread safe)
+_UMASK = _umask()
+
+
 if __name__ == '__main__':
     f = File("test.tcl")
     section = Section("Test Section")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Incremental sync of include directory trees into a flat job directory"""
+
+# Imports - standard library
+from pathlib import Path
+import fcntl
+import json
+import os
+import shutil
+
+# Imports - 3rd party packages
+
+# Imports - local source
+from toolbox_xilinx_tools.build_cache import hash_file
+
+# ioctl request for cloning a file (reflink) on btrfs/xfs
+FICLONE = 0x40049409
+
+
+class SyncReport:
+    """Totals of one sync run"""
+    def __init__(self):
+        self.linked = 0
+        self.reflinked = 0
+        self.copied = 0
+        self.skipped = 0
+        self.removed = 0
+        # basename => [all source paths with that basename] (first one wins)
+        self.collisions = {}
+
+    @property
+    def total(self):
+        return self.linked + self.reflinked + self.copied + self.skipped
+
+    def __str__(self):
+        return (f"{self.total} include files: {self.skipped} up to date, "
+                f"{self.linked} hardlinked, {self.reflinked} reflinked, "
+                f"{self.copied} copied, {self.removed} stale removed, "
+                f"{len(self.collisions)} basename collisions")
+
+
+def _up_to_date(src, dst, verify_hash):
+    """True if dst already holds the contents of src"""
+    try:
+        if os.path.samefile(src, dst):
+            return True
+        s, d = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    if s.st_size != d.st_size:
+        return False
+    if verify_hash:
+        return hash_file(src) == hash_file(dst)
+    return int(s.st_mtime) == int(d.st_mtime)
+
+
+def _reflink(src, dst):
+    """Clones src to dst (copy on write). Returns False if unsupported"""
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.unlink(dst)
+        return False
+
+
+def sync_includes(dirs, dest, link=True, verify_hash=False):
+    """Places every file below dirs directly in dest, only touching changed files
+
+    Files are hardlinked when possible, otherwise reflinked, otherwise copied
+    (mtime preserved). Files whose size and mtime (or hash when verify_hash)
+    already match are skipped. When two directories provide the same basename
+    the one from the earlier directory wins (include search order) and the
+    collision is reported. Files synced previously that no longer exist in
+    any directory are removed from dest. Returns a SyncReport.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    report = SyncReport()
+    chosen = {}
+    for d in dirs:
+        for f in sorted(p for p in Path(d).glob("**/*") if p.is_file()):
+            if f.name in chosen:
+                report.collisions.setdefault(f.name, [chosen[f.name]]).append(f)
+            else:
+                chosen[f.name] = f
+    for name, src in chosen.items():
+        dst = dest / name
+        if _up_to_date(src, dst, verify_hash):
+            report.skipped += 1
+            continue
+        if dst.exists() or dst.is_symlink():
+            dst.unlink()
+        if link:
+            try:
+                os.link(src, dst)
+                report.linked += 1
+                continue
+            except OSError:
+                pass
+        if _reflink(src, dst):
+            report.reflinked += 1
+        else:
+            shutil.copy2(src, dst)
+            report.copied += 1
+    # Remove files from a previous sync that are gone from the include dirs
+    manifest = dest / ".include_sync.json"
+    if manifest.is_file():
+        with open(manifest) as fp:
+            for name in json.load(fp):
+                if name not in chosen and (dest / name).is_file():
+                    (dest / name).unlink()
+                    report.removed += 1
+    with open(manifest, "w") as fp:
+        json.dump(sorted(chosen), fp)
+    return report
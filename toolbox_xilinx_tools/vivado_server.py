@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Long lived Vivado (or any tcl shell) worker that runs submitted tcl scripts
+
+Starting vivado costs 20-40 s per invocation. A TclWorker keeps one
+"vivado -mode tcl" process alive and feeds it scripts over its stdin pipe.
+Each script is sourced in its own namespace from its own directory and the
+shell is returned to its home directory and cleaned up afterwards. A worker
+that crashes or hangs is restarted on the next submission.
+
+serve() exposes one worker on a unix socket so separate tool invocations
+can share it through TclClient:
+
+    python -m toolbox_xilinx_tools.vivado_server /tmp/vivado.sock vivado -mode tcl
+
+Tools with the server property enabled submit to server.address, or
+without an address to a worker shared by all tools of the process.
+"""
+
+# Imports - standard library
+from pathlib import Path
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import uuid
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+VIVADO_COMMAND = ["vivado", "-mode", "tcl", "-nojournal", "-nolog"]
+
+# Closes anything a job may have left open (ignored by plain tclsh). Designs
+# of the non-project flow (synth_design, open_checkpoint) are not closed by
+# close_project.
+VIVADO_CLEANUP = [
+    "close_hw_target -quiet", "disconnect_hw_server -quiet",
+    "close_hw_manager -quiet",
+    "foreach design [get_designs -quiet] {catch {current_design $design}; catch {close_design -quiet}}",
+    "close_project -quiet"
+]
+
+
+class TclWorkerError(Exception):
+    """Raised when the worker dies or times out while running a script"""
+    pass
+
+
+class TclResult:
+    """Return code and combined stdout/stderr of one submitted script"""
+    def __init__(self, rc, output):
+        self.rc = rc
+        self.output = output
+
+    @property
+    def ok(self):
+        return self.rc == 0
+
+
+def _tcl_quote(s):
+    """Brace quotes a string for tcl"""
+    return "{" + str(s) + "}"
+
+
+class TclWorker:
+    """Persistent tcl shell process fed over a pipe"""
+    def __init__(self, command=None, cleanup=None, startup_timeout=300):
+        self.command = list(command or VIVADO_COMMAND)
+        self.cleanup = VIVADO_CLEANUP if cleanup is None else list(cleanup)
+        self.startup_timeout = startup_timeout
+        self.restarts = 0
+        self._proc = None
+        self._lines = None
+        self._lock = threading.Lock()
+        self._jobs = itertools.count()
+        self._home = os.getcwd()
+
+    def alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self):
+        """Starts shell process (no-op if already running)"""
+        if self.alive():
+            return
+        self._proc = subprocess.Popen(self.command,
+                                      stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT,
+                                      cwd=self._home,
+                                      universal_newlines=True,
+                                      bufsize=1)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._reader,
+                         args=(self._proc.stdout, self._lines),
+                         daemon=True).start()
+        # Wait until the shell is ready to accept commands
+        self._exchange("", self.startup_timeout)
+
+    def stop(self):
+        """Stops shell process"""
+        if self._proc is None:
+            return
+        if self.alive():
+            try:
+                self._proc.stdin.write("exit\n")
+                self._proc.stdin.flush()
+                self._proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+                self._proc.wait()
+        self._proc = None
+
+    def restart(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+        self.restarts += 1
+        self.start()
+
+    @staticmethod
+    def _reader(stream, lines):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)
+
+    def _exchange(self, tcl, timeout):
+        """Sends tcl followed by a marker. Returns (rc, output) once marker is seen"""
+        marker = f"__TCL_WORKER_DONE_{uuid.uuid4().hex}__"
+        try:
+            self._proc.stdin.write(f"{tcl}\nputs \"{marker} [expr {{[info exists ::__rc] ? $::__rc : 0}}]\"\nflush stdout\n")
+            self._proc.stdin.flush()
+        except OSError as e:
+            raise TclWorkerError(f"Worker not accepting commands: {e}")
+        output = []
+        while True:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                raise TclWorkerError(f"Worker timed out after {timeout} s")
+            if line is None:
+                raise TclWorkerError(
+                    f"Worker exited with code {self._proc.wait()}\n{''.join(output)}")
+            if marker in line:
+                rc = line.split(marker, 1)[1].split()
+                return int(rc[0]) if rc else 0, "".join(output)
+            output.append(line)
+
+    def ping(self, timeout=30):
+        """Health check. True if the shell answers within timeout"""
+        if not self.alive():
+            return False
+        with self._lock:
+            try:
+                self._exchange("unset -nocomplain ::__rc", timeout)
+                return True
+            except TclWorkerError:
+                return False
+
+    def run(self, script, directory=None, timeout=None):
+        """Sources script from directory in an isolated namespace
+
+        Restarts the shell if it is not healthy beforehand. If the shell
+        dies or times out during the script it is restarted and
+        TclWorkerError is raised.
+        """
+        script = Path(script).resolve()
+        directory = Path(directory or script.parent).resolve()
+        with self._lock:
+            if not self.alive():
+                if self._proc is not None:
+                    self.restarts += 1
+                self._proc = None
+                self.start()
+            ns = f"::tcl_worker_job{next(self._jobs)}"
+            cleanup = "\n".join(f"catch {{{c}}}" for c in self.cleanup)
+            tcl = "\n".join([
+                f"namespace eval {ns} {{}}",
+                f"set ::__rc [catch {{cd {_tcl_quote(directory)}; namespace eval {ns} [list source {_tcl_quote(script)}]}} ::__msg]",
+                "if {$::__rc} { puts \"ERROR: $::__msg\" }",
+                f"catch {{cd {_tcl_quote(self._home)}}}",
+                cleanup,
+                f"catch {{namespace delete {ns}}}",
+            ])
+            try:
+                return TclResult(*self._exchange(tcl, timeout))
+            except TclWorkerError:
+                self.restart()
+                raise
+
+
+class TclClient:
+    """Submits scripts to a worker served by serve() on a unix socket"""
+    def __init__(self, address):
+        self.address = str(address)
+
+    def _request(self, request, timeout=None):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(self.address)
+            with sock.makefile("rw") as fp:
+                fp.write(json.dumps(request) + "\n")
+                fp.flush()
+                response = json.loads(fp.readline())
+        if "error" in response:
+            raise TclWorkerError(response["error"])
+        return response
+
+    def ping(self, timeout=30):
+        try:
+            return self._request({"ping": True}, timeout)["ok"]
+        except (OSError, ValueError, TclWorkerError):
+            return False
+
+    def run(self, script, directory=None, timeout=None):
+        response = self._request({
+            "script": str(Path(script).resolve()),
+            "directory": None if directory is None else str(Path(directory).resolve()),
+            "timeout": timeout
+        })
+        return TclResult(response["rc"], response["output"])
+
+
+def serve(address, command=None, cleanup=None):
+    """Serves one TclWorker on unix socket address until interrupted"""
+    worker = TclWorker(command, cleanup)
+    worker.start()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = json.loads(self.rfile.readline())
+            try:
+                if request.get("ping"):
+                    response = {"ok": worker.ping()}
+                else:
+                    result = worker.run(request["script"], request.get("directory"),
+                                        request.get("timeout"))
+                    response = {"rc": result.rc, "output": result.output}
+            except Exception as e:
+                response = {"error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+
+    if os.path.exists(address):
+        os.unlink(address)
+    server = socketserver.ThreadingUnixStreamServer(address, Handler)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        worker.stop()
+        if os.path.exists(address):
+            os.unlink(address)
+
+
+_shared = {}
+
+
+def shared_worker(command=None):
+    """Worker shared by all tools in this process for a given command"""
+    key = tuple(command or VIVADO_COMMAND)
+    if key not in _shared:
+        _shared[key] = TclWorker(key)
+    return _shared[key]
+
+
+def get_worker(address=None, command=None):
+    """TclClient for address if given, otherwise in process shared worker"""
+    if address:
+        return TclClient(address)
+    return shared_worker(command)
+
+
+def submit(script, directory, address=None, command=None, log_file=None):
+    """Runs script on a persistent worker and optionally writes its output to log_file"""
+    result = get_worker(address, command).run(script, directory)
+    if log_file is not None:
+        with open(log_file, "w") as fp:
+            fp.write(result.output)
+    return result
+
+
+if __name__ == '__main__':
+    # Usage: vivado_server.py <socket> [command ...]
+    serve(sys.argv[1], sys.argv[2:] or None)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Erik Anderson
+# Email: erik.francis.anderson@gmail.com
+# Date: 10/18/2026
+"""Columnar waveform export: streams a VCD file into per signal .npy arrays
+
+The export dir holds index.json (timescale, end time and per signal
+width, type, number of changes and file stem) and for every signal:
+
+    <stem>.t.npy   uint64 change times (in timescale units)
+    <stem>.v.npy   values: uint64 (width <= 64), uint64 (changes, words)
+                   with the least significant word first (wider signals) or
+                   float64 (real)
+    <stem>.xz.npy  x/z bits, same shape as values (only if any bit was x
+                   or z). A bit is x if set in both files, z if set only here
+
+Signals with the same VCD id (aliases) share their arrays. The export
+writes the .npy format itself, buffers at most BUFFER_VALUES values in
+memory and keeps no file open between flushes (so the number of signals
+is not bounded by the open file limit). numpy is only needed to read an
+export (Waves, with memory mapped arrays).
+"""
+
+# Imports - standard library
+from array import array
+from fnmatch import fnmatchcase
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+
+# Imports - 3rd party packages
+
+# Imports - local source
+
+TIME_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9, "ps": 1e-12, "fs": 1e-15}
+NPY_HEADER_LEN = 128
+# Values buffered over all signals before they are appended to their files
+BUFFER_VALUES = 1 << 22
+
+
+def npy_header(descr, shape):
+    """Version 1.0 .npy header of fixed length (so it can be rewritten in place)"""
+    header = repr({"descr": descr, "fortran_order": False, "shape": tuple(shape)})
+    pad = NPY_HEADER_LEN - 10 - len(header) - 1
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", NPY_HEADER_LEN - 10) + \
+        (header + " " * pad + "\n").encode("latin1")
+
+
+class Column:
+    """.npy file appended in chunks (typecode 'Q' or 'd' with items values per row)
+
+    The file is only opened while a chunk is appended, its header is
+    written on close.
+    """
+    def __init__(self, fpath, typecode, items=1):
+        self.fpath = fpath
+        self.typecode = typecode
+        self.items = items
+        self.rows = 0
+        self.buf = array(typecode)
+        with open(fpath, "wb") as fp:
+            fp.write(b"\0" * NPY_HEADER_LEN)
+
+    def append(self, *values):
+        self.buf.extend(values)
+        self.rows += 1
+
+    def flush(self):
+        if not self.buf:
+            return
+        if sys.byteorder != "little":
+            self.buf.byteswap()
+        with open(self.fpath, "ab") as fp:
+            self.buf.tofile(fp)
+        self.buf = array(self.typecode)
+
+    def close(self):
+        self.flush()
+        shape = (self.rows,) if self.items == 1 else (self.rows, self.items)
+        with open(self.fpath, "r+b") as fp:
+            fp.write(npy_header("<u8" if self.typecode == "Q" else "<f8", shape))
+
+
+class Signal:
+    """Columns of one VCD id"""
+    def __init__(self, stem, width, kind):
+        self.stem = stem
+        self.width = width
+        self.kind = kind
+        self.words = 1 if kind == "real" else max(1, (width + 63) // 64)
+        self.changes = 0
+        self.has_xz = False
+        self.columns = None
+
+    def open(self, out_dir):
+        base = os.path.join(out_dir, self.stem)
+        self.columns = [Column(base + ".t.npy", "Q"),
+                        Column(base + ".v.npy", "d" if self.kind == "real" else "Q", self.words)]
+        if self.kind != "real":
+            self.columns.append(Column(base + ".xz.npy", "Q", self.words))
+
+    def words_of(self, bits):
+        """(value words, x/z words) of a binary string (msb first, extended to width)"""
+        if len(bits) < self.width:
+            # VCD left extension: 0/1 with 0, x and z with themselves
+            bits = (bits[0] if bits[0] in "xXzZ" else "0") * (self.width - len(bits)) + bits
+        value = int(bits.translate(VALUE_BITS), 2)
+        xz = int(bits.translate(XZ_BITS), 2) if self.has_xz or XZ_RE.search(bits) else 0
+        if xz:
+            self.has_xz = True
+        mask = (1 << 64) - 1
+        return ([(value >> (64 * i)) & mask for i in range(self.words)],
+                [(xz >> (64 * i)) & mask for i in range(self.words)])
+
+    def change(self, time, token):
+        """Buffers a value change, returns the number of values buffered"""
+        self.changes += 1
+        self.columns[0].append(time)
+        if self.kind == "real":
+            self.columns[1].append(float(token))
+            return 2
+        value, xz = self.words_of(token)
+        self.columns[1].append(*value)
+        self.columns[2].append(*xz)
+        return 1 + 2 * self.words
+
+    def flush(self):
+        for c in self.columns:
+            c.flush()
+
+    def close(self):
+        for c in self.columns:
+            c.close()
+        if self.kind != "real" and not self.has_xz:
+            os.remove(self.columns[2].fpath)
+
+
+VALUE_BITS = str.maketrans("01xXzZ", "010100")
+XZ_BITS = str.maketrans("01xXzZ", "001111")
+XZ_RE = re.compile(r"[xXzZ]")
+RANGE_RE = re.compile(r"\[\d+:\d+\]$")
+
+
+def vcd_tokens(fp):
+    for line in fp:
+        yield from line.split()
+
+
+def parse_timescale(text):
+    """Seconds per time unit of a VCD $timescale (e.g. '1ps', '10 ns')"""
+    m = re.match(r"^\s*(\d+)\s*([munpf]?s)\s*$", text)
+    if not m:
+        raise ValueError(f"invalid timescale {text!r}")
+    return int(m.group(1)) * TIME_UNITS[m.group(2)]
+
+
+def export_vcd(vcd_file, out_dir, signals=None):
+    """Exports a VCD file to out_dir, returns the index
+
+    signals are glob patterns of hierarchical names (scopes separated by
+    /, e.g. tb/dut/* or */clk) selecting the signals to export (default all).
+    """
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    scope, names, by_id = [], {}, {}
+    timescale, time = "1s", 0
+    with open(vcd_file, errors="replace") as fp:
+        toks = vcd_tokens(fp)
+        # Header
+        for tok in toks:
+            if tok == "$enddefinitions":
+                next(toks)
+                break
+            if tok == "$scope":
+                _, name, _ = next(toks), next(toks), next(toks)
+                scope.append(name)
+            elif tok == "$upscope":
+                scope.pop()
+                next(toks)
+            elif tok == "$timescale":
+                timescale = " ".join(iter(lambda: next(toks), "$end"))
+            elif tok == "$var":
+                var = list(iter(lambda: next(toks), "$end"))
+                kind, width, code = var[0], int(var[1]), var[2]
+                # Bus ranges are dropped from names, bit selects kept (data[3])
+                name = "/".join(scope + [RANGE_RE.sub("", "".join(var[3:]))])
+                if signals is not None and not any(fnmatchcase(name, p) for p in signals):
+                    continue
+                if code not in by_id:
+                    by_id[code] = Signal(f"s{len(by_id)}",
+                                         width, "real" if kind in ("real", "realtime") else kind)
+                names[name] = code
+            elif tok.startswith("$"):
+                # $date, $version, $comment: skip to $end
+                for t in toks:
+                    if t == "$end":
+                        break
+        for sig in by_id.values():
+            sig.open(out_dir)
+        # Value changes
+        buffered = 0
+        try:
+            for tok in toks:
+                c = tok[0]
+                if c == "#":
+                    time = int(tok[1:])
+                    if buffered > BUFFER_VALUES:
+                        for sig in by_id.values():
+                            sig.flush()
+                        buffered = 0
+                elif c in "01xXzZ":
+                    sig = by_id.get(tok[1:])
+                    if sig:
+                        buffered += sig.change(time, c)
+                elif c in "bBrR":
+                    code = next(toks)
+                    sig = by_id.get(code)
+                    if sig:
+                        buffered += sig.change(time, tok[1:])
+                elif tok == "$comment":
+                    for t in toks:
+                        if t == "$end":
+                            break
+                # $dumpvars, $dumpall, $dumpon, $dumpoff and $end only group changes
+        finally:
+            for sig in by_id.values():
+                sig.close()
+    index = {"timescale": timescale, "timescale_s": parse_timescale(timescale),
+             "end_time": time, "signals": {}}
+    for name, code in sorted(names.items()):
+        sig = by_id[code]
+        index["signals"][name] = {"stem": sig.stem, "width": sig.width, "type": sig.kind,
+                                  "changes": sig.changes, "xz": sig.has_xz}
+    with open(os.path.join(out_dir, "index.json"), "w") as fp:
+        json.dump(index, fp, indent=2)
+    return index
+
+
+class Waves:
+    """Memory mapped reader of an export (requires numpy)"""
+    def __init__(self, export_dir):
+        import numpy
+        self.np = numpy
+        self.dir = export_dir
+        with open(os.path.join(export_dir, "index.json")) as fp:
+            self.index = json.load(fp)
+
+    def names(self, pattern="*"):
+        return [n for n in self.index["signals"] if fnmatchcase(n, pattern)]
+
+    def signal(self, name):
+        """(times, values, xz or None) of a signal as read only memory maps"""
+        info = self.index["signals"][name]
+        base = os.path.join(self.dir, info["stem"])
+        load = lambda suffix: self.np.load(f"{base}.{suffix}.npy", mmap_mode="r")
+        return load("t"), load("v"), load("xz") if info["xz"] else None
+
+    def value_at(self, name, time):
+        """Value of a signal at time (value before the first change is None)"""
+        times, values, xz = self.signal(name)
+        i = int(self.np.searchsorted(times, time, side="right")) - 1
+        if i < 0:
+            return None
+        if xz is not None and xz[i].any():
+            return "x"
+        return values[i].item() if values.ndim == 1 else \
+            sum(int(w) << (64 * k) for k, w in enumerate(values[i]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("vcd", help="VCD file")
+    parser.add_argument("out_dir", help="export dir")
+    parser.add_argument("-s", "--signals", nargs="+", help="glob patterns of signals to export")
+    args = parser.parse_args(argv)
+    index = export_vcd(args.vcd, args.out_dir, args.signals)
+    changes = sum(s["changes"] for s in index["signals"].values())
+    print(f"Exported {len(index['signals'])} signals ({changes} changes) to {args.out_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())